@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import logging
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from prompt_packing import NAME_STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+# Publishers and phrases dropped for every ticker (matched in title, publisher and source).
+# Extend with NEWS_BLOCKLIST="motley fool,sponsored"
+DEFAULT_BLOCKLIST = ('zacks', 'zack')
+BLOCKLIST = DEFAULT_BLOCKLIST + tuple(
+    term.strip().lower() for term in os.getenv("NEWS_BLOCKLIST", "").split(",") if term.strip()
+)
+
+# Per-ticker rules: {"BUR": {"exclude": ["Burkina Faso"], "include": ["YPF"]}}.
+# Excluded phrases always drop an article; included ones count as a mention of the company.
+RULES_FILE = os.getenv("NEWS_FILTER_RULES", os.path.join(os.path.dirname(__file__), "filter_rules.json"))
+
+# Name words too common to identify a company on their own ("Capital" in Burford Capital)
+GENERIC_NAME_WORDS = {
+    'capital', 'bank', 'first', 'general', 'american', 'united', 'international', 'global', 'national',
+    'financial', 'energy', 'technologies', 'technology', 'systems', 'industries', 'partners', 'trust',
+    'resources', 'solutions', 'services', 'usd', 'new', 'one',
+}
+
+# Separates articles in the batch text; no pattern can match across it
+_SEPARATOR = '\x00'
+
+def _load_rules(path: str) -> Dict[str, Dict[str, List[str]]]:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            return {ticker.upper(): rules for ticker, rules in json.load(f).items()}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.error(f"Could not load filter rules from {path}: {e}")
+        return {}
+
+TICKER_RULES = _load_rules(RULES_FILE)
+
+def _phrase(term: str) -> str:
+    # Whole words only, any run of whitespace between them
+    return r'\b' + r'\s+'.join(map(re.escape, term.split())) + r'\b'
+
+def _alternation(terms: Iterable[str]) -> Optional[str]:
+    # Longest first, so a phrase wins over a word it starts with
+    terms = sorted({term.lower() for term in terms if term and term.strip()}, key=len, reverse=True)
+    return '|'.join(map(_phrase, terms)) if terms else None
+
+def name_terms(company_name: Optional[str]) -> List[str]:
+    """
+    Phrases that identify a company in a headline: its name without the corporate
+    suffix ("Burford Capital"), and the first word of it when that's distinctive ("Burford").
+    """
+    words = re.findall(r"[A-Za-z0-9&'.]+", company_name or '')
+    while words and words[-1].lower().strip('.') in NAME_STOPWORDS:
+        words.pop()
+    if not words:
+        return []
+    terms = [' '.join(words)]
+    first = words[0].lower().strip('.')
+    if len(first) >= 4 and first not in GENERIC_NAME_WORDS and first not in NAME_STOPWORDS:
+        terms.append(first)
+    return terms
+
+def ticker_pattern(ticker: str) -> str:
+    """The ticker as written in news: upper case and standalone, e.g. "BUR", "$BUR", "(NYSE: BUR)"."""
+    symbol = ticker.upper().split('-')[0].split('.')[0]
+    # Case-sensitive even inside the case-insensitive combined pattern: "Bur Oak" is not BUR
+    return r'(?-i:(?<![\w$])\$?' + re.escape(symbol) + r'\b)'
+
+class ArticleFilter:
+    """
+    The blocklist, a ticker's rules and its relevance terms compiled into one regex.
+    A batch of articles is scanned in a single pass over their joined titles,
+    publishers and sources; each match is mapped back to its article.
+    """
+    def __init__(self, ticker: str, company_name: Optional[str] = None, rules: Optional[Dict[str, List[str]]] = None):
+        self.ticker = ticker.upper()
+        rules = rules or {}
+        if company_name and company_name.upper() == self.ticker:
+            company_name = None  # Metadata fell back to the symbol; the ticker pattern covers it
+        groups = {
+            'blocked': _alternation(BLOCKLIST),
+            'excluded': _alternation(rules.get('exclude', [])),
+            'mention': _alternation(list(rules.get('include', [])) + name_terms(company_name)),
+        }
+        parts = [f'(?P<{kind}>{pattern})' for kind, pattern in groups.items() if pattern]
+        parts.append(f'(?P<ticker>{ticker_pattern(ticker)})')
+        self.pattern = re.compile('|'.join(parts), re.I)
+
+    def scan(self, texts: List[str]) -> List[List[tuple]]:
+        """(kind, offset) of every match in each text; kinds are 'blocked', 'excluded', 'mention' and 'ticker'."""
+        found = [[] for _ in texts]
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + 1
+        for match in self.pattern.finditer(_SEPARATOR.join(texts)):
+            index = bisect_right(starts, match.start()) - 1
+            found[index].append((match.lastgroup, match.start() - starts[index]))
+        return found
+
+    def keep_mask(self, articles, trusted_sources: Iterable[str] = ()) -> List[bool]:
+        """
+        Which articles to keep: not blocked or excluded, and either from a trusted
+        source (a feed that is already per-ticker) or with a title that mentions the
+        company or ticker. Blocked terms also count in the publisher and source.
+        """
+        trusted_sources = set(trusted_sources)
+        titles = [article.get('title') or '' for article in articles]
+        texts = [
+            f"{title}\t{article.get('publisher') or ''}\t{article.get('source') or ''}"
+            for title, article in zip(titles, articles)
+        ]
+        keep = []
+        blocked = excluded = off_topic = 0
+        for article, title, matches in zip(articles, titles, self.scan(texts)):
+            kinds = {kind for kind, offset in matches if kind == 'blocked' or offset < len(title)}
+            if 'blocked' in kinds:
+                blocked += 1
+            elif 'excluded' in kinds:
+                excluded += 1
+            elif article.get('source') not in trusted_sources and not kinds & {'mention', 'ticker'}:
+                off_topic += 1
+            else:
+                keep.append(True)
+                continue
+            keep.append(False)
+
+        if len(keep) > sum(keep):
+            logger.info(f"Filtered {len(keep) - sum(keep)} of {len(keep)} articles for {self.ticker} "
+                        f"({blocked} blocked, {excluded} excluded, {off_topic} off-topic)")
+        return keep
+
+    def filter(self, articles, trusted_sources: Iterable[str] = ()) -> list:
+        return [article for article, keep in zip(articles, self.keep_mask(articles, trusted_sources)) if keep]
+
+@lru_cache(maxsize=256)
+def for_ticker(ticker: str, company_name: Optional[str] = None) -> ArticleFilter:
+    """The compiled filter for a ticker, built once per (ticker, company name)."""
+    return ArticleFilter(ticker, company_name, TICKER_RULES.get(ticker.upper()))
+
+_blocklist = re.compile(_alternation(BLOCKLIST) or r'(?!)', re.I)
+
+def is_blocked(*fields: Optional[str]) -> bool:
+    """True if any of the given fields hits the global blocklist."""
+    return any(field and _blocklist.search(field) for field in fields)
@@ -0,0 +1,111 @@
+import os
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from typing import Optional, Dict, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from news_cache import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Stored text younger than this is served without touching the network.
+# Older text is revalidated with a conditional GET.
+ARTICLE_FRESH_TTL = float(os.getenv("ARTICLE_FRESH_TTL", str(6 * 3600)))
+ARTICLE_STORE_MAX_ENTRIES = int(os.getenv("ARTICLE_STORE_MAX_ENTRIES", "20000"))
+
+# Query parameters that never change the article served
+TRACKING_PARAMS = {'ved', 'usg', 'guccounter', 'guce_referrer', 'guce_referrer_sig', 'fbclid', 'gclid', 'mod', 'ncid', 'yptr', '.tsrc'}
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL, so the same story shared by several sources maps to one entry."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ''))
+
+class ArticleStore:
+    """
+    On-disk store of extracted article text keyed by normalized URL, with the
+    validators (ETag, Last-Modified) needed for conditional re-fetches.
+    Text is zlib-compressed.
+    """
+    def __init__(self, path: str = None, max_entries: int = ARTICLE_STORE_MAX_ENTRIES):
+        self.path = path or os.path.join(CACHE_DIR, "articles.db")
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "url_key TEXT PRIMARY KEY, url TEXT NOT NULL, text BLOB, fetched_at REAL NOT NULL, "
+            "etag TEXT, last_modified TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, text, fetched_at, etag, last_modified FROM articles WHERE url_key = ?",
+                (normalize_url(url),),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'url': row[0],
+            'text': zlib.decompress(row[1]).decode('utf-8') if row[1] else '',
+            'fetched_at': row[2],
+            'etag': row[3],
+            'last_modified': row[4],
+        }
+
+    def put(self, url: str, text: str, etag: str = None, last_modified: str = None):
+        blob = zlib.compress((text or '').encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO articles (url_key, url, text, fetched_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (normalize_url(url), url, blob, time.time(), etag, last_modified),
+            )
+            # Counting is cheaper than the sort the eviction needs, so only evict when over the bound
+            if self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM articles WHERE url_key IN ("
+                    "SELECT url_key FROM articles ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """Marks a stored article as revalidated (the server answered 304)."""
+        with self._lock:
+            self._conn.execute("UPDATE articles SET fetched_at = ? WHERE url_key = ?", (time.time(), normalize_url(url)))
+            self._conn.commit()
+
+def is_fresh(record: Dict[str, Any], ttl: float = None) -> bool:
+    return time.time() - record['fetched_at'] < (ARTICLE_FRESH_TTL if ttl is None else ttl)
+
+def conditional_headers(record: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for revalidating a stored article."""
+    headers = {}
+    if record:
+        if record.get('etag'):
+            headers['If-None-Match'] = record['etag']
+        if record.get('last_modified'):
+            headers['If-Modified-Since'] = record['last_modified']
+    return headers
+
+_store = None
+
+def get_store() -> ArticleStore:
+    global _store
+    if _store is None:
+        _store = ArticleStore()
+    return _store
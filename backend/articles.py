@@ -0,0 +1,80 @@
+import sys
+from datetime import datetime
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from date_parsing import parse_date
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Source and publisher names repeat across thousands of articles; keep one copy of each
+    return sys.intern(value) if value else value
+
+@dataclass(slots=True, frozen=True)
+class AlternateSource:
+    """Another outlet that carried the same story."""
+    url: str
+    source: Optional[str] = None
+    publisher: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'source', _intern(self.source))
+        object.__setattr__(self, 'publisher', _intern(self.publisher))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'source': self.source, 'publisher': self.publisher, 'url': self.url}
+
+@dataclass(slots=True, frozen=True)
+class Article:
+    """
+    One scraped news item, from the source scrapers through to the API response.
+    Immutable and slotted: a portfolio refresh holds thousands of these.
+    """
+    title: str
+    url: str
+    source: str
+    publisher: Optional[str] = None
+    published: Optional[datetime] = None
+    # Other outlets that carried the same story (see near_duplicates)
+    alternate_sources: Tuple[AlternateSource, ...] = ()
+    # The feed's teaser text, where the source provides one (scored for sentiment, not served)
+    summary: Optional[str] = None
+
+    def __post_init__(self):
+        object.__setattr__(self, 'source', _intern(self.source))
+        object.__setattr__(self, 'publisher', _intern(self.publisher))
+
+    @classmethod
+    def create(cls, title, url, source: str, publisher=None, published=None, summary=None) -> Optional["Article"]:
+        """
+        Builds an article from scraped values: `published` may be a datetime or any
+        format parse_date understands. Returns None if there is no URL.
+        """
+        if not url:
+            return None
+        return cls(title=(title or '').strip() or "No Title", url=url, source=source or "Unknown",
+                   publisher=publisher or None, published=parse_date(published), summary=(summary or '').strip() or None)
+
+    # Read-only dict-style access, for helpers shared with plain dict records
+    # (e.g. near-duplicate clustering of extracted text) and the ad-hoc scripts
+    def __getitem__(self, name: str):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def get(self, name: str, default=None):
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def with_alternates(self, alternates: Iterable[AlternateSource]) -> "Article":
+        return replace(self, alternate_sources=tuple(alternates))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The JSON shape of ArticleModel (dates as ISO 8601, missing ones as null)."""
+        return {
+            'title': self.title,
+            'url': self.url,
+            'publisher': self.publisher,
+            'published': self.published.isoformat() if self.published else None,
+            'source': self.source,
+            'alternate_sources': [alternate.to_dict() for alternate in self.alternate_sources],
+        }
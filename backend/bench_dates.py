@@ -0,0 +1,63 @@
+import sys
+import os
+import time
+import logging
+import datetime
+
+import dateparser
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from date_parsing import parse_date, parse_finviz_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Representative inputs from each source
+SAMPLES = [
+    1763349234,                    # Yahoo providerPublishTime
+    "2025-11-17T03:13:54Z",        # Yahoo pubDate
+    "2025-11-16T23:14:08+00:00",   # Benzinga/Reuters <time datetime>
+    "Nov-17-25 08:30AM",           # FinViz first row of a day
+    "07:15AM",                     # FinViz continuation row
+    "2 hours ago",                 # Google News
+    "3 days ago",                  # Google News
+    "Nov 14, 2025",                # Google News, older items
+]
+ROUNDS = 200
+
+def bench(label, fn):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for sample in SAMPLES:
+            fn(sample)
+    elapsed = time.perf_counter() - start
+    per_item = elapsed / (ROUNDS * len(SAMPLES)) * 1e6
+    logger.info(f"{label:<28} {per_item:10.1f} us/item")
+    return per_item
+
+def legacy(sample):
+    # What normalize_date used to do for every item, plus is_recent's re-parse
+    if isinstance(sample, (int, float)):
+        return datetime.datetime.fromtimestamp(sample).isoformat()
+    parsed = dateparser.parse(str(sample))
+    return datetime.datetime.fromisoformat(parsed.isoformat()) if parsed else None
+
+def verify_parity():
+    for sample in SAMPLES:
+        fast = parse_date(sample)
+        slow = dateparser.parse(str(sample)) if not isinstance(sample, int) else None
+        logger.info(f"{str(sample):<28} fast={fast}  dateparser={slow}")
+    finviz_rows = ["Nov-17-25 08:30AM", "07:15AM", "Nov-16-25 09:00PM", "06:00PM"]
+    current_date = None
+    for row in finviz_rows:
+        published, current_date = parse_finviz_date(row, current_date)
+        logger.info(f"FinViz {row:<21} -> {published}")
+
+if __name__ == "__main__":
+    verify_parity()
+    dateparser.parse("warm up")
+    slow = bench("dateparser (legacy)", legacy)
+    fast = bench("parse_date (tiered)", parse_date)
+    logger.info(f"Speedup: {slow / fast:.0f}x")
@@ -0,0 +1,56 @@
+"""
+Checks the batch relevance/spam filter on known cases and times it on a large batch.
+
+    python bench_filter.py [articles]
+"""
+import sys
+import time
+import random
+
+from articles import Article
+from article_filter import ArticleFilter, for_ticker
+
+CASES = [
+    # (title, publisher, source, expected to be kept)
+    ("Burford Capital wins $16bn YPF judgment appeal", "Reuters", "Google News", True),
+    ("BUR stock rises after earnings beat", "MarketWatch", "MarketWatch", True),
+    ("Why Burford Capital (BUR) is a Strong Buy", "Zacks", "Yahoo Finance", False),
+    ("Burkina Faso junta extends transition", "Al Jazeera", "Google News", False),
+    ("Bur Oak trees at risk from new blight", "Local News", "Google News", False),
+    ("Burnley sign striker on loan", "BBC Sport", "Google News", False),
+    ("BURS index rebalancing announced", "Reuters", "Reuters", False),
+    ("Litigation finance firms see record demand", "Benzinga", "Benzinga", True),  # Ticker feed
+    ("Litigation finance firms see record demand", "Reuters", "Reuters", False),  # Search result
+]
+TRUSTED = {'Yahoo Finance', 'FinViz', 'Benzinga', 'Seeking Alpha'}
+
+def check() -> bool:
+    article_filter = for_ticker("BUR", "Burford Capital Limited")
+    articles = [Article(title=title, url=f"https://example.com/{i}", source=source, publisher=publisher)
+                for i, (title, publisher, source, _) in enumerate(CASES)]
+    mask = article_filter.keep_mask(articles, TRUSTED)
+    ok = True
+    for (title, _, source, expected), kept in zip(CASES, mask):
+        if kept != expected:
+            ok = False
+            print(f"MISMATCH: [{source}] {title}: kept={kept}, expected {expected}")
+    print(f"Known cases: {'all correct' if ok else 'FAILED'}")
+    return ok
+
+def bench(count: int):
+    article_filter = ArticleFilter("BUR", "Burford Capital Limited", {'exclude': ["Burkina", "Bur Oak", "Burnley"]})
+    articles = []
+    for i in range(count):
+        title, publisher, source, _ = random.choice(CASES)
+        articles.append(Article(title=f"{title} {i}", url=f"https://example.com/{i}", source=source, publisher=publisher))
+
+    start = time.perf_counter()
+    kept = article_filter.filter(articles, TRUSTED)
+    elapsed = time.perf_counter() - start
+    print(f"Filtered {count} articles ({len(kept)} kept) in {elapsed * 1000:.1f} ms "
+          f"({elapsed / count * 1e6:.1f} µs per article)")
+
+if __name__ == "__main__":
+    ok = check()
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
+    sys.exit(0 if ok else 1)
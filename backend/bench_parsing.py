@@ -0,0 +1,202 @@
+import sys
+import os
+import time
+import ctypes
+import logging
+import argparse
+import tracemalloc
+
+import requests
+from bs4 import BeautifulSoup
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import news_fetcher
+import html_parsing
+from date_parsing import parse_date
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pages saved from each source (refresh with --record); parity is checked against these
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+ROUNDS = 20
+TREES = 5
+
+# The BeautifulSoup scrapers these parsers replaced, reduced to their row extraction:
+# (title, url, published) per article, published as normalize_date returned it
+def _iso(date_str):
+    parsed = parse_date(date_str)
+    return parsed.isoformat() if parsed else None
+
+def _absolute(link, base):
+    return link if not link or link.startswith('http') else base + link
+
+def legacy_finviz(content):
+    # Dates aren't compared here: the old scraper's date handling was replaced separately (see date_parsing)
+    soup = BeautifulSoup(content, 'html.parser')
+    table = soup.find(id='news-table')
+    if not table:
+        return []
+    rows = []
+    for row in table.find_all('tr'):
+        cols = row.find_all('td')
+        link_tag = cols[1].find('a') if len(cols) >= 2 else None
+        if link_tag:
+            rows.append((link_tag.text, link_tag['href'], None))
+    return rows[:50]
+
+def legacy_marketwatch(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+    for result in soup.find_all('div', class_='article__content')[:50]:
+        link_tag = result.find('a', class_='link')
+        if link_tag:
+            date_tag = result.find('span', class_='article__timestamp')
+            date_str = date_tag.get_text(strip=True) if date_tag else None
+            rows.append((link_tag.get_text(strip=True), _absolute(link_tag.get('href'), 'https://www.marketwatch.com'), _iso(date_str)))
+    return rows
+
+def legacy_benzinga(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+    for item in soup.find_all('div', class_='story-block')[:50]:
+        link_tag = item.find('a')
+        if link_tag:
+            date_tag = item.find('time')
+            date_str = date_tag.get('datetime') if date_tag else None
+            rows.append((link_tag.get_text(strip=True), _absolute(link_tag.get('href'), 'https://www.benzinga.com'), _iso(date_str)))
+    return rows
+
+def legacy_reuters(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+    for result in soup.find_all('div', class_='search-result-indiv')[:50]:
+        link_tag = result.find('a')
+        if link_tag:
+            date_tag = result.find('time')
+            date_str = date_tag.get('datetime') if date_tag else None
+            rows.append((link_tag.get_text(strip=True), _absolute(link_tag.get('href'), 'https://www.reuters.com'), _iso(date_str)))
+    return rows
+
+def legacy_seekingalpha(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    rows = []
+    for link_tag in soup.find_all('a', attrs={'data-test-id': 'post-list-item-title'})[:50]:
+        rows.append((link_tag.get_text(strip=True), _absolute(link_tag.get('href'), 'https://seekingalpha.com'), None))
+    return rows
+
+# Source name -> (request builder, current parser, legacy parser)
+SOURCES = {
+    'finviz': (news_fetcher._finviz_request, news_fetcher._parse_finviz_news, legacy_finviz),
+    'marketwatch': (news_fetcher._marketwatch_request, news_fetcher._parse_marketwatch_news, legacy_marketwatch),
+    'benzinga': (news_fetcher._benzinga_request, news_fetcher._parse_benzinga_news, legacy_benzinga),
+    'reuters': (news_fetcher._reuters_request, news_fetcher._parse_reuters_news, legacy_reuters),
+    'seekingalpha': (news_fetcher._seekingalpha_request, news_fetcher._parse_seekingalpha_news, legacy_seekingalpha),
+}
+
+def load_page(source: str, record: bool, ticker: str) -> bytes:
+    path = os.path.join(FIXTURE_DIR, f"{source}.html")
+    if record:
+        url, headers = SOURCES[source][0](ticker)
+        response = requests.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+        os.makedirs(FIXTURE_DIR, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        logger.info(f"Recorded {url} -> {path}")
+    with open(path, 'rb') as f:
+        return f.read()
+
+try:
+    _libc = ctypes.CDLL("libc.so.6")
+
+    class _MallInfo2(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_size_t) for name in
+                    ('arena', 'ordblks', 'smblks', 'hblks', 'hblkhd', 'usmblks', 'fsmblks', 'uordblks', 'fordblks', 'keepcost')]
+
+    _libc.mallinfo2.restype = _MallInfo2
+
+    def malloc_in_use() -> int:
+        info = _libc.mallinfo2()
+        return info.uordblks + info.hblkhd
+except (OSError, AttributeError):
+    malloc_in_use = None
+
+def measure_trees(parse, content):
+    """
+    Memory held per parsed tree, with TREES trees alive at once: Python allocations
+    (tracemalloc; BeautifulSoup trees live here) and, with glibc, the C heap (malloc
+    bytes in use; lxml trees live in libxml2's heap, which tracemalloc doesn't see).
+    """
+    tracemalloc.start()
+    python_before = tracemalloc.get_traced_memory()[0]
+    trees = [parse(content) for _ in range(TREES)]
+    python_bytes = (tracemalloc.get_traced_memory()[0] - python_before) / TREES
+    tracemalloc.stop()
+    del trees
+
+    # A separate pass: tracemalloc's own bookkeeping is malloc'd too
+    malloc_bytes = None
+    if malloc_in_use:
+        malloc_before = malloc_in_use()
+        trees = [parse(content) for _ in range(TREES)]
+        malloc_bytes = (malloc_in_use() - malloc_before) / TREES
+        del trees
+    return python_bytes, malloc_bytes
+
+def bench(label, parse, content):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        parse(content)
+    per_page = (time.perf_counter() - start) / ROUNDS * 1000
+
+    python_bytes, malloc_bytes = measure_trees(parse, content)
+    c_heap = f"{malloc_bytes / 1024:8.1f} KiB C heap" if malloc_bytes is not None else ""
+    logger.info(f"{label:<28} {per_page:8.3f} ms/page {python_bytes / 1024:8.1f} KiB Python {c_heap}")
+    return per_page
+
+def check_parity(source, content) -> bool:
+    _, parse, legacy = SOURCES[source]
+    normalize = lambda title: ' '.join(title.split())
+    new = [(normalize(a.title), a.url, a.published.isoformat() if a.published else None) for a in parse(content)]
+    old = [(normalize(title), url, published) for title, url, published in legacy(content)]
+    if source == 'finviz':
+        new = [row[:2] for row in new]
+        old = [row[:2] for row in old]
+    if not new or new != old:
+        logger.error(f"{source}: parsers disagree ({len(new)} vs {len(old)} rows)")
+        for current, previous in zip(new, old):
+            if current != previous:
+                logger.error(f"  lxml: {current}\n  bs4:  {previous}")
+        return False
+    logger.info(f"{source}: {len(new)} articles, identical to BeautifulSoup output")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare BeautifulSoup and lxml parsing of scraper pages")
+    parser.add_argument('--record', action='store_true', help="fetch live pages into fixtures/html first")
+    parser.add_argument('--check', action='store_true', help="only check parity, skip the timings")
+    parser.add_argument('--ticker', default='AAPL')
+    args = parser.parse_args()
+
+    failed = []
+    for source, (_, parse, legacy) in SOURCES.items():
+        content = load_page(source, args.record, args.ticker)
+        logger.info(f"--- {source} ({len(content) / 1024:.1f} KiB)")
+        if not check_parity(source, content):
+            failed.append(source)
+        if args.check:
+            continue
+        bench("BeautifulSoup html.parser", lambda c: BeautifulSoup(c, 'html.parser'), content)
+        bench("lxml full document", html_parsing.parse, content)
+        if source == 'finviz':
+            bench("lxml news-table fragment", lambda c: html_parsing.parse_fragment(c, b'id="news-table"', b'table'), content)
+        old = bench("end-to-end (legacy)", legacy, content)
+        new = bench("end-to-end (current)", parse, content)
+        logger.info(f"End-to-end speedup: {old / new:.1f}x")
+
+    if failed:
+        logger.error(f"Parity failed for {', '.join(failed)}")
+        sys.exit(1)
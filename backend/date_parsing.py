@@ -0,0 +1,141 @@
+import re
+import logging
+import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import dateparser
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+# FinViz: "Nov-17-25 08:30AM", or just "08:30AM" on continuation rows of the same day,
+# or "Today 08:30AM" on the current day
+FINVIZ_DATETIME = re.compile(r'^([A-Za-z]{3})-(\d{1,2})-(\d{2})\s+(\d{1,2}):(\d{2})\s*([AP]M)$', re.I)
+FINVIZ_TODAY = re.compile(r'^Today\s+(\d{1,2}):(\d{2})\s*([AP]M)$', re.I)
+CLOCK_TIME = re.compile(r'^(\d{1,2}):(\d{2})\s*([AP]M)$', re.I)
+
+# Google News: "2 hours ago", "1 min ago", "3 days ago", "yesterday"
+RELATIVE = re.compile(r'^(\d+)\s+(sec|second|min|minute|hour|hr|day|week|month)s?\s+ago$', re.I)
+RELATIVE_UNITS = {
+    'sec': 1, 'second': 1, 'min': 60, 'minute': 60, 'hour': 3600, 'hr': 3600,
+    'day': 86400, 'week': 7 * 86400, 'month': 30 * 86400,
+}
+
+# FinViz prints its news-table times in New York time, without a zone
+FINVIZ_TZ = ZoneInfo("America/New_York")
+
+# "Nov 17, 2025" / "November 17, 2025"
+MONTH_DAY_YEAR = re.compile(r'^([A-Za-z]{3})[a-z]*\.?\s+(\d{1,2}),\s*(\d{4})$')
+
+def _clock(hour: str, minute: str, meridiem: str) -> Tuple[int, int]:
+    hour = int(hour) % 12
+    if meridiem.upper() == 'PM':
+        hour += 12
+    return hour, int(minute)
+
+def parse_finviz_date(text: str, current_date: Optional[datetime.date] = None) -> Tuple[Optional[datetime.datetime], Optional[datetime.date]]:
+    """
+    Parses a FinViz news-table timestamp. Time-only rows belong to the date of the
+    row above, so callers pass along the date returned for the previous row.
+
+    Returns:
+        (published datetime or None, date to carry to the next row)
+    """
+    text = text.strip()
+    match = FINVIZ_DATETIME.match(text)
+    if match:
+        month, day, year, hour, minute, meridiem = match.groups()
+        month_number = MONTHS.get(month.lower())
+        if month_number:
+            date = datetime.date(2000 + int(year), month_number, int(day))
+            return datetime.datetime.combine(date, datetime.time(*_clock(hour, minute, meridiem))), date
+
+    match = FINVIZ_TODAY.match(text)
+    if match:
+        date = datetime.date.today()
+        return datetime.datetime.combine(date, datetime.time(*_clock(*match.groups()))), date
+
+    match = CLOCK_TIME.match(text)
+    if match:
+        date = current_date or datetime.date.today()
+        return datetime.datetime.combine(date, datetime.time(*_clock(*match.groups()))), date
+
+    parsed = parse_date(text)
+    return parsed, parsed.date() if parsed else current_date
+
+@lru_cache(maxsize=4096)
+def _fallback_parse(text: str, today: datetime.date) -> Optional[datetime.datetime]:
+    # `today` is part of the cache key so relative phrases aren't reused across days
+    return dateparser.parse(text)
+
+def parse_date(date_input) -> Optional[datetime.datetime]:
+    """
+    Parses the date formats our sources produce into a datetime.
+
+    Known formats (Unix epoch, ISO 8601, FinViz, "N units ago", "Mon DD, YYYY")
+    take dedicated fast paths. Anything else goes through dateparser, with
+    results cached.
+    """
+    if not date_input:
+        return None
+    if isinstance(date_input, datetime.datetime):
+        return date_input
+
+    try:
+        # Unix timestamps (from Yahoo Finance)
+        if isinstance(date_input, (int, float)):
+            return datetime.datetime.fromtimestamp(date_input)
+
+        text = str(date_input).strip()
+        if not text:
+            return None
+
+        # ISO 8601 (Yahoo pubDate, <time datetime=...> attributes)
+        if text[0].isdigit() and len(text) >= 10 and text[4] == '-':
+            try:
+                return datetime.datetime.fromisoformat(text)
+            except ValueError:
+                pass
+
+        match = RELATIVE.match(text)
+        if match:
+            amount, unit = match.groups()
+            return datetime.datetime.now() - datetime.timedelta(seconds=int(amount) * RELATIVE_UNITS[unit.lower()])
+
+        lowered = text.lower()
+        if lowered == 'yesterday':
+            return datetime.datetime.now() - datetime.timedelta(days=1)
+        if lowered == 'today':
+            return datetime.datetime.now()
+
+        match = MONTH_DAY_YEAR.match(text)
+        if match:
+            month, day, year = match.groups()
+            month_number = MONTHS.get(month.lower())
+            if month_number:
+                return datetime.datetime(int(year), month_number, int(day))
+
+        match = FINVIZ_DATETIME.match(text)
+        if match:
+            return parse_finviz_date(text)[0]
+
+        return _fallback_parse(text, datetime.date.today())
+    except Exception as e:
+        logger.debug(f"Error parsing date '{date_input}': {e}")
+        return None
+
+def to_utc(published: datetime.datetime, source: str = None) -> datetime.datetime:
+    """
+    An article's published time as an aware UTC datetime. Naive FinViz times are New York
+    time; other naive values (epoch conversions, relative and dateparser dates) are the
+    server's local time, as parse_date produces them.
+    """
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=FINVIZ_TZ) if source == 'FinViz' else published.astimezone()
+    return published.astimezone(datetime.timezone.utc)
@@ -0,0 +1,58 @@
+import logging
+from typing import Optional
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+logger = logging.getLogger(__name__)
+
+# Selectors are compiled to XPath once at import, not on every page
+FINVIZ_ROWS = CSSSelector('#news-table tr')
+MARKETWATCH_RESULTS = CSSSelector('div.article__content')
+MARKETWATCH_LINK = CSSSelector('a.link')
+MARKETWATCH_TIMESTAMP = CSSSelector('span.article__timestamp')
+BENZINGA_STORIES = CSSSelector('div.story-block')
+REUTERS_RESULTS = CSSSelector('div.search-result-indiv')
+SEEKINGALPHA_TITLES = CSSSelector('a[data-test-id="post-list-item-title"]')
+TD = CSSSelector('td')
+LINK = CSSSelector('a')
+TIME = CSSSelector('time')
+
+def parse(content):
+    """Parses a full page with lxml's C parser."""
+    if not content:
+        return None
+    return lxml_html.document_fromstring(content)
+
+def slice_element(content: bytes, marker: bytes, tag: bytes) -> Optional[bytes]:
+    """
+    Cuts the raw bytes of the first <tag> element containing `marker` out of a page,
+    so only that subtree needs parsing. Assumes the element doesn't nest another
+    <tag>. Returns None if it can't be located.
+    """
+    marker_at = content.find(marker)
+    if marker_at == -1:
+        return None
+    start = content.rfind(b'<' + tag, 0, marker_at)
+    end = content.find(b'</' + tag + b'>', marker_at)
+    if start == -1 or end == -1:
+        return None
+    return content[start:end + len(tag) + 3]
+
+def parse_fragment(content: bytes, marker: bytes, tag: bytes):
+    """Parses just the subtree around `marker`, falling back to the whole page."""
+    fragment = slice_element(content, marker, tag)
+    if fragment is not None:
+        try:
+            return lxml_html.document_fromstring(fragment)
+        except Exception as e:
+            logger.debug(f"Fragment parse failed, parsing full page: {e}")
+    return parse(content)
+
+def first(selector, element):
+    matches = selector(element)
+    return matches[0] if matches else None
+
+def text(element) -> str:
+    """Element text with whitespace collapsed."""
+    return ' '.join(element.text_content().split())
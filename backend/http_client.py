@@ -0,0 +1,91 @@
+import os
+import logging
+import httpx
+import requests
+
+import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Pool sizing for the shared client. httpx keeps a separate keep-alive pool per
+# host inside one client, so a single instance serves every scraper and Ollama.
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "200"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "10"))
+
+# Throttled GETs are retried after the host's pause, unless that pause is longer than
+# HTTP_MAX_RETRY_WAIT (the caller gets the 429/503; later requests still wait it out)
+THROTTLE_STATUSES = {429, 503}
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+MAX_RETRY_WAIT = float(os.getenv("HTTP_MAX_RETRY_WAIT", "15"))
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_client = None
+
+def get_client() -> httpx.AsyncClient:
+    """Returns the process-wide async HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        logger.info(f"Created shared HTTP client (http2={HTTP2_AVAILABLE})")
+    return _client
+
+def _throttled(limiter, response, attempt: int) -> bool:
+    """Records the response on the host's limiter. True if the request should be retried."""
+    if response.status_code not in THROTTLE_STATUSES:
+        limiter.on_success()
+        return False
+    rate_limiter.note_throttled()
+    pause = limiter.on_throttled(rate_limiter.parse_retry_after(response.headers.get('Retry-After')))
+    return attempt < MAX_RETRIES and pause <= MAX_RETRY_WAIT
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    """
+    GET through the shared client, rate limited per host. 429/503 responses pause the
+    host (honouring Retry-After, else exponential backoff) and are retried.
+    """
+    attempt = 0
+    while True:
+        limiter = await rate_limiter.acquire(url)
+        response = await get_client().get(url, **kwargs)
+        if not _throttled(limiter, response, attempt):
+            return response
+        attempt += 1
+        logger.info(f"Retrying {url} after throttling (attempt {attempt})")
+
+def get_sync(url: str, **kwargs) -> requests.Response:
+    """Blocking counterpart of get() on requests, sharing the same per-host limits."""
+    attempt = 0
+    while True:
+        limiter = rate_limiter.acquire_sync(url)
+        response = requests.get(url, **kwargs)
+        if not _throttled(limiter, response, attempt):
+            return response
+        attempt += 1
+        logger.info(f"Retrying {url} after throttling (attempt {attempt})")
+
+async def post(url: str, **kwargs) -> httpx.Response:
+    """POST through the shared client."""
+    return await get_client().post(url, **kwargs)
+
+async def aclose():
+    """Closes the shared client. Called on application shutdown."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
@@ -1,7 +1,8 @@
 import requests
-import json
 import logging
 
+from llm_backends import OLLAMA_HOST, OLLAMA_TIMEOUT, ollama_payload
+
 logger = logging.getLogger(__name__)
 
 def generate_with_llama(prompt: str, model: str = "llama3:8b") -> str:
@@ -15,20 +16,10 @@ def generate_with_llama(prompt: str, model: str = "llama3:8b") -> str:
     Returns:
         The generated text, or None if the request fails.
     """
-    url = "http://localhost:11434/api/generate"
-    
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-        "options": {
-            "temperature": 0.3,
-            "num_ctx": 8192
-        }
-    }
+    payload = ollama_payload(prompt, model)
     
     try:
-        response = requests.post(url, json=payload)
+        response = requests.post(f"{OLLAMA_HOST}/api/generate", json=payload, timeout=OLLAMA_TIMEOUT)
         response.raise_for_status()
         result = response.json()
         return result.get("response", "")
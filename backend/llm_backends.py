@@ -0,0 +1,394 @@
+import os
+import json
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+import contextvars
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import http_client
+from prompt_packing import NUM_CTX
+
+logger = logging.getLogger(__name__)
+
+# Backends are tried in this order until one produces text: "ollama", "gemini", "stub"
+LLM_BACKENDS = [name.strip() for name in os.getenv("LLM_BACKENDS", "ollama,gemini").split(",") if name.strip()]
+
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3:8b")
+# How long Ollama keeps the model loaded after a request (Ollama duration syntax)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "300"))
+# Match Ollama's OLLAMA_NUM_PARALLEL; extra requests queue here, by priority, not on the server
+OLLAMA_PARALLEL = int(os.getenv("OLLAMA_PARALLEL", "1"))
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-1.5-flash")
+GEMINI_PARALLEL = int(os.getenv("GEMINI_PARALLEL", "4"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "120"))
+
+# Interactive requests give up on a backend's queue after this long and try the next one;
+# background requests wait as long as it takes
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+LLM_WARMUP = os.getenv("LLM_WARMUP", "1") not in ("0", "false", "False")
+
+INTERACTIVE, BACKGROUND = 0, 10
+
+class StreamInterrupted(RuntimeError):
+    """A stream failed after part of the text was yielded; what was received is incomplete."""
+
+class PriorityTicket:
+    """
+    The priority shared by the LLM calls of one unit of work (and the tasks it starts).
+    Boosting it also moves the work's calls already queued for a slot forward.
+    """
+    __slots__ = ('level', '_queued')
+
+    def __init__(self, level: int = INTERACTIVE):
+        self.level = level
+        self._queued: Dict[asyncio.Future, "PrioritySlots"] = {}
+
+    def boost(self, level: int):
+        if level >= self.level:
+            return
+        self.level = level
+        for future, slots in list(self._queued.items()):
+            slots.requeue(future, level)
+
+_priority: contextvars.ContextVar[Optional[PriorityTicket]] = contextvars.ContextVar("llm_priority", default=None)
+
+def current_ticket() -> PriorityTicket:
+    return _priority.get() or PriorityTicket()
+
+@contextmanager
+def priority(level: int):
+    """Runs LLM calls made in this context (and tasks started from it) at `level`."""
+    token = _priority.set(PriorityTicket(level))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def create_prioritized_task(coro) -> Tuple[asyncio.Task, PriorityTicket]:
+    """
+    Starts `coro` as a task with a ticket of its own, at the caller's current level, so
+    the work can be boosted (e.g. when an interactive request comes to share it)
+    without touching the caller's priority.
+    """
+    ticket = PriorityTicket(current_ticket().level)
+    context = contextvars.copy_context()
+    context.run(_priority.set, ticket)
+    return asyncio.create_task(coro, context=context), ticket
+
+class PrioritySlots:
+    """
+    A semaphore whose waiters are served lowest priority value first (FIFO within a
+    priority), so interactive requests overtake queued background work.
+    """
+    def __init__(self, slots: int):
+        self.slots = max(1, slots)
+        self.in_use = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+
+    def queued(self) -> Dict[str, int]:
+        # A boosted waiter has an entry per level it was queued at; count its best one
+        levels: Dict[asyncio.Future, int] = {}
+        for level, _, future in self._waiters:
+            if not future.done():
+                levels[future] = min(level, levels.get(future, level))
+        counts = {'interactive': 0, 'background': 0}
+        for level in levels.values():
+            counts['interactive' if level < BACKGROUND else 'background'] += 1
+        return counts
+
+    async def acquire(self, ticket: PriorityTicket):
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)  # Waiters that gave up
+        if self.in_use < self.slots and not self._waiters:
+            self.in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (ticket.level, next(self._counter), future))
+        ticket._queued[future] = self
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Handed a slot just as we gave up: pass it on
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+        finally:
+            ticket._queued.pop(future, None)
+
+    def requeue(self, future: asyncio.Future, level: int):
+        # The old entry stays in the heap; whichever is popped first gets the slot,
+        # and the other is skipped as done
+        if not future.done():
+            heapq.heappush(self._waiters, (level, next(self._counter), future))
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # The slot moves straight to the waiter
+                return
+        self.in_use -= 1
+
+    @asynccontextmanager
+    async def slot(self, ticket: PriorityTicket, timeout: Optional[float] = None):
+        if timeout is None:
+            await self.acquire(ticket)
+        else:
+            await asyncio.wait_for(self.acquire(ticket), timeout=timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+class LLMBackend:
+    """A text generation backend with its own concurrency limit."""
+    name = "base"
+
+    def __init__(self, model: str, parallel: int = 1):
+        self.model = model
+        self.slots = PrioritySlots(parallel)
+        self.calls = 0
+        self.failures = 0
+        self.total_seconds = 0.0
+
+    def available(self) -> bool:
+        return True
+
+    async def generate(self, prompt: str) -> str:
+        raise NotImplementedError
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        # Default: one chunk with the whole completion
+        yield await self.generate(prompt)
+
+    async def warm_up(self):
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'available': self.available(),
+            'parallel': self.slots.slots,
+            'in_flight': self.slots.in_use,
+            'queued': self.slots.queued(),
+            'calls': self.calls,
+            'failures': self.failures,
+            'avg_seconds': round(self.total_seconds / self.calls, 2) if self.calls else None,
+        }
+
+def ollama_payload(prompt: str, model: str, stream: bool = False, keep_alive: str = OLLAMA_KEEP_ALIVE) -> dict:
+    """The body of an Ollama /api/generate request."""
+    return {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream,
+        "keep_alive": keep_alive,
+        "options": {
+            "temperature": 0.3,
+            "num_ctx": NUM_CTX,
+        },
+    }
+
+class OllamaBackend(LLMBackend):
+    name = "ollama"
+
+    def __init__(self, host: str = OLLAMA_HOST, model: str = OLLAMA_MODEL, parallel: int = OLLAMA_PARALLEL,
+                 keep_alive: str = OLLAMA_KEEP_ALIVE, timeout: float = OLLAMA_TIMEOUT):
+        super().__init__(model, parallel)
+        self.url = f"{host}/api/generate"
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+
+    def _payload(self, prompt: str, stream: bool) -> dict:
+        return ollama_payload(prompt, self.model, stream, self.keep_alive)
+
+    async def generate(self, prompt: str) -> str:
+        response = await http_client.post(self.url, json=self._payload(prompt, False), timeout=self.timeout)
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        async with http_client.get_client().stream("POST", self.url, json=self._payload(prompt, True), timeout=self.timeout) as response:
+            response.raise_for_status()
+            # Ollama streams one JSON object per line
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    async def warm_up(self):
+        # An empty prompt just loads the model into memory (and keeps it there for keep_alive)
+        start = time.monotonic()
+        response = await http_client.post(self.url, json={"model": self.model, "keep_alive": self.keep_alive},
+                                          timeout=self.timeout)
+        response.raise_for_status()
+        logger.info(f"Ollama model {self.model} loaded in {time.monotonic() - start:.1f}s")
+
+_gemini_models: Dict[str, Any] = {}
+
+def gemini_model(model: str = GEMINI_MODEL):
+    """A configured Gemini GenerativeModel, created once per model name."""
+    if model not in _gemini_models:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _gemini_models[model] = genai.GenerativeModel(model)
+    return _gemini_models[model]
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, model: str = GEMINI_MODEL, parallel: int = GEMINI_PARALLEL, timeout: float = GEMINI_TIMEOUT):
+        super().__init__(model, parallel)
+        self.timeout = timeout
+
+    def available(self) -> bool:
+        return bool(os.getenv("GEMINI_API_KEY"))
+
+    def client(self):
+        return gemini_model(self.model)
+
+    async def generate(self, prompt: str) -> str:
+        response = await asyncio.wait_for(self.client().generate_content_async(prompt), timeout=self.timeout)
+        return response.text.strip()
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        # Bounded per chunk, like the Ollama stream's read timeout, so a stalled stream gives up its slot
+        response = await asyncio.wait_for(self.client().generate_content_async(prompt, stream=True), timeout=self.timeout)
+        chunks = response.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+            except StopAsyncIteration:
+                return
+            if chunk.text:
+                yield chunk.text
+
+    async def warm_up(self):
+        self.client()
+
+class StubBackend(LLMBackend):
+    """Offline backend for development: echoes a canned answer without calling any model."""
+    name = "stub"
+
+    def __init__(self):
+        super().__init__("stub", parallel=8)
+
+    async def generate(self, prompt: str) -> str:
+        first_line = prompt.strip().splitlines()[0] if prompt.strip() else ""
+        return f"[stub response to a {len(prompt)}-character prompt: {first_line[:80]}]"
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        for word in (await self.generate(prompt)).split(" "):
+            yield word + " "
+
+BACKEND_TYPES = {'ollama': OllamaBackend, 'gemini': GeminiBackend, 'stub': StubBackend}
+
+class LLMService:
+    """
+    Runs completions on the configured backends in order, falling back to the next one
+    on errors, timeouts or a queue wait over LLM_QUEUE_TIMEOUT. Each backend admits only
+    as many concurrent requests as it's configured for; the rest wait by priority.
+    """
+    def __init__(self, backends: List[LLMBackend]):
+        self.backends = backends
+
+    def models(self) -> List[str]:
+        return [backend.model for backend in self.backends]
+
+    def _candidates(self) -> List[LLMBackend]:
+        return [backend for backend in self.backends if backend.available()]
+
+    @staticmethod
+    def _queue_timeout(level: int) -> Optional[float]:
+        return LLM_QUEUE_TIMEOUT if level < BACKGROUND else None
+
+    async def generate(self, prompt: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Returns:
+            (text, model), or (None, None) if no backend produced any text.
+        """
+        ticket = current_ticket()
+        for backend in self._candidates():
+            start = time.monotonic()
+            try:
+                async with backend.slots.slot(ticket, self._queue_timeout(ticket.level)):
+                    start = time.monotonic()
+                    text = await backend.generate(prompt)
+                backend.calls += 1
+                backend.total_seconds += time.monotonic() - start
+                if text:
+                    return text, backend.model
+                logger.warning(f"{backend.name} returned an empty response")
+            except asyncio.TimeoutError:
+                backend.failures += 1
+                logger.warning(f"{backend.name} timed out after {time.monotonic() - start:.0f}s")
+            except Exception as e:
+                backend.failures += 1
+                logger.warning(f"{backend.name} failed: {e}")
+        return None, None
+
+    async def stream(self, prompt: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Yields (chunk, model). Falls back to the next backend only while nothing has been
+        yielded; once part of the text is out, a failure raises StreamInterrupted.
+        """
+        ticket = current_ticket()
+        for backend in self._candidates():
+            sent_any = False
+            try:
+                async with backend.slots.slot(ticket, self._queue_timeout(ticket.level)):
+                    start = time.monotonic()
+                    async for chunk in backend.stream(prompt):
+                        sent_any = True
+                        yield chunk, backend.model
+                backend.calls += 1
+                backend.total_seconds += time.monotonic() - start
+                if sent_any:
+                    return
+                logger.warning(f"{backend.name} returned an empty response")
+            except Exception as e:
+                backend.failures += 1
+                if sent_any:
+                    # Part of the text is already out; a different model can't continue it
+                    logger.error(f"{backend.name} stream broke off: {e}")
+                    raise StreamInterrupted(f"{backend.name} stream broke off: {e}") from e
+                logger.warning(f"{backend.name} failed: {e!r}")
+
+    async def warm_up(self):
+        """Loads models ahead of the first request. Failures are logged, not raised."""
+        for backend in self._candidates():
+            try:
+                await backend.warm_up()
+            except Exception as e:
+                logger.warning(f"Warm-up of {backend.name} failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {backend.name: backend.stats() for backend in self.backends}
+
+_service = None
+
+def get_service() -> LLMService:
+    global _service
+    if _service is None:
+        backends = []
+        for name in LLM_BACKENDS:
+            if name not in BACKEND_TYPES:
+                logger.warning(f"Unknown LLM backend '{name}' in LLM_BACKENDS, ignoring")
+                continue
+            backends.append(BACKEND_TYPES[name]())
+        _service = LLMService(backends)
+    return _service
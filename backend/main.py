@@ -1,20 +1,71 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import uvicorn
 import logging
 
-from news_fetcher import get_aggregated_news, get_article_content
-from summarizer import generate_summary
-import yfinance as yf
-import time
+from articles import Article
+from news_fetcher import get_timeline_news_async, extract_articles_async, source_registry
+from summarizer import generate_summary_async, stream_summary_async, SummaryUnavailable
+import http_client
+import rate_limiter
+import llm_backends
+from news_cache import create_cache, ttl_for, STALE_TTL
+from scheduler import PrewarmScheduler, PREWARM_ENABLED
+from ticker_metadata import resolve_ticker
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Stock News Aggregator API")
+prewarm_scheduler = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global prewarm_scheduler
+    warm_up = None
+    if llm_backends.LLM_WARMUP:
+        # Load the model now rather than on the first user's request
+        warm_up = asyncio.create_task(llm_backends.get_service().warm_up())
+    if PREWARM_ENABLED:
+        # Keep the saved portfolio's cache entries warm so dashboard loads are cache hits
+        prewarm_scheduler = PrewarmScheduler(lambda: list(portfolio), prewarm_stock_news)
+        prewarm_scheduler.start()
+    yield
+    if warm_up is not None and not warm_up.done():
+        warm_up.cancel()
+    if prewarm_scheduler is not None:
+        await prewarm_scheduler.stop()
+    # Release pooled keep-alive connections on shutdown
+    await http_client.aclose()
+
+try:
+    import orjson
+
+    def dumps(data) -> str:
+        return orjson.dumps(data).decode()
+except ImportError:
+    orjson = None
+
+    def dumps(data) -> str:
+        return json.dumps(data)
+
+class JSONBytesResponse(Response):
+    """
+    Serializes already-built JSON data (with orjson when installed) without FastAPI
+    validating it against the response model again.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content) if orjson is not None else json.dumps(content).encode()
+
+app = FastAPI(title="Stock News Aggregator API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -25,30 +76,111 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class AlternateSourceModel(BaseModel):
+    source: Optional[str] = None
+    publisher: Optional[str] = None
+    url: str
+
 class ArticleModel(BaseModel):
     title: str
     url: str
     publisher: Optional[str] = None
     published: Optional[str] = None
     source: str
+    # Other outlets that carried the same story
+    alternate_sources: List[AlternateSourceModel] = []
 
 class StockSummary(BaseModel):
+    """
+    Schema of a ticker's news response. The payload itself is built as plain JSON data
+    by stock_summary() from Article records, and served without re-validation.
+    """
     ticker: str
     summary: str
     articles: List[ArticleModel]
 
+def stock_summary(ticker: str, summary: str, articles: List[Article]) -> dict:
+    """A StockSummary-shaped dict, ready to cache and serialize."""
+    return {'ticker': ticker, 'summary': summary, 'articles': [article.to_dict() for article in articles]}
+
 @app.get("/")
 def read_root():
     return {"message": "Stock News Aggregator API is running"}
 
-import json
 import os
 
 PORTFOLIO_FILE = "portfolio.json"
 
-# Simple in-memory cache: {ticker: (data, timestamp)}
-news_cache = {}
-CACHE_DURATION = 3600  # 1 hour
+# Pluggable news cache (sqlite by default, see news_cache.py), keyed by ticker
+news_cache = create_cache()
+
+# Background stale-while-revalidate refreshes in flight: {ticker: Task}
+refresh_tasks = {}
+
+# A response whose summary failed (LLM outage) stays fresh only this long, and never replaces a usable entry
+FAILED_SUMMARY_TTL = float(os.getenv("FAILED_SUMMARY_TTL", "120"))
+
+def cache_stock_news(ticker: str, result: dict, summarized: bool = True):
+    """Stores a ticker's StockSummary data; see FAILED_SUMMARY_TTL for unsummarized ones."""
+    key = ticker.upper()
+    if summarized:
+        news_cache.set(key, result, ttl=ttl_for(ticker))
+        return
+    entry = news_cache.get(key)
+    if entry is None or not entry.is_usable(STALE_TTL):
+        news_cache.set(key, result, ttl=FAILED_SUMMARY_TTL)
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto one in-progress computation.
+    Callers that arrive while it is running await the same result instead of
+    starting their own. The computation's LLM calls run at the most urgent priority
+    of the callers waiting on it, so a request joining a background refresh isn't
+    queued behind other background work.
+    """
+    def __init__(self):
+        self._in_flight = {}  # key -> (Task, PriorityTicket)
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def start(self, key: str, fn) -> asyncio.Task:
+        """
+        Starts fn() for `key`, or joins the computation already running for it.
+        Await the returned task through asyncio.shield, as do() does.
+        """
+        self.calls += 1
+        flight = self._in_flight.get(key)
+        if flight is None:
+            self.executions += 1
+            task, ticket = llm_backends.create_prioritized_task(fn())
+            self._in_flight[key] = (task, ticket)
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+            task, ticket = flight
+            ticket.boost(llm_backends.current_ticket().level)
+            logger.info(f"Coalescing request for {key} onto in-flight computation")
+        return task
+
+    async def do(self, key: str, fn):
+        # Shield so one disconnecting client doesn't cancel the work for everyone else
+        return await asyncio.shield(self.start(key, fn))
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved even if every waiter went away
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+news_flight = SingleFlight()
 
 def load_portfolio():
     if os.path.exists(PORTFOLIO_FILE):
@@ -80,26 +212,9 @@ def get_portfolio():
 def add_ticker(request: TickerRequest):
     ticker = request.ticker.upper()
     
-    # Smart Ticker Resolution
-    # 1. Check if valid as is
-    final_ticker = ticker
-    try:
-        info = yf.Ticker(ticker).info
-        # If it has no quoteType, it might be invalid, but yfinance is tricky.
-        # Usually invalid tickers return empty info or raise error.
-        if not info or 'quoteType' not in info:
-            raise ValueError("Invalid ticker")
-    except:
-        # 2. Try adding -USD for crypto
-        try:
-            crypto_ticker = f"{ticker}-USD"
-            info = yf.Ticker(crypto_ticker).info
-            if info and 'quoteType' in info:
-                final_ticker = crypto_ticker
-                logger.info(f"Auto-resolved {ticker} to {final_ticker}")
-        except:
-            # If both fail, keep original and let it fail later or be handled as unknown
-            pass
+    # Smart Ticker Resolution: as-is if valid, else the -USD crypto alias, else keep
+    # the original and let it fail later or be handled as unknown
+    final_ticker = resolve_ticker(ticker)['symbol']
 
     if final_ticker not in portfolio:
         portfolio.append(final_ticker)
@@ -107,6 +222,41 @@ def add_ticker(request: TickerRequest):
         return {"message": f"Added {final_ticker} to portfolio", "portfolio": portfolio}
     return {"message": f"{final_ticker} already in portfolio", "portfolio": portfolio}
 
+# Max tickers processed at once by the streaming portfolio endpoint
+PORTFOLIO_CONCURRENCY = int(os.getenv("PORTFOLIO_CONCURRENCY", "4"))
+
+@app.get("/api/portfolio/news")
+async def stream_portfolio_news():
+    """
+    Streams a StockSummary per portfolio ticker as NDJSON, in completion order.
+    Each line is {"ticker": ..., "data": StockSummary} or {"ticker": ..., "error": ...}.
+    """
+    tickers = list(portfolio)
+    semaphore = asyncio.Semaphore(PORTFOLIO_CONCURRENCY)
+
+    async def fetch(ticker: str):
+        try:
+            # Metadata lookups run in parallel, outside the semaphore, so a slow one
+            # only delays its own ticker
+            await asyncio.to_thread(resolve_ticker, ticker)
+            async with semaphore:
+                return {"ticker": ticker, "data": await stock_news(ticker)}
+        except Exception as e:
+            logger.error(f"Error fetching news for {ticker}: {e}")
+            return {"ticker": ticker, "error": str(e)}
+
+    async def generate():
+        tasks = [asyncio.create_task(fetch(ticker)) for ticker in tickers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield dumps(await next_done) + "\n"
+        finally:
+            # Client went away: stop waiting. Shared pipeline runs still finish and fill the cache.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @app.delete("/api/portfolio/{ticker}")
 def remove_ticker(ticker: str):
     ticker = ticker.upper()
@@ -116,64 +266,266 @@ def remove_ticker(ticker: str):
         return {"message": f"Removed {ticker} from portfolio", "portfolio": portfolio}
     raise HTTPException(status_code=404, detail="Ticker not found")
 
+async def prewarm_stock_news(ticker: str) -> dict:
+    """Scheduler refreshes: their LLM calls queue behind interactive requests."""
+    with llm_backends.priority(llm_backends.BACKGROUND):
+        return await refresh_stock_news(ticker)
+
+async def refresh_stock_news(ticker: str) -> dict:
+    """
+    Runs the full pipeline for a ticker and stores the result in the cache.
+    Concurrent refreshes of the same ticker share a single pipeline run.
+    """
+    async def run():
+        result, summarized = await build_stock_summary(ticker)
+        await asyncio.to_thread(cache_stock_news, ticker, result, summarized)
+        return result
+    return await news_flight.do(ticker.upper(), run)
+
+def schedule_refresh(ticker: str):
+    """Starts a background refresh for a ticker unless one is already running."""
+    key = ticker.upper()
+    if key in refresh_tasks:
+        return
+    task = asyncio.create_task(refresh_stock_news(ticker))
+    refresh_tasks[key] = task
+
+    def _done(t):
+        refresh_tasks.pop(key, None)
+        if not t.cancelled() and t.exception():
+            logger.error(f"Background refresh for {ticker} failed: {t.exception()}")
+    task.add_done_callback(_done)
+
+@app.get("/api/metrics")
+def get_metrics():
+    return {
+        "single_flight": news_flight.stats(),
+        "cache": news_cache.stats(),
+        "scheduler": prewarm_scheduler.stats() if prewarm_scheduler else None,
+        "sources": source_registry.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "llm": llm_backends.get_service().stats(),
+    }
+
+@app.get("/api/sources")
+def get_source_health():
+    """Per-source circuit breaker state, outcome counts and latency."""
+    return source_registry.stats()
+
+@app.get("/api/scheduler")
+def get_scheduler_status():
+    if prewarm_scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **prewarm_scheduler.stats()}
+
 @app.get("/api/news/{ticker}", response_model=StockSummary)
-def get_stock_news(ticker: str):
-    # Check cache first
-    current_time = time.time()
-    if ticker in news_cache:
-        cached_data, timestamp = news_cache[ticker]
-        if current_time - timestamp < CACHE_DURATION:
+async def get_stock_news(ticker: str):
+    # Returning a Response skips FastAPI's second pass over the payload; StockSummary documents it
+    return JSONBytesResponse(await stock_news(ticker))
+
+async def stock_news(ticker: str) -> dict:
+    """A ticker's StockSummary data: from the cache when usable, else freshly built."""
+    # Check cache first (off the event loop: the default backend is SQLite)
+    entry = await asyncio.to_thread(news_cache.get, ticker.upper())
+    if entry is not None:
+        if entry.is_fresh():
             logger.info(f"Serving cached news for {ticker}")
-            return cached_data
+            return entry.value
+        if entry.is_usable(STALE_TTL):
+            # Stale-while-revalidate: answer instantly, refresh in the background
+            logger.info(f"Serving stale news for {ticker} ({entry.age():.0f}s old), refreshing in background")
+            schedule_refresh(ticker)
+            return entry.value
+
+    return await refresh_stock_news(ticker)
+
+def sse_event(event: str, data) -> str:
+    """Formats one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+REPORT_FAILED = "Could not build the report. Refresh to try again."
+
+class ReportStream:
+    """
+    The SSE events of one in-progress streamed report. Every stream request that joins
+    the report's flight follows it, replaying the events it missed.
+    """
+    def __init__(self):
+        self.events = []
+        self.finished = False
+        self._changed = asyncio.Event()
+
+    def publish(self, event: str, data):
+        self.events.append(sse_event(event, data))
+        self._wake()
+
+    def close(self):
+        self.finished = True
+        self._wake()
+
+    def _wake(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self):
+        sent = 0
+        while True:
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.finished:
+                return
+            await self._changed.wait()
+
+# Streamed reports in flight: {ticker: ReportStream}
+report_streams = {}
+
+def start_streamed_report(ticker: str):
+    """news_flight work for a stream request: registers the run's ReportStream, then runs it."""
+    stream = report_streams[ticker.upper()] = ReportStream()
+    return streamed_report(ticker, stream)
+
+async def streamed_report(ticker: str, stream: ReportStream) -> dict:
+    """
+    build_stock_summary for stream requests: publishes each step to `stream` as it
+    happens and caches the finished report. A report whose stream broke off is not cached.
 
+    Returns:
+        The StockSummary data, for callers that joined the flight without streaming.
+    """
+    try:
+        processed_articles, articles_for_summary = await collect_articles(ticker)
+        stream.publish("articles", [article.to_dict() for article in processed_articles])
+        if not processed_articles:
+            result = stock_summary(ticker, "No news found.", [])
+            await asyncio.to_thread(cache_stock_news, ticker, result)
+            stream.publish("token", "No news found.")
+            stream.publish("done", {"cached": False, "complete": True})
+            return result
+
+        tokens = []
+        try:
+            async for token in stream_summary_async(ticker, articles_for_summary):
+                tokens.append(token)
+                stream.publish("token", token)
+        except llm_backends.StreamInterrupted as e:
+            # Leave the cache alone: the next request regenerates the whole report
+            logger.error(f"Summary stream for {ticker} broke off: {e}")
+            stream.publish("token", "\n\n[Summary interrupted. Refresh to try again.]")
+            stream.publish("done", {"cached": False, "complete": False})
+            raise
+        except SummaryUnavailable as e:
+            result = stock_summary(ticker, e.message, processed_articles)
+            await asyncio.to_thread(cache_stock_news, ticker, result, False)
+            stream.publish("token", e.message)
+            stream.publish("done", {"cached": False, "complete": False})
+            return result
+
+        result = stock_summary(ticker, "".join(tokens), processed_articles)
+        await asyncio.to_thread(cache_stock_news, ticker, result)
+        stream.publish("done", {"cached": False, "complete": True})
+        return result
+    except Exception as e:
+        if not isinstance(e, llm_backends.StreamInterrupted):
+            logger.error(f"Report for {ticker} failed: {e}")
+            stream.publish("error", {"message": REPORT_FAILED})
+        raise
+    finally:
+        stream.close()
+        report_streams.pop(ticker.upper(), None)
+
+@app.get("/api/news/{ticker}/summary/stream")
+async def stream_stock_summary(ticker: str):
+    """
+    Streams a ticker's report over SSE: one `articles` event with the article list,
+    then `token` events as the LLM produces text, then `done`, or `error` if the
+    pipeline failed. Concurrent requests for a ticker share one pipeline run (news_flight).
+    The finished report is written to the news cache; one whose stream broke off
+    ends with `done` {"complete": false} and is not cached.
+    """
+    async def generate():
+        key = ticker.upper()
+        entry = await asyncio.to_thread(news_cache.get, key)
+        if entry is not None and entry.is_fresh():
+            yield sse_event("articles", entry.value["articles"])
+            yield sse_event("token", entry.value["summary"])
+            yield sse_event("done", {"cached": True})
+            return
+
+        flight = news_flight.start(key, lambda: start_streamed_report(ticker))
+        stream = report_streams.get(key)
+        if stream is not None:
+            async for event in stream.follow():
+                yield event
+            return
+
+        # Joined a run that isn't streamed (e.g. an /api/news refresh): send its report when ready
+        try:
+            result = await asyncio.shield(flight)
+        except Exception as e:
+            logger.error(f"Report for {ticker} failed: {e}")
+            yield sse_event("error", {"message": REPORT_FAILED})
+            return
+        yield sse_event("articles", result["articles"])
+        yield sse_event("token", result["summary"])
+        yield sse_event("done", {"cached": False})
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+async def collect_articles(ticker: str):
+    """
+    Scrapes news for a ticker and extracts full text for the summary.
+    
+    Returns:
+        (articles for display, extracted articles for the summarizer)
+    """
     logger.info(f"Fetching news for {ticker}")
     
     # 1. Fetch news articles
-    articles_data = get_aggregated_news(ticker)
+    articles_data = await get_timeline_news_async(ticker)
     
     print(f"\n{'='*50}\nSCRAPED NEWS FOR {ticker}\n{'='*50}")
     for i, article in enumerate(articles_data):
-        print(f"{i+1}. [{article.get('source')}] {article.get('title')}")
-        print(f"   URL: {article.get('url')}")
-        print(f"   Date: {article.get('published')}")
+        print(f"{i+1}. [{article.source}] {article.title}")
+        print(f"   URL: {article.url}")
+        print(f"   Date: {article.published}")
     print(f"{'='*50}\n")
     
     if not articles_data:
-        return StockSummary(ticker=ticker, summary="No news found.", articles=[])
+        return [], []
 
-    # 2. Extract content for summarization (limit to top 5 to save time/tokens)
+    # 2. Extract content for summarization
     articles_for_summary = []
-    processed_articles = []
     
-    # Process all articles for display
-    for article in articles_data:
-        article_model = ArticleModel(
-            title=article.get('title') or "No Title",
-            url=article.get('url') or "",
-            publisher=article.get('publisher'),
-            published=str(article.get('published')),
-            source=article.get('source') or "Unknown"
-        )
-        processed_articles.append(article_model)
-    
-    # But only extract content for first 2 for AI summarization (more content for detailed reports)
-    for article in articles_data[:2]:
-        content = get_article_content(article['url'])
-        if content:
-            articles_for_summary.append({
-                'content': content,
-                'source': article.get('source', 'Unknown'),
-                'title': article.get('title', 'No Title')
-            })
+    # Full text for the summary: the best few of a larger candidate set, fetched in parallel
+    for article, content in await extract_articles_async(articles_data):
+        articles_for_summary.append({
+            'content': content,
+            'source': article.source,
+            'title': article.title
+        })
+    return articles_data, articles_for_summary
+
+async def build_stock_summary(ticker: str):
+    """
+    Scrapes, extracts and summarizes news for a ticker.
+
+    Returns:
+        (StockSummary data, whether the summary was generated). When no LLM backend
+        could summarize, the data carries the failure note in place of the summary.
+    """
+    processed_articles, articles_for_summary = await collect_articles(ticker)
+    if not processed_articles:
+        return stock_summary(ticker, "No news found.", []), True
         
     # 3. Generate summary
-    summary = generate_summary(ticker, articles_for_summary)
+    try:
+        summary = await generate_summary_async(ticker, articles_for_summary)
+    except SummaryUnavailable as e:
+        logger.warning(f"No summary generated for {ticker}")
+        return stock_summary(ticker, e.message, processed_articles), False
     
-    return StockSummary(
-        ticker=ticker,
-        summary=summary,
-        articles=processed_articles
-    )
+    return stock_summary(ticker, summary, processed_articles), True
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
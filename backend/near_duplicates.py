@@ -0,0 +1,147 @@
+import re
+import zlib
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List
+
+import numpy as np
+
+from articles import Article, AlternateSource
+
+logger = logging.getLogger(__name__)
+
+# MinHash signature size and LSH banding. With 16 bands of 4 rows, pairs with a Jaccard
+# similarity around 0.5 or more almost always share a bucket; candidates are then
+# checked against the thresholds below on their full signatures.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+TITLE_THRESHOLD = 0.6
+BODY_THRESHOLD = 0.5
+
+TITLE_SHINGLE = 4   # characters
+BODY_SHINGLE = 5    # words
+BODY_WORDS = 400    # only the lead of the body is compared
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+# " - Reuters", " | Benzinga": syndicated titles often end with the outlet's name
+PUBLISHER_SUFFIX = re.compile(r'\s+[-|–—]\s+[^-|–—]{2,40}$')
+NON_WORD = re.compile(r'[^a-z0-9 ]+')
+# Titles that differ only in these are different stories ("Q3" vs "Q4 results", "rise 2%"
+# vs "rise 5%"), however many characters they share, so similar titles must agree on them
+NUMBER = re.compile(r'\d+')
+ORDINALS = frozenset({
+    'first', 'second', 'third', 'fourth', 'fifth', 'sixth', 'seventh', 'eighth', 'ninth', 'tenth',
+})
+
+def normalize_title(title: str) -> str:
+    title = PUBLISHER_SUFFIX.sub('', title or '')
+    return ' '.join(NON_WORD.sub(' ', title.lower()).split())
+
+def title_markers(title: str) -> frozenset:
+    """The numbers and ordinal words in a title (digits inside "q3", "1st" included)."""
+    text = normalize_title(title)
+    return frozenset(NUMBER.findall(text)) | ORDINALS.intersection(text.split())
+
+def title_shingles(title: str) -> set:
+    text = normalize_title(title)
+    if len(text) <= TITLE_SHINGLE:
+        return {text} if text else set()
+    return {text[i:i + TITLE_SHINGLE] for i in range(len(text) - TITLE_SHINGLE + 1)}
+
+def body_shingles(body: str) -> set:
+    words = NON_WORD.sub(' ', (body or '').lower()).split()[:BODY_WORDS]
+    if len(words) < BODY_SHINGLE:
+        return set()
+    return {' '.join(words[i:i + BODY_SHINGLE]) for i in range(len(words) - BODY_SHINGLE + 1)}
+
+def minhash(shingles: set) -> np.ndarray:
+    """MinHash signature of a shingle set (NUM_PERM values), vectorized over the shingles."""
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1)
+
+def _similar_pairs(signatures: Dict[int, np.ndarray], threshold: float):
+    """Index pairs whose estimated Jaccard similarity is at least `threshold`, found via LSH."""
+    buckets = defaultdict(list)
+    for index, signature in signatures.items():
+        for band in range(BANDS):
+            buckets[(band, signature[band * ROWS:(band + 1) * ROWS].tobytes())].append(index)
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                pair = (members[i], members[j])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if np.mean(signatures[pair[0]] == signatures[pair[1]]) >= threshold:
+                    yield pair
+
+def cluster_indices(articles: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Groups articles that are the same story: similar titles with the same numbers and
+    ordinals (see title_markers), or similar bodies when 'content' is present. Runs in
+    roughly linear time (MinHash + LSH, then union-find).
+
+    Returns:
+        Clusters of indices into `articles`, each in input order, ordered by first member.
+    """
+    parent = list(range(len(articles)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            # The earlier article stays the root, and so the representative
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    titles, bodies = {}, {}
+    for index, article in enumerate(articles):
+        shingles = title_shingles(article.get('title'))
+        if shingles:
+            titles[index] = minhash(shingles)
+        shingles = body_shingles(article.get('content'))
+        if shingles:
+            bodies[index] = minhash(shingles)
+
+    for i, j in _similar_pairs(titles, TITLE_THRESHOLD):
+        if title_markers(articles[i].get('title')) == title_markers(articles[j].get('title')):
+            union(i, j)
+    for i, j in _similar_pairs(bodies, BODY_THRESHOLD):
+        union(i, j)
+
+    clusters = defaultdict(list)
+    for index in range(len(articles)):
+        clusters[find(index)].append(index)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+def collapse_near_duplicates(articles: List[Article]) -> List[Article]:
+    """
+    Collapses each cluster of near-duplicates to its first article, which gets the
+    copies it replaced as its alternate_sources.
+    """
+    if len(articles) < 2:
+        return articles
+
+    collapsed = []
+    for members in cluster_indices(articles):
+        collapsed.append(articles[members[0]].with_alternates(
+            AlternateSource(url=articles[index].url, source=articles[index].source, publisher=articles[index].publisher)
+            for index in members[1:]
+        ))
+
+    if len(collapsed) < len(articles):
+        logger.info(f"Collapsed {len(articles)} articles into {len(collapsed)} distinct stories")
+    return collapsed
@@ -0,0 +1,286 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache"))
+
+# Fresh for DEFAULT_TTL seconds, then served stale (while a refresh runs) for STALE_TTL more.
+DEFAULT_TTL = float(os.getenv("NEWS_CACHE_TTL", "3600"))
+STALE_TTL = float(os.getenv("NEWS_CACHE_STALE_TTL", "86400"))
+MAX_ENTRIES = int(os.getenv("NEWS_CACHE_MAX_ENTRIES", "500"))
+MAX_BYTES = int(os.getenv("NEWS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Instruments whose news moves faster than equities get shorter TTLs by default.
+# Explicit per-ticker overrides: NEWS_CACHE_TTL_OVERRIDES="BTC-USD=300,AAPL=1800"
+SUFFIX_TTLS = {
+    '-USD': 900,   # Crypto
+    '=F': 1800,    # Futures
+}
+
+def _parse_overrides(raw: str) -> Dict[str, float]:
+    overrides = {}
+    for item in raw.split(','):
+        if '=' not in item:
+            continue
+        ticker, _, seconds = item.rpartition('=')
+        try:
+            overrides[ticker.strip().upper()] = float(seconds)
+        except ValueError:
+            logger.warning(f"Ignoring invalid cache TTL override: {item}")
+    return overrides
+
+TTL_OVERRIDES = _parse_overrides(os.getenv("NEWS_CACHE_TTL_OVERRIDES", ""))
+
+def ttl_for(ticker: str) -> float:
+    """Returns the freshness TTL in seconds for a ticker."""
+    ticker = ticker.upper()
+    if ticker in TTL_OVERRIDES:
+        return TTL_OVERRIDES[ticker]
+    for suffix, ttl in SUFFIX_TTLS.items():
+        if ticker.endswith(suffix):
+            return ttl
+    return DEFAULT_TTL
+
+class CacheEntry:
+    """A cached value with the time it was stored and its freshness TTL."""
+    __slots__ = ('value', 'created_at', 'ttl')
+
+    def __init__(self, value: Any, created_at: float, ttl: float):
+        self.value = value
+        self.created_at = created_at
+        self.ttl = ttl
+
+    def age(self, now: float = None) -> float:
+        return (now or time.time()) - self.created_at
+
+    def is_fresh(self, now: float = None) -> bool:
+        return self.age(now) < self.ttl
+
+    def is_usable(self, stale_ttl: float = STALE_TTL, now: float = None) -> bool:
+        """True while the entry may still be served, fresh or stale."""
+        return self.age(now) < self.ttl + stale_ttl
+
+class CacheBackend:
+    """
+    Interface for news cache backends. Values must be JSON-serializable.
+    Backends are responsible for their own memory/size bounds.
+    """
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def get_many(self, keys: List[str]) -> Dict[str, CacheEntry]:
+        """The entries found among `keys`. Backends override this with a single round trip."""
+        entries = {}
+        for key in keys:
+            entry = self.get(key)
+            if entry is not None:
+                entries[key] = entry
+        return entries
+
+    def set_many(self, items: Dict[str, Any], ttl: float = DEFAULT_TTL):
+        for key, value in items.items():
+            self.set(key, value, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+class MemoryLRUCache(CacheBackend):
+    """In-process LRU bounded by entry count and approximate serialized size."""
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (CacheEntry, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL):
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (CacheEntry(value, time.time(), ttl), size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                evicted_key, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                logger.debug(f"Evicted {evicted_key} from memory cache")
+
+    def delete(self, key: str):
+        with self._lock:
+            item = self._entries.pop(key, None)
+            if item is not None:
+                self._bytes -= item[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': 'memory', 'entries': len(self._entries), 'bytes': self._bytes}
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk cache that survives restarts and is shared by every uvicorn worker
+    on the host. Least recently used rows are evicted past max_entries. Reads
+    don't write: their access times are kept in memory and saved with the next write.
+    """
+    def __init__(self, path: str = None, max_entries: int = MAX_ENTRIES):
+        self.path = path or os.path.join(CACHE_DIR, "news_cache.db")
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._accessed = {}  # key -> last read time, not yet written
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, "
+            "ttl REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at, ttl FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def _flush_accessed(self):
+        """Writes pending read times; call with the lock held, inside the write's transaction."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL):
+        now = time.time()
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._flush_accessed()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, ttl, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now, ttl, now),
+            )
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, CacheEntry]:
+        entries = {}
+        now = time.time()
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at, ttl FROM cache WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, value, created_at, ttl in rows:
+                    entries[key] = CacheEntry(json.loads(value), created_at, ttl)
+                    self._accessed[key] = now
+        return entries
+
+    def set_many(self, items: Dict[str, Any], ttl: float = DEFAULT_TTL):
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(value, default=str), now, ttl, now) for key, value in items.items()]
+        with self._lock:
+            self._flush_accessed()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, ttl, accessed_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            # Counting is cheaper than the sort the eviction needs, so only evict when over the bound
+            if self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {'backend': 'sqlite', 'path': self.path, 'entries': count}
+
+class RedisCache(CacheBackend):
+    """
+    Redis (or any Redis-protocol server) backend for multi-host deployments.
+    Keys expire on the server once they are past their stale window, and
+    Redis' own maxmemory policy provides the memory bound.
+    """
+    def __init__(self, url: str = None, prefix: str = "news:", stale_ttl: float = STALE_TTL):
+        import redis  # Optional dependency, only needed for this backend
+        self.url = url or os.getenv("REDIS_URL", "redis://localhost:6379/0")
+        self.prefix = prefix
+        self.stale_ttl = stale_ttl
+        self._client = redis.Redis.from_url(self.url)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raw = self._client.get(self.prefix + key)
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return CacheEntry(data['value'], data['created_at'], data['ttl'])
+
+    def set(self, key: str, value: Any, ttl: float = DEFAULT_TTL):
+        payload = json.dumps({'value': value, 'created_at': time.time(), 'ttl': ttl}, default=str)
+        self._client.set(self.prefix + key, payload, ex=int(ttl + self.stale_ttl))
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def stats(self) -> Dict[str, Any]:
+        # Not the URL itself: it may carry a password
+        location = urlsplit(self.url)
+        return {'backend': 'redis', 'host': location.hostname, 'port': location.port, 'db': location.path.lstrip('/') or '0'}
+
+def create_cache(backend: str = None) -> CacheBackend:
+    """
+    Builds the configured cache backend (NEWS_CACHE_BACKEND: sqlite, memory or redis).
+    Falls back to the in-memory LRU if the requested backend can't be initialized.
+    """
+    backend = (backend or os.getenv("NEWS_CACHE_BACKEND", "sqlite")).lower()
+    try:
+        if backend == "redis":
+            return RedisCache()
+        if backend == "sqlite":
+            return SQLiteCache()
+    except Exception as e:
+        logger.error(f"Could not initialize {backend} cache, using in-memory cache: {e}")
+    return MemoryLRUCache()
@@ -1,63 +1,57 @@
 import yfinance as yf
-from newspaper import Article
+import newspaper
 from GoogleNews import GoogleNews
 import logging
-import requests
-import dateparser
+import asyncio
 import time
 import random
 import datetime
-from bs4 import BeautifulSoup
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+
+import http_client
+import html_parsing
+import article_store
+import rate_limiter
+import article_filter
+import news_timeline
+import sentiment
+from articles import Article
+from news_sources import NewsSource, registry as source_registry
+from ticker_metadata import resolve_ticker, cached_company_name
+from near_duplicates import collapse_near_duplicates, cluster_indices
+from date_parsing import parse_date, parse_finviz_date
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fan-out deadlines (seconds). A source that misses its own deadline is dropped,
+# and nothing is waited for past the overall deadline.
+SOURCE_TIMEOUT = float(os.getenv("NEWS_SOURCE_TIMEOUT", "12"))
+AGGREGATE_TIMEOUT = float(os.getenv("NEWS_AGGREGATE_TIMEOUT", "20"))
+
 def normalize_date(date_input):
     """Normalizes various date formats to ISO 8601 string for JavaScript compatibility."""
-    if not date_input:
-        return None
-    
-    try:
-        # Handle Unix timestamps (from Yahoo Finance)
-        if isinstance(date_input, (int, float)):
-            return datetime.datetime.fromtimestamp(date_input).isoformat()
-        
-        # Parse other date formats using dateparser
-        parsed_date = dateparser.parse(str(date_input))
-        if parsed_date:
-            return parsed_date.isoformat()
-            
-        return None  # Return None instead of invalid string
-    except Exception as e:
-        logger.debug(f"Error normalizing date '{date_input}': {e}")
-        return None
+    parsed_date = parse_date(date_input)
+    return parsed_date.isoformat() if parsed_date else None
 
 def get_company_info(ticker: str):
     """Fetches company name and other info from ticker."""
-    try:
-        stock = yf.Ticker(ticker)
-        # Use 'or ticker' to handle case where key exists but value is None
-        return stock.info.get('longName') or ticker
-    except:
-        return ticker
+    return resolve_ticker(ticker)['long_name'] or ticker
 
-def is_recent(date_str: str, days: int = 30) -> bool:
+def is_recent(published, days: int = 30) -> bool:
     """
-    Checks if the given date string is within the last 'days' days.
+    Checks if the given date (a datetime, or an ISO string) is within the last 'days' days.
     Returns True if recent or if date is None (to be safe/permissive if parsing fails),
     False if definitely older.
     """
-    if not date_str:
+    if not published:
         return True
         
     try:
-        # date_str is expected to be ISO format from normalize_date
-        dt = datetime.datetime.fromisoformat(date_str)
-        # If timezone aware, convert to naive or handle properly. 
-        # normalize_date returns ISO strings which might have offsets.
-        # Let's use dateparser again to be safe or just compare timestamps if possible.
-        # Actually, since we control normalize_date, we know it returns ISO.
+        dt = published if isinstance(published, datetime.datetime) else datetime.datetime.fromisoformat(published)
         
         # Simplest way to handle potential timezone mismatch:
         if dt.tzinfo:
@@ -68,365 +62,670 @@ def is_recent(date_str: str, days: int = 30) -> bool:
         delta = now - dt
         return delta.days <= days
     except Exception as e:
-        logger.debug(f"Error checking recency for {date_str}: {e}")
+        logger.debug(f"Error checking recency for {published}: {e}")
         return True # Default to keeping it if we can't parse, to avoid losing data
 
-def is_valid_source(article: dict) -> bool:
+def is_valid_source(article: Article) -> bool:
     """
-    Filters out unwanted sources, specifically Zacks Research.
-    Returns True if the source is valid, False otherwise.
+    Filters out unwanted sources (the article_filter blocklist, e.g. Zacks Research)
+    and stale articles. Returns True if the article should be kept.
+    The aggregators filter whole batches with filter_articles instead.
     """
-    # Check title for Zacks and other spammy keywords
-    title = article.get('title', '').lower()
-    if 'zacks' in title or 'zack' in title:
+    if article_filter.is_blocked(article.title, article.publisher, article.source):
         return False
-        
-    # Check publisher/source
-    publisher = article.get('publisher', '').lower()
-    source = article.get('source', '').lower()
-    
-    if 'zacks' in publisher or 'zacks' in source:
-        return False
-        
-    # Check recency
-    if not is_recent(article.get('published')):
-        return False
-        
-    return True
+    return is_recent(article.published)
+
+def filter_articles(articles, ticker: str, company_name: str = None):
+    """
+    Batch spam, relevance and recency filter for one ticker's articles: drops blocked
+    publishers, the ticker's excluded phrases, and articles from search-based sources
+    that mention neither the company nor the ticker.
+    """
+    if not articles:
+        return articles
+    ticker_feeds = {source.name for source in source_registry.sources() if 'ticker_feed' in source.capabilities}
+    kept = article_filter.for_ticker(ticker, company_name).filter(articles, ticker_feeds)
+    return [article for article in kept if is_recent(article.published)]
+
+def _yahoo_news(ticker: str):
+    """get_yahoo_news without the error handling."""
+    stock = yf.Ticker(ticker)
+    news = stock.news
+    articles = []
+
+    # Get company name for filtering (simple heuristic)
+    # We might not have the full name easily without an extra API call, 
+    # but the ticker is a good start.
+    keywords = [ticker.upper()]
+
+    for item in news:
+        # Handle nested content structure (new yfinance API)
+        content = item.get('content', {})
+
+        # Try to get title from content or top level
+        title = content.get('title') or item.get('title', '')
+
+        # Try to get URL
+        url = item.get('link')
+        if not url:
+            url = item.get('clickThroughUrl', {}).get('url')
+        if not url:
+            url = content.get('canonicalUrl', {}).get('url')
+        if not url:
+            url = item.get('canonicalUrl', {}).get('url')
+
+        # Try to get date
+        pub_date = content.get('pubDate') or item.get('providerPublishTime')
+
+        # Filter: Title must contain ticker or be very relevant
+        # Yahoo Finance usually returns relevant news, so we'll trust it more
+        # but still filter out obvious noise if needed later.
+        # For now, we return everything yfinance gives us for the ticker.
+
+        if url and title:
+            article_data = Article.create(
+                title=title,
+                url=url,
+                publisher=item.get('provider', {}).get('displayName') or item.get('publisher', 'Yahoo Finance'),
+                published=parse_date(pub_date),
+                source='Yahoo Finance',
+                summary=content.get('summary') or item.get('summary'),
+            )
+
+            if article_data:
+                articles.append(article_data)
+
+    return articles
 
 def get_yahoo_news(ticker: str):
     """Fetches news from Yahoo Finance and filters for relevance."""
     try:
-        stock = yf.Ticker(ticker)
-        news = stock.news
-        articles = []
-        
-        # Get company name for filtering (simple heuristic)
-        # We might not have the full name easily without an extra API call, 
-        # but the ticker is a good start.
-        keywords = [ticker.upper()]
-        
-        for item in news:
-            # Handle nested content structure (new yfinance API)
-            content = item.get('content', {})
-            
-            # Try to get title from content or top level
-            title = content.get('title') or item.get('title', '')
-            
-            # Try to get URL
-            url = item.get('link')
-            if not url:
-                url = item.get('clickThroughUrl', {}).get('url')
-            if not url:
-                url = content.get('canonicalUrl', {}).get('url')
-            if not url:
-                url = item.get('canonicalUrl', {}).get('url')
-                
-            # Try to get date
-            pub_date = content.get('pubDate') or item.get('providerPublishTime')
-            
-            # Filter: Title must contain ticker or be very relevant
-            # Yahoo Finance usually returns relevant news, so we'll trust it more
-            # but still filter out obvious noise if needed later.
-            # For now, we return everything yfinance gives us for the ticker.
-
-            if url and title:
-                article_data = {
-                    'title': title,
-                    'url': url,
-                    'publisher': item.get('provider', {}).get('displayName') or item.get('publisher', 'Yahoo Finance'),
-                    'published': normalize_date(pub_date),
-                    'source': 'Yahoo Finance'
-                }
-                
-                if is_valid_source(article_data):
-                    articles.append(article_data)
-                    
-        return articles
+        return _yahoo_news(ticker)
     except Exception as e:
         logger.error(f"Error fetching Yahoo news for {ticker}: {e}")
         return []
 
+async def get_yahoo_news_async(ticker: str):
+    """
+    Async variant of get_yahoo_news. yfinance is blocking, so it runs in a worker thread.
+    Errors propagate so the fan-out can count them against the source's health.
+    """
+    return await asyncio.to_thread(_yahoo_news, ticker)
+
+def _google_news(ticker: str, company_name: str = None, period='7d'):
+    """get_google_news without the error handling."""
+    googlenews = GoogleNews(period=period)
+    search_term = company_name if company_name else ticker
+    googlenews.search(search_term)
+    results = googlenews.result()
+    articles = []
+    for item in results:
+        url = item.get('link', '')
+
+        # Clean Google News URLs - remove tracking parameters that break links
+        if '&ved=' in url:
+            url = url.split('&ved=')[0]
+        if '&usg=' in url:
+            url = url.split('&usg=')[0]
+
+        article_data = Article.create(
+            title=item.get('title'),
+            url=url,
+            publisher=item.get('media'),
+            published=parse_date(item.get('date')),
+            source='Google News',
+            summary=item.get('desc'),
+        )
+
+        if article_data:
+            articles.append(article_data)
+
+    return articles
+
 def get_google_news(ticker: str, company_name: str = None, period='7d'):
     """Fetches news from Google News using company name for more relevant results."""
     try:
-        googlenews = GoogleNews(period=period)
-        search_term = company_name if company_name else ticker
-        googlenews.search(search_term)
-        results = googlenews.result()
-        articles = []
-        for item in results:
-            url = item.get('link', '')
-            
-            # Clean Google News URLs - remove tracking parameters that break links
-            if '&ved=' in url:
-                url = url.split('&ved=')[0]
-            if '&usg=' in url:
-                url = url.split('&usg=')[0]
-            
-            article_data = {
-                'title': item.get('title'),
-                'url': url,
-                'publisher': item.get('media'),
-                'published': normalize_date(item.get('date')),
-                'source': 'Google News'
-            }
-            
-            if is_valid_source(article_data):
-                articles.append(article_data)
-                
-        return articles
+        return _google_news(ticker, company_name, period)
     except Exception as e:
         logger.error(f"Error fetching Google news for {ticker}: {e}")
         return []
 
-def get_finviz_news(ticker: str):
-    """Fetches news from FinViz."""
-    try:
-        url = f"https://finviz.com/quote.ashx?t={ticker}"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.content, 'html.parser')
+async def get_google_news_async(ticker: str, company_name: str = None, period='7d'):
+    """
+    Async variant of get_google_news. GoogleNews is blocking, so it runs in a worker thread.
+    Errors propagate so the fan-out can count them against the source's health.
+    """
+    return await asyncio.to_thread(_google_news, ticker, company_name, period)
+
+def _finviz_request(ticker: str):
+    """Builds the FinViz URL and headers."""
+    url = f"https://finviz.com/quote.ashx?t={ticker}"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+    return url, headers
+
+def _parse_finviz_news(content: bytes):
+    """Parses a FinViz page into articles."""
+    # Only the news table is parsed, not the whole (large) quote page
+    root = html_parsing.parse_fragment(content, b'id="news-table"', b'table')
+    if root is None:
+        return []
         
-        news_table = soup.find(id='news-table')
-        if not news_table:
-            return []
+    articles = []
+    rows = html_parsing.FINVIZ_ROWS(root)
+    current_date = None  # Time-only rows inherit the date of the row above
+    
+    for row in rows:
+        # FinViz format: Date/Time in first td, Link in second td
+        cols = html_parsing.TD(row)
+        if len(cols) < 2:
+            continue
             
-        articles = []
-        rows = news_table.findAll('tr')
+        date_str = html_parsing.text(cols[0])
+        link_tag = html_parsing.first(html_parsing.LINK, cols[1])
         
-        for row in rows:
-            # FinViz format: Date/Time in first td, Link in second td
-            cols = row.findAll('td')
-            if len(cols) < 2:
-                continue
-                
-            date_str = cols[0].text.strip()
-            link_tag = cols[1].find('a')
+        if link_tag is None or not link_tag.get('href'):
+            continue
             
-            if not link_tag:
-                continue
-                
-            link = link_tag['href']
-            title = link_tag.text
-            publisher = "FinViz" # FinViz aggregates, but doesn't always list publisher clearly in the table
-            
-            # Basic date parsing could be added here if needed
-            
-            article_data = {
-                'title': title,
-                'url': link,
-                'publisher': publisher,
-                'published': normalize_date(date_str),
-                'source': 'FinViz'
-            }
-            
-            if is_valid_source(article_data):
-                articles.append(article_data)
+        link = link_tag.get('href')
+        title = link_tag.text_content()
+        publisher = "FinViz" # FinViz aggregates, but doesn't always list publisher clearly in the table
+        
+        published, current_date = parse_finviz_date(date_str, current_date)
+        
+        article_data = Article.create(
+            title=title,
+            url=link,
+            publisher=publisher,
+            published=published,
+            source='FinViz',
+        )
+        
+        if article_data:
+            articles.append(article_data)
+        
+        # Limit to recent news (last 50 items)
+        if len(articles) >= 50:
+            break
             
-            # Limit to recent news (last 50 items)
-            if len(articles) >= 50:
-                break
-                
-        return articles
+    return articles
 
+def get_finviz_news(ticker: str):
+    """Fetches news from FinViz."""
+    try:
+        url, headers = _finviz_request(ticker)
+        response = http_client.get_sync(url, headers=headers, timeout=10)
+        return _parse_finviz_news(response.content)
     except Exception as e:
         logger.error(f"Error fetching FinViz news for {ticker}: {e}")
         return []
 
-def get_article_content(url: str):
-    """Downloads and parses article content using newspaper3k."""
+async def get_finviz_news_async(ticker: str):
+    """
+    Async variant of get_finviz_news using the shared HTTP client.
+    Errors, including HTTP error statuses, propagate so the fan-out can count them
+    against the source's health.
+    """
+    url, headers = _finviz_request(ticker)
+    response = await http_client.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return await asyncio.to_thread(_parse_finviz_news, response.content)
+
+ARTICLE_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+
+def _parse_article_html(url: str, html: str):
+    """Runs newspaper3k extraction over already-downloaded HTML."""
+    article = newspaper.Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return article.text
+
+def _store_extracted(url: str, text: str, response_headers):
+    article_store.get_store().put(
+        url, text,
+        etag=response_headers.get('ETag'),
+        last_modified=response_headers.get('Last-Modified'),
+    )
+
+async def get_article_content_async(url: str, timeout: float = 15):
+    """
+    Returns article text, served from the local article store when possible.
+    Stale entries are revalidated with a conditional GET; only changed pages are re-parsed.
+    Downloads through the shared client and parses in a worker thread. If the re-fetch
+    fails, a stale stored copy is served rather than nothing.
+    """
+    record = None
     try:
-        article = Article(url)
-        article.download()
-        article.parse()
-        return article.text
+        record = await asyncio.to_thread(article_store.get_store().get, url)
+        if record and article_store.is_fresh(record):
+            return record['text'] or None
+
+        headers = {**ARTICLE_HEADERS, **article_store.conditional_headers(record)}
+        response = await http_client.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and record:
+            await asyncio.to_thread(article_store.get_store().touch, url)
+            return record['text'] or None
+        response.raise_for_status()
+        
+        text = await asyncio.to_thread(_parse_article_html, str(response.url), response.text)
+        await asyncio.to_thread(_store_extracted, url, text, response.headers)
+        return text
     except Exception as e:
+        if record and record['text']:
+            logger.warning(f"Re-fetching {url} failed ({e}), serving the stored copy")
+            return record['text']
         logger.error(f"Error extracting content from {url}: {e}")
         return None
 
-def get_marketwatch_news(ticker: str, company_name: str = None):
-    """Fetches news from MarketWatch by scraping."""
-    try:
-        search_term = company_name if company_name else ticker
-        url = f"https://www.marketwatch.com/search?q={search_term}&ts=0&tab=All%20News"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        articles = []
-        # MarketWatch search results - structure may vary
-        search_results = soup.find_all('div', class_='article__content')
-        
-        for result in search_results[:50]:  # Limit to 50
+# Full-text extraction for the summary: up to EXTRACT_CANDIDATES articles are downloaded
+# in parallel and the best SUMMARY_ARTICLES that yield usable text are kept
+SUMMARY_ARTICLES = int(os.getenv("SUMMARY_ARTICLES", "6"))
+EXTRACT_CANDIDATES = int(os.getenv("EXTRACT_CANDIDATES", "12"))
+EXTRACT_CONCURRENCY = int(os.getenv("EXTRACT_CONCURRENCY", "6"))
+EXTRACT_ARTICLE_TIMEOUT = float(os.getenv("EXTRACT_ARTICLE_TIMEOUT", "8"))
+EXTRACT_TIMEOUT = float(os.getenv("EXTRACT_TIMEOUT", "15"))
+MIN_ARTICLE_CHARS = 500
+
+# Hard paywalls: downloading these only ever yields a teaser
+PAYWALLED_DOMAINS = ('wsj.com', 'barrons.com', 'ft.com', 'bloomberg.com', 'economist.com', 'nytimes.com')
+PAYWALL_MARKERS = (
+    'subscribe to continue', 'to continue reading', 'already a subscriber', 'subscribe now to read',
+    'this content is for subscribers', 'create a free account to continue',
+)
+
+def _is_paywalled_url(url: str) -> bool:
+    host = rate_limiter.host_key(url)
+    return any(host == domain or host.endswith('.' + domain) for domain in PAYWALLED_DOMAINS)
+
+def _usable_text(text) -> bool:
+    """False for failed, teaser-only or paywalled extractions."""
+    if not text or len(text) < MIN_ARTICLE_CHARS:
+        return False
+    head = text[:2000].lower()
+    return not any(marker in head for marker in PAYWALL_MARKERS)
+
+def _rank_candidates(articles, limit: int):
+    """
+    Orders extraction candidates: newest first (the order the timeline returns), but
+    interleaved across sources so the summary isn't built from one outlet.
+    """
+    by_source = {}
+    for article in articles:
+        if _is_paywalled_url(article.url):
+            continue
+        by_source.setdefault(article.source, []).append(article)
+
+    ranked = []
+    queues = list(by_source.values())
+    while queues and len(ranked) < limit:
+        for queue in queues:
+            ranked.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return ranked[:limit]
+
+async def extract_articles_async(articles, keep: int = SUMMARY_ARTICLES, candidates: int = EXTRACT_CANDIDATES):
+    """
+    Downloads and extracts full text for the best `keep` of the top `candidates` articles.
+
+    Candidates are fetched concurrently (at most EXTRACT_CONCURRENCY at a time, each within
+    EXTRACT_ARTICLE_TIMEOUT). Pages that fail, time out or come back paywalled are skipped.
+    The stage returns once the `keep` highest-ranked usable articles are known, or at
+    EXTRACT_TIMEOUT with whatever succeeded by then.
+
+    Returns:
+        (article, text) pairs in rank order.
+    """
+    ranked = _rank_candidates(articles, candidates)
+    if not ranked or keep <= 0:
+        return []
+
+    semaphore = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+
+    async def extract(index, article):
+        async with semaphore:
             try:
-                link_tag = result.find('a', class_='link')
-                if not link_tag:
-                    continue
-                    
-                title = link_tag.get_text(strip=True)
-                link = link_tag.get('href')
-                
-                if not link.startswith('http'):
-                    link = 'https://www.marketwatch.com' + link
-                
-                # Get date if available
-                date_tag = result.find('span', class_='article__timestamp')
-                date_str = date_tag.get_text(strip=True) if date_tag else None
-                
-                article_data = {
-                    'title': title,
-                    'url': link,
-                    'publisher': 'MarketWatch',
-                    'published': normalize_date(date_str),
-                    'source': 'MarketWatch'
-                }
-                
-                if is_valid_source(article_data):
-                    articles.append(article_data)
-            except Exception as e:
-                logger.debug(f"Error parsing MarketWatch result: {e}")
+                text = await asyncio.wait_for(get_article_content_async(article.url, timeout=EXTRACT_ARTICLE_TIMEOUT),
+                                              timeout=EXTRACT_ARTICLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.info(f"Extraction timed out for {article.url}")
+                text = None
+        return index, text if _usable_text(text) else None
+
+    start = time.monotonic()
+    tasks = [asyncio.create_task(extract(index, article)) for index, article in enumerate(ranked)]
+    texts = [None] * len(ranked)
+    resolved = [False] * len(ranked)
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=EXTRACT_TIMEOUT):
+            index, text = await next_done
+            texts[index] = text
+            resolved[index] = True
+
+            # Done once every candidate ranked above the keep-th usable one has resolved
+            usable = 0
+            for index in range(len(ranked)):
+                if not resolved[index]:
+                    break
+                if texts[index]:
+                    usable += 1
+            if usable >= keep:
+                break
+    except asyncio.TimeoutError:
+        logger.warning(f"Extraction deadline reached after {time.monotonic() - start:.1f}s, using what finished")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    extracted = [(article, text) for article, text in zip(ranked, texts) if text]
+    # The same wire story under different headlines: keep only the best-ranked copy
+    clusters = cluster_indices([{'content': text} for _, text in extracted])
+    extracted = [extracted[members[0]] for members in clusters][:keep]
+    logger.info(f"Extracted {len(extracted)} of {len(ranked)} candidate articles in {time.monotonic() - start:.1f}s")
+    return extracted
+
+def _marketwatch_request(ticker: str, company_name: str = None):
+    """Builds the MarketWatch URL and headers."""
+    search_term = company_name if company_name else ticker
+    url = f"https://www.marketwatch.com/search?q={search_term}&ts=0&tab=All%20News"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    return url, headers
+
+def _parse_marketwatch_news(content: bytes):
+    """Parses a MarketWatch page into articles."""
+    root = html_parsing.parse(content)
+    if root is None:
+        return []
+    
+    articles = []
+    # MarketWatch search results - structure may vary
+    search_results = html_parsing.MARKETWATCH_RESULTS(root)
+    
+    for result in search_results[:50]:  # Limit to 50
+        try:
+            link_tag = html_parsing.first(html_parsing.MARKETWATCH_LINK, result)
+            if link_tag is None:
                 continue
                 
-        return articles
+            title = html_parsing.text(link_tag)
+            link = link_tag.get('href')
+            
+            if not link.startswith('http'):
+                link = 'https://www.marketwatch.com' + link
+            
+            # Get date if available
+            date_tag = html_parsing.first(html_parsing.MARKETWATCH_TIMESTAMP, result)
+            date_str = html_parsing.text(date_tag) if date_tag is not None else None
+            
+            article_data = Article.create(
+                title=title,
+                url=link,
+                publisher='MarketWatch',
+                published=parse_date(date_str),
+                source='MarketWatch',
+            )
+            
+            if article_data:
+                articles.append(article_data)
+        except Exception as e:
+            logger.debug(f"Error parsing MarketWatch result: {e}")
+            continue
+            
+    return articles
+
+def get_marketwatch_news(ticker: str, company_name: str = None):
+    """Fetches news from MarketWatch by scraping."""
+    try:
+        url, headers = _marketwatch_request(ticker, company_name)
+        response = http_client.get_sync(url, headers=headers, timeout=10)
+        return _parse_marketwatch_news(response.content)
     except Exception as e:
         logger.error(f"Error fetching MarketWatch news: {e}")
         return []
 
+async def get_marketwatch_news_async(ticker: str, company_name: str = None):
+    """
+    Async variant of get_marketwatch_news using the shared HTTP client.
+    Errors, including HTTP error statuses, propagate so the fan-out can count them
+    against the source's health.
+    """
+    url, headers = _marketwatch_request(ticker, company_name)
+    response = await http_client.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return await asyncio.to_thread(_parse_marketwatch_news, response.content)
+
+def _benzinga_request(ticker: str):
+    """Builds the Benzinga URL and headers."""
+    url = f"https://www.benzinga.com/quote/{ticker}"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    return url, headers
+
+def _parse_benzinga_news(content: bytes):
+    """Parses a Benzinga page into articles."""
+    root = html_parsing.parse(content)
+    if root is None:
+        return []
+    
+    articles = []
+    # Find news items (structure may vary)
+    news_items = html_parsing.BENZINGA_STORIES(root)
+    
+    for item in news_items[:50]:  # Limit to 50
+        try:
+            link_tag = html_parsing.first(html_parsing.LINK, item)
+            if link_tag is None:
+                continue
+                
+            title = html_parsing.text(link_tag)
+            link = link_tag.get('href')
+            
+            if not link.startswith('http'):
+                link = 'https://www.benzinga.com' + link
+            
+            # Get date if available
+            date_tag = html_parsing.first(html_parsing.TIME, item)
+            date_str = date_tag.get('datetime') if date_tag is not None else None
+            
+            article_data = Article.create(
+                title=title,
+                url=link,
+                publisher='Benzinga',
+                published=parse_date(date_str),
+                source='Benzinga',
+            )
+            
+            if article_data:
+                articles.append(article_data)
+        except Exception as e:
+            logger.debug(f"Error parsing Benzinga result: {e}")
+            continue
+            
+    return articles
+
 def get_benzinga_news(ticker: str):
     """Fetches news from Benzinga by scraping."""
     try:
-        url = f"https://www.benzinga.com/quote/{ticker}"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        articles = []
-        # Find news items (structure may vary)
-        news_items = soup.find_all('div', class_='story-block')
-        
-        for item in news_items[:50]:  # Limit to 50
-            try:
-                link_tag = item.find('a')
-                if not link_tag:
-                    continue
-                    
-                title = link_tag.get_text(strip=True)
-                link = link_tag.get('href')
-                
-                if not link.startswith('http'):
-                    link = 'https://www.benzinga.com' + link
-                
-                # Get date if available
-                date_tag = item.find('time')
-                date_str = date_tag.get('datetime') if date_tag else None
-                
-                article_data = {
-                    'title': title,
-                    'url': link,
-                    'publisher': 'Benzinga',
-                    'published': normalize_date(date_str),
-                    'source': 'Benzinga'
-                }
-                
-                if is_valid_source(article_data):
-                    articles.append(article_data)
-            except Exception as e:
-                logger.debug(f"Error parsing Benzinga result: {e}")
-                continue
-                
-        return articles
+        url, headers = _benzinga_request(ticker)
+        response = http_client.get_sync(url, headers=headers, timeout=10)
+        return _parse_benzinga_news(response.content)
     except Exception as e:
         logger.error(f"Error fetching Benzinga news: {e}")
         return []
 
+async def get_benzinga_news_async(ticker: str):
+    """
+    Async variant of get_benzinga_news using the shared HTTP client.
+    Errors, including HTTP error statuses, propagate so the fan-out can count them
+    against the source's health.
+    """
+    url, headers = _benzinga_request(ticker)
+    response = await http_client.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return await asyncio.to_thread(_parse_benzinga_news, response.content)
+
+def _reuters_request(ticker: str, company_name: str = None):
+    """Builds the Reuters URL and headers."""
+    search_term = company_name if company_name else ticker
+    url = f"https://www.reuters.com/site-search/?query={search_term}"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    return url, headers
+
+def _parse_reuters_news(content: bytes):
+    """Parses a Reuters page into articles."""
+    root = html_parsing.parse(content)
+    if root is None:
+        return []
+    
+    articles = []
+    # Reuters search results structure
+    search_results = html_parsing.REUTERS_RESULTS(root)
+    
+    for result in search_results[:50]:
+        try:
+            link_tag = html_parsing.first(html_parsing.LINK, result)
+            if link_tag is None:
+                continue
+                
+            title = html_parsing.text(link_tag)
+            link = link_tag.get('href')
+            
+            if link and not link.startswith('http'):
+                link = 'https://www.reuters.com' + link
+            
+            # Get date if available
+            date_tag = html_parsing.first(html_parsing.TIME, result)
+            date_str = date_tag.get('datetime') if date_tag is not None else None
+            
+            article_data = Article.create(
+                title=title,
+                url=link,
+                publisher='Reuters',
+                published=parse_date(date_str),
+                source='Reuters',
+            )
+            
+            if article_data:
+                articles.append(article_data)
+        except Exception as e:
+            logger.debug(f"Error parsing Reuters result: {e}")
+            continue
+            
+    return articles
+
 def get_reuters_news(ticker: str, company_name: str = None):
     """Fetches news from Reuters by scraping."""
     try:
-        search_term = company_name if company_name else ticker
-        url = f"https://www.reuters.com/site-search/?query={search_term}"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        articles = []
-        # Reuters search results structure
-        search_results = soup.find_all('div', class_='search-result-indiv')
-        
-        for result in search_results[:50]:
-            try:
-                link_tag = result.find('a')
-                if not link_tag:
-                    continue
-                    
-                title = link_tag.get_text(strip=True)
-                link = link_tag.get('href')
-                
-                if link and not link.startswith('http'):
-                    link = 'https://www.reuters.com' + link
-                
-                # Get date if available
-                date_tag = result.find('time')
-                date_str = date_tag.get('datetime') if date_tag else None
-                
-                article_data = {
-                    'title': title,
-                    'url': link,
-                    'publisher': 'Reuters',
-                    'published': normalize_date(date_str),
-                    'source': 'Reuters'
-                }
-                
-                if is_valid_source(article_data):
-                    articles.append(article_data)
-            except Exception as e:
-                logger.debug(f"Error parsing Reuters result: {e}")
-                continue
-                
-        return articles
+        url, headers = _reuters_request(ticker, company_name)
+        response = http_client.get_sync(url, headers=headers, timeout=10)
+        return _parse_reuters_news(response.content)
     except Exception as e:
         logger.error(f"Error fetching Reuters news: {e}")
         return []
 
+async def get_reuters_news_async(ticker: str, company_name: str = None):
+    """
+    Async variant of get_reuters_news using the shared HTTP client.
+    Errors, including HTTP error statuses, propagate so the fan-out can count them
+    against the source's health.
+    """
+    url, headers = _reuters_request(ticker, company_name)
+    response = await http_client.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return await asyncio.to_thread(_parse_reuters_news, response.content)
+
+def _seekingalpha_request(ticker: str):
+    """Builds the Seeking Alpha URL and headers."""
+    url = f"https://seekingalpha.com/symbol/{ticker}/news"
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    return url, headers
+
+def _parse_seekingalpha_news(content: bytes):
+    """Parses a Seeking Alpha page into articles."""
+    root = html_parsing.parse(content)
+    if root is None:
+        return []
+    
+    articles = []
+    # Seeking Alpha article links
+    article_links = html_parsing.SEEKINGALPHA_TITLES(root)
+    
+    for link_tag in article_links[:50]:
+        try:
+            title = html_parsing.text(link_tag)
+            link = link_tag.get('href')
+            
+            if link and not link.startswith('http'):
+                link = 'https://seekingalpha.com' + link
+            
+            article_data = Article.create(
+                title=title,
+                url=link,
+                publisher='Seeking Alpha',
+                published=None,  # Dates are harder to scrape from SA
+                source='Seeking Alpha',
+            )
+            
+            if article_data:
+                articles.append(article_data)
+        except Exception as e:
+            logger.debug(f"Error parsing Seeking Alpha result: {e}")
+            continue
+            
+    return articles
+
 def get_seekingalpha_news(ticker: str):
     """Fetches news from Seeking Alpha by scraping."""
     try:
-        url = f"https://seekingalpha.com/symbol/{ticker}/news"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        articles = []
-        # Seeking Alpha article links
-        article_links = soup.find_all('a', attrs={'data-test-id': 'post-list-item-title'})
-        
-        for link_tag in article_links[:50]:
-            try:
-                title = link_tag.get_text(strip=True)
-                link = link_tag.get('href')
-                
-                if link and not link.startswith('http'):
-                    link = 'https://seekingalpha.com' + link
-                
-                article_data = {
-                    'title': title,
-                    'url': link,
-                    'publisher': 'Seeking Alpha',
-                    'published': None,  # Dates are harder to scrape from SA
-                    'source': 'Seeking Alpha'
-                }
-                
-                if is_valid_source(article_data):
-                    articles.append(article_data)
-            except Exception as e:
-                logger.debug(f"Error parsing Seeking Alpha result: {e}")
-                continue
-                
-        return articles
+        url, headers = _seekingalpha_request(ticker)
+        response = http_client.get_sync(url, headers=headers, timeout=10)
+        return _parse_seekingalpha_news(response.content)
     except Exception as e:
         logger.error(f"Error fetching Seeking Alpha news: {e}")
         return []
 
+async def get_seekingalpha_news_async(ticker: str):
+    """
+    Async variant of get_seekingalpha_news using the shared HTTP client.
+    Errors, including HTTP error statuses, propagate so the fan-out can count them
+    against the source's health.
+    """
+    url, headers = _seekingalpha_request(ticker)
+    response = await http_client.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    return await asyncio.to_thread(_parse_seekingalpha_news, response.content)
+
+def _ir_news(ticker: str, company_name: str = None):
+    """get_ir_news without the error handling."""
+    search_term = f"{company_name or ticker} Investor Relations press release earnings"
+    logger.info(f"Searching for IR news: {search_term}")
+
+    googlenews = GoogleNews(period='30d') # Look back 30 days for IR news
+    googlenews.search(search_term)
+    results = googlenews.result()
+
+    articles = []
+
+    for item in results:
+        url = item.get('link', '')
+
+        # Clean Google News URLs
+        if '&ved=' in url:
+            url = url.split('&ved=')[0]
+        if '&usg=' in url:
+            url = url.split('&usg=')[0]
+
+        article_data = Article.create(
+            title=item.get('title'),
+            url=url,
+            publisher=item.get('media') or 'IR Source',
+            published=parse_date(item.get('date')),
+            source='Investor Relations',
+            summary=item.get('desc'),
+        )
+
+        if article_data:
+            articles.append(article_data)
+
+    return articles
+
 def get_ir_news(ticker: str, company_name: str = None):
     """
     Attempts to find and scrape news from the company's Investor Relations page.
@@ -434,84 +733,271 @@ def get_ir_news(ticker: str, company_name: str = None):
     which is more robust than trying to find and scrape arbitrary IR websites.
     """
     try:
-        search_term = f"{company_name or ticker} Investor Relations press release earnings"
-        logger.info(f"Searching for IR news: {search_term}")
-        
-        googlenews = GoogleNews(period='30d') # Look back 30 days for IR news
-        googlenews.search(search_term)
-        results = googlenews.result()
-        
-        articles = []
-        
-        for item in results:
-            url = item.get('link', '')
-            
-            # Clean Google News URLs
-            if '&ved=' in url:
-                url = url.split('&ved=')[0]
-            if '&usg=' in url:
-                url = url.split('&usg=')[0]
-            
-            article_data = {
-                'title': item.get('title'),
-                'url': url,
-                'publisher': item.get('media') or 'IR Source',
-                'published': normalize_date(item.get('date')),
-                'source': 'Investor Relations'
-            }
-            
-            if is_valid_source(article_data):
-                articles.append(article_data)
-                
-        return articles
-
+        return _ir_news(ticker, company_name)
     except Exception as e:
         logger.error(f"Error fetching IR news for {ticker}: {e}")
         return []
 
-def get_aggregated_news(ticker: str):
-    """Aggregates news from multiple sources."""
-    # Get company name and type first
-    try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        company_name = info.get('longName') or info.get('shortName') or ticker
-        quote_type = info.get('quoteType', '').upper()
-    except Exception as e:
-        logger.warning(f"Error getting info for {ticker}: {e}")
-        company_name = ticker
-        quote_type = 'UNKNOWN'
+async def get_ir_news_async(ticker: str, company_name: str = None):
+    """
+    Async variant of get_ir_news. GoogleNews is blocking, so it runs in a worker thread.
+    Errors propagate so the fan-out can count them against the source's health.
+    """
+    return await asyncio.to_thread(_ir_news, ticker, company_name)
 
-    logger.info(f"Fetching news for {ticker} ({company_name}) [Type: {quote_type}]")
+def _after_host_slot(host: str, fn):
+    """Waits for a request slot on `host`, then calls fn (for sources whose library does the HTTP)."""
+    rate_limiter.acquire_sync(host)
+    return fn()
+
+def _tallied(tally: rate_limiter.WaitTally, fn):
+    """Calls fn in a worker thread, adding its rate limiter waits to `tally`."""
+    with rate_limiter.tally_waits(tally):
+        return fn()
+
+def _throttled_error(error: Exception) -> bool:
+    """True for an HTTP error whose status is a host throttling us (429/503)."""
+    return getattr(getattr(error, 'response', None), 'status_code', None) in http_client.THROTTLE_STATUSES
+
+def fetch_sources_concurrently(jobs, source_timeout: float = SOURCE_TIMEOUT, overall_timeout: float = AGGREGATE_TIMEOUT):
+    """
+    Runs news sources in parallel and merges whatever comes back in time.
+    
+    Args:
+        jobs: A list of (name, callable) or (name, callable, timeout) tuples.
+              Each callable takes no arguments and returns a list of articles.
+        source_timeout: Default per-source deadline in seconds.
+        overall_timeout: Deadline for the whole fan-out in seconds.
+        
+    Returns:
+        The merged article list, in job order (so earlier sources win the URL dedup).
+    """
+    if not jobs:
+        return []
+
+    start = time.monotonic()
+    overall_deadline = start + overall_timeout
+    executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="news-source")
+    
+    futures = {}
+    for index, job in enumerate(jobs):
+        name, fn = job[0], job[1]
+        timeout = job[2] if len(job) > 2 else source_timeout
+        host = rate_limiter.SOURCE_HOSTS.get(name)
+        if host is not None:
+            fn = partial(_after_host_slot, host, fn)
+        tally = rate_limiter.WaitTally()
+        future = executor.submit(_tallied, tally, fn)
+        futures[future] = (index, name, min(start + timeout, overall_deadline), tally)
+    
+    results = [None] * len(jobs)
+    pending = set(futures)
+    
+    try:
+        while pending:
+            now = time.monotonic()
+            
+            # Drop sources that are past their own deadline
+            for future in [f for f in pending if futures[f][2] <= now]:
+                pending.discard(future)
+                future.cancel()
+                _, name, _, tally = futures[future]
+                logger.warning(f"Source {name} timed out after {now - start:.1f}s, skipping")
+                if tally.seconds > 0 or tally.throttled:
+                    # Our own rate limiting used up part of its deadline; not the source's fault
+                    source_registry.record_throttled(name, now - start - tally.seconds)
+                else:
+                    source_registry.record_failure(name, None, now - start, timed_out=True)
+            if not pending:
+                break
+                
+            next_deadline = min(futures[f][2] for f in pending)
+            done, pending = wait(pending, timeout=max(0, next_deadline - now), return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index, name, _, tally = futures[future]
+                elapsed = time.monotonic() - start
+                try:
+                    results[index] = future.result() or []
+                    logger.info(f"Source {name} returned {len(results[index])} articles in {elapsed:.1f}s")
+                    source_registry.record_result(name, results[index], elapsed - tally.seconds)
+                except Exception as e:
+                    logger.error(f"Source {name} failed: {e}")
+                    if _throttled_error(e):
+                        source_registry.record_throttled(name, elapsed - tally.seconds)
+                    else:
+                        source_registry.record_failure(name, e, elapsed - tally.seconds)
+    finally:
+        # Never block on stragglers; their results are simply discarded
+        executor.shutdown(wait=False, cancel_futures=True)
     
-    # Define types that should use all sources (Stocks/ETFs)
-    # Everything else (Crypto, Futures, Indices, etc.) uses only Google News
-    STOCK_TYPES = ['EQUITY', 'ETF']
+    merged = []
+    for articles in results:
+        if articles:
+            merged.extend(articles)
+    return merged
+
+async def fetch_sources_concurrently_async(jobs, source_timeout: float = SOURCE_TIMEOUT, overall_timeout: float = AGGREGATE_TIMEOUT):
+    """
+    Async counterpart of fetch_sources_concurrently.
     
-    if quote_type in STOCK_TYPES:
-        yahoo_news = get_yahoo_news(ticker)
-        google_news = get_google_news(ticker, company_name)
-        finviz_news = get_finviz_news(ticker)
-        marketwatch_news = get_marketwatch_news(ticker, company_name)
-        benzinga_news = get_benzinga_news(ticker)
-        reuters_news = get_reuters_news(ticker, company_name)
-        seekingalpha_news = get_seekingalpha_news(ticker)
-        ir_news = get_ir_news(ticker, company_name)
+    Args:
+        jobs: A list of (name, coroutine function) or (name, coroutine function, timeout) tuples.
+        source_timeout: Default per-source deadline in seconds.
+        overall_timeout: Deadline for the whole fan-out in seconds.
         
-        all_news = yahoo_news + google_news + finviz_news + marketwatch_news + benzinga_news + reuters_news + seekingalpha_news + ir_news
-    else:
-        logger.info(f"Non-stock instrument ({quote_type}), restricting to Google News.")
-        # For crypto/futures, Google News with the name is usually best
-        all_news = get_google_news(ticker, company_name)
+    Returns:
+        The merged article list, in job order.
+    """
+    if not jobs:
+        return []
+
+    start = time.monotonic()
+    # One deadline for the whole fan-out: queueing for a host slot uses it up too
+    overall_deadline = start + overall_timeout
+
+    async def run(name, fn, timeout):
+        try:
+            # Library-based sources are limited by host here; HTTP scrapers are limited
+            # inside http_client, per request
+            host = rate_limiter.SOURCE_HOSTS.get(name)
+            if host is not None:
+                await asyncio.wait_for(rate_limiter.acquire(host), timeout=max(0, overall_deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            logger.warning(f"Source {name} still rate limited after {time.monotonic() - start:.1f}s, skipping")
+            return []
+
+        # Waits for host slots inside the call (http_client's per-request limiting and
+        # 429/503 pauses) are tallied and left out of its latency and breaker accounting
+        called = time.monotonic()
+        with rate_limiter.tally_waits() as tally:
+            try:
+                articles = await asyncio.wait_for(fn(), timeout=max(0, min(timeout, overall_deadline - called)))
+                logger.info(f"Source {name} returned {len(articles or [])} articles in {time.monotonic() - start:.1f}s")
+                source_registry.record_result(name, articles, time.monotonic() - called - tally.seconds)
+                return articles or []
+            except asyncio.TimeoutError:
+                logger.warning(f"Source {name} timed out after {time.monotonic() - start:.1f}s, skipping")
+                if tally.seconds > 0 or tally.throttled:
+                    source_registry.record_throttled(name, time.monotonic() - called - tally.seconds)
+                else:
+                    source_registry.record_failure(name, None, time.monotonic() - called, timed_out=True)
+            except Exception as e:
+                logger.error(f"Source {name} failed: {e}")
+                if _throttled_error(e):
+                    source_registry.record_throttled(name, time.monotonic() - called - tally.seconds)
+                else:
+                    source_registry.record_failure(name, e, time.monotonic() - called - tally.seconds)
+        return []
+
+    results = await asyncio.gather(*(
+        run(job[0], job[1], job[2] if len(job) > 2 else source_timeout) for job in jobs
+    ))
     
-    # Deduplicate based on URL
+    merged = []
+    for articles in results:
+        merged.extend(articles)
+    return merged
+
+# Types that use all sources (Stocks/ETFs).
+# Everything else (Crypto, Futures, Indices, etc.) uses only Google News.
+STOCK_TYPES = ['EQUITY', 'ETF']
+
+# Source registry: each source declares the instruments it covers and its own deadline.
+# Scrapers that are often blocked get shorter deadlines so they cost less when they stall.
+source_registry.register(NewsSource('Yahoo Finance', get_yahoo_news, get_yahoo_news_async,
+                                    quote_types=STOCK_TYPES, timeout=10, capabilities={'ticker_feed', 'publisher', 'timestamps'}))
+source_registry.register(NewsSource('Google News', get_google_news, get_google_news_async,
+                                    timeout=SOURCE_TIMEOUT, capabilities={'company_name', 'publisher', 'timestamps'}))
+source_registry.register(NewsSource('FinViz', get_finviz_news, get_finviz_news_async,
+                                    quote_types=STOCK_TYPES, timeout=8, capabilities={'ticker_feed', 'timestamps'}))
+source_registry.register(NewsSource('MarketWatch', get_marketwatch_news, get_marketwatch_news_async,
+                                    quote_types=STOCK_TYPES, timeout=8, capabilities={'company_name', 'timestamps'}))
+source_registry.register(NewsSource('Benzinga', get_benzinga_news, get_benzinga_news_async,
+                                    quote_types=STOCK_TYPES, timeout=8, capabilities={'ticker_feed', 'timestamps'}))
+source_registry.register(NewsSource('Reuters', get_reuters_news, get_reuters_news_async,
+                                    quote_types=STOCK_TYPES, timeout=6, capabilities={'company_name', 'timestamps'}))
+source_registry.register(NewsSource('Seeking Alpha', get_seekingalpha_news, get_seekingalpha_news_async,
+                                    quote_types=STOCK_TYPES, timeout=6, capabilities={'ticker_feed'}))
+source_registry.register(NewsSource('Investor Relations', get_ir_news, get_ir_news_async,
+                                    quote_types=STOCK_TYPES, timeout=SOURCE_TIMEOUT, capabilities={'company_name', 'publisher', 'timestamps'}))
+
+def _get_instrument_info(ticker: str):
+    """Returns (company_name, quote_type) for a ticker."""
+    metadata = resolve_ticker(ticker)
+    return metadata['company_name'], metadata['quote_type']
+
+def _source_jobs(ticker: str, company_name: str, quote_type: str, use_async: bool = False, skip=frozenset()):
+    """
+    Builds the fan-out job list for a ticker: the registered sources that cover its
+    instrument type, minus any whose circuit breaker is open and any named in `skip`.
+    """
+    sources = [source for source in source_registry.available_for(quote_type) if source.name not in skip]
+    if quote_type not in STOCK_TYPES:
+        logger.info(f"Non-stock instrument ({quote_type}), using {[source.name for source in sources]}.")
+
+    jobs = []
+    for source in sources:
+        fn = source.fetch_async if use_async else source.fetch
+        args = (ticker, company_name) if source.takes_company_name else (ticker,)
+        jobs.append((source.name, partial(fn, *args), source.timeout))
+    return jobs
+
+def _dedupe_by_url(all_news):
+    """Deduplicates articles on URL, keeping the first occurrence."""
     seen_urls = set()
     unique_news = []
     
     for article in all_news:
-        if article['url'] not in seen_urls:
-            seen_urls.add(article['url'])
+        if article.url not in seen_urls:
+            seen_urls.add(article.url)
             unique_news.append(article)
+    return unique_news
+
+def get_aggregated_news(ticker: str):
+    """Aggregates news from multiple sources."""
+    # Get company name and type first
+    company_name, quote_type = _get_instrument_info(ticker)
+
+    logger.info(f"Fetching news for {ticker} ({company_name}) [Type: {quote_type}]")
+    
+    all_news = fetch_sources_concurrently(_source_jobs(ticker, company_name, quote_type))
+    all_news = filter_articles(all_news, ticker, company_name)
+    unique_news = collapse_near_duplicates(_dedupe_by_url(all_news))
             
     logger.info(f"Found {len(unique_news)} unique articles for {ticker}")
     return unique_news
+
+async def _fetch_news_async(ticker: str, skip=frozenset()):
+    """Every relevant article the sources (except `skip`) return for a ticker, deduplicated on URL only."""
+    company_name, quote_type = await asyncio.to_thread(_get_instrument_info, ticker)
+
+    logger.info(f"Fetching news for {ticker} ({company_name}) [Type: {quote_type}]")
+    
+    all_news = await fetch_sources_concurrently_async(_source_jobs(ticker, company_name, quote_type, use_async=True, skip=skip))
+    return _dedupe_by_url(filter_articles(all_news, ticker, company_name))
+
+async def get_timeline_news_async(ticker: str, days: int = 30):
+    """
+    Async, incremental variant of get_aggregated_news. Only sources not polled for the
+    ticker within TIMELINE_POLL_INTERVAL are scraped; their items are merged into the
+    ticker's persisted timeline (URLs not seen before are stored), and the full
+    `days`-day timeline is served from the local store, with syndicated copies of a
+    story collapsed into one entry.
+    """
+    timeline = news_timeline.get_timeline()
+    polled = await asyncio.to_thread(timeline.recently_polled, ticker)
+    if polled:
+        logger.info(f"Serving {sorted(polled)} for {ticker} from the timeline (polled recently)")
+    fetched = await _fetch_news_async(ticker, skip=polled)
+    new_articles = await asyncio.to_thread(timeline.ingest, ticker, fetched)
+    if new_articles and sentiment.SENTIMENT_ENABLED:
+        try:
+            # Each article is scored and recorded once, when it first enters the timeline
+            await asyncio.to_thread(sentiment.record_articles, ticker, new_articles)
+        except Exception as e:
+            logger.error(f"Recording sentiment for {ticker} failed: {e}")
+    recent = await asyncio.to_thread(timeline.recent, ticker, days)
+    # Stored items are filtered again so rule changes apply to the existing timeline too
+    recent = filter_articles(recent, ticker, cached_company_name(ticker))
+    return await asyncio.to_thread(collapse_near_duplicates, recent)
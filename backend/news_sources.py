@@ -0,0 +1,242 @@
+import os
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A source's breaker opens after this many consecutive failures (transport/HTTP errors, timeouts).
+# Empty results don't count: breakers are per source, and plenty of tickers just have no news there.
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+# An open breaker lets one probe through after the cooldown; each failed probe doubles it
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "120"))
+CIRCUIT_MAX_COOLDOWN = float(os.getenv("CIRCUIT_MAX_COOLDOWN", "1800"))
+# Weight of the newest sample in the moving latency average
+LATENCY_SMOOTHING = 0.3
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+class CircuitBreaker:
+    """
+    Closed: calls go through. Open: the source is skipped until the cooldown has passed.
+    Half-open: a single probe call is let through; a response (even an empty one) closes
+    the breaker, a failure re-opens it with a longer cooldown.
+    """
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown: float = CIRCUIT_COOLDOWN, max_cooldown: float = CIRCUIT_MAX_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started = 0.0
+
+    def allow(self, now: float = None) -> bool:
+        now = now or time.monotonic()
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and now - self.opened_at < self.cooldown:
+            return False
+        # A probe that never reported back (e.g. dropped at the overall deadline) is replaced
+        if self.state == HALF_OPEN and now - self.probe_started < self.cooldown:
+            return False
+        self.state = HALF_OPEN
+        self.probe_started = now
+        return True
+
+    def record_success(self):
+        self.state = CLOSED
+        self.cooldown = self.base_cooldown
+        self.consecutive_failures = 0
+
+    def record_failure(self, now: float = None):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._trip(now)
+
+    def _trip(self, now: float = None):
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+        self.state = OPEN
+        self.opened_at = now or time.monotonic()
+
+    def retry_in(self, now: float = None) -> float:
+        """Seconds until an open breaker lets a probe through (0 when not open)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - (now or time.monotonic()))
+
+class NewsSource:
+    """
+    A pluggable news source.
+
+    Args:
+        name: Display name; also the 'source' field of its articles.
+        fetch: Blocking fetcher, called as fetch(ticker[, company_name]).
+        fetch_async: Coroutine variant with the same signature.
+        quote_types: Instrument types the source covers, or None for all of them.
+        timeout: Per-call deadline in seconds.
+        capabilities: Free-form feature flags, e.g. 'company_name' (searches by company
+                      name, so the fetcher also takes it), 'ticker_feed' (reads the ticker's
+                      own news page, so results are on-topic without mentioning it),
+                      'publisher', 'timestamps'.
+    """
+    def __init__(self, name: str, fetch: Callable, fetch_async: Callable, quote_types: Optional[Iterable[str]] = None,
+                 timeout: float = 12, capabilities: Iterable[str] = ()):
+        self.name = name
+        self.fetch = fetch
+        self.fetch_async = fetch_async
+        self.quote_types = frozenset(quote_types) if quote_types is not None else None
+        self.timeout = timeout
+        self.capabilities = frozenset(capabilities)
+
+    @property
+    def takes_company_name(self) -> bool:
+        return 'company_name' in self.capabilities
+
+    def supports(self, quote_type: str) -> bool:
+        return self.quote_types is None or quote_type in self.quote_types
+
+class SourceHealth:
+    """Call outcomes and latency for one source, plus its circuit breaker."""
+    def __init__(self, name: str):
+        self.name = name
+        self.breaker = CircuitBreaker()
+        self.calls = 0
+        self.successes = 0
+        self.empty = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.throttled = 0
+        self.skipped = 0
+        self.articles = 0
+        self.last_latency = None
+        self.avg_latency = None
+        self.last_error = None
+        self.last_success_at = None
+
+    def _observe_latency(self, latency: float):
+        self.last_latency = latency
+        if self.avg_latency is None:
+            self.avg_latency = latency
+        else:
+            self.avg_latency += LATENCY_SMOOTHING * (latency - self.avg_latency)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.breaker.state,
+            'retry_in': round(self.breaker.retry_in(), 1),
+            'calls': self.calls,
+            'successes': self.successes,
+            'empty': self.empty,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'throttled': self.throttled,
+            'skipped': self.skipped,
+            'articles': self.articles,
+            'last_latency': round(self.last_latency, 3) if self.last_latency is not None else None,
+            'avg_latency': round(self.avg_latency, 3) if self.avg_latency is not None else None,
+            'last_error': self.last_error,
+            'last_success_at': self.last_success_at,
+        }
+
+class SourceRegistry:
+    """
+    The set of news sources, with a health record per source. The fan-out asks it which
+    sources to call for an instrument and reports every outcome back, so sources that
+    keep failing are skipped instead of costing their full timeout on every request.
+    """
+    def __init__(self):
+        self._sources: Dict[str, NewsSource] = {}
+        self._health: Dict[str, SourceHealth] = {}
+        self._lock = threading.Lock()
+
+    def register(self, source: NewsSource) -> NewsSource:
+        self._sources[source.name] = source
+        return source
+
+    def get(self, name: str) -> Optional[NewsSource]:
+        return self._sources.get(name)
+
+    def sources(self) -> List[NewsSource]:
+        return list(self._sources.values())
+
+    def health(self, name: str) -> SourceHealth:
+        health = self._health.get(name)
+        if health is None:
+            with self._lock:
+                health = self._health.setdefault(name, SourceHealth(name))
+        return health
+
+    def available_for(self, quote_type: str) -> List[NewsSource]:
+        """Sources that cover `quote_type` and whose breaker currently allows a call."""
+        available = []
+        for source in self._sources.values():
+            if not source.supports(quote_type):
+                continue
+            health = self.health(source.name)
+            with self._lock:
+                allowed = health.breaker.allow()
+                if not allowed:
+                    health.skipped += 1
+            if allowed:
+                available.append(source)
+            else:
+                logger.info(f"Skipping {source.name}: circuit open, next probe in {health.breaker.retry_in():.0f}s")
+        return available
+
+    def record_result(self, name: str, articles: list, latency: float):
+        health = self.health(name)
+        with self._lock:
+            health.calls += 1
+            health._observe_latency(latency)
+            if articles:
+                health.successes += 1
+                health.articles += len(articles)
+                health.last_success_at = time.time()
+            else:
+                health.empty += 1
+            # The source answered; whether it had news for this ticker says nothing about its health
+            health.breaker.record_success()
+
+    def record_failure(self, name: str, error: Any, latency: float, timed_out: bool = False):
+        health = self.health(name)
+        with self._lock:
+            health.calls += 1
+            health._observe_latency(latency)
+            if timed_out:
+                health.timeouts += 1
+                health.last_error = f"timed out after {latency:.1f}s"
+            else:
+                health.failures += 1
+                health.last_error = str(error)[:200]
+            previous = health.breaker.state
+            health.breaker.record_failure()
+            self._log_if_opened(health, previous)
+
+    def record_throttled(self, name: str, latency: float):
+        """
+        A call that failed or ran out of time because of our own rate limiting (host slot
+        waits, 429/503 pauses). Counted, but not held against the source's breaker.
+        """
+        health = self.health(name)
+        with self._lock:
+            health.calls += 1
+            health.throttled += 1
+            health._observe_latency(latency)
+
+    def _log_if_opened(self, health: SourceHealth, previous: str):
+        if health.breaker.state == OPEN and previous != OPEN:
+            logger.warning(f"Circuit opened for {health.name} for {health.breaker.cooldown:.0f}s "
+                           f"({health.breaker.consecutive_failures} failures in a row)")
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        for name in list(self._sources):
+            self.health(name)
+        with self._lock:
+            return {name: health.stats() for name, health in self._health.items()}
+
+registry = SourceRegistry()
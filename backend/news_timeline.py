@@ -0,0 +1,150 @@
+import os
+import time
+import sqlite3
+import logging
+import datetime
+import threading
+from typing import Dict, List, Optional, Set
+
+from news_cache import CACHE_DIR
+from article_store import normalize_url
+from articles import Article
+
+logger = logging.getLogger(__name__)
+
+# Articles older than this are pruned from the timeline
+TIMELINE_RETENTION_DAYS = int(os.getenv("TIMELINE_RETENTION_DAYS", "45"))
+# A source that delivered items for a ticker this recently (seconds) isn't scraped again;
+# its items are served from the timeline
+TIMELINE_POLL_INTERVAL = float(os.getenv("TIMELINE_POLL_INTERVAL", "600"))
+
+def _to_timestamp(published) -> Optional[float]:
+    """Epoch seconds for an article's published value, or None if it has no usable date."""
+    if not published:
+        return None
+    try:
+        if isinstance(published, datetime.datetime):
+            return published.timestamp()
+        return datetime.datetime.fromisoformat(str(published)).timestamp()
+    except ValueError:
+        return None
+
+def _published_text(published) -> Optional[str]:
+    if isinstance(published, datetime.datetime):
+        return published.isoformat()
+    return published
+
+class NewsTimeline:
+    """
+    Persisted per-ticker article timeline with a high-water mark per (ticker, source):
+    the newest publish time seen from that source and when it last delivered items.
+    A refresh stores only URLs not seen before, so repeated scrapes turn into small
+    deltas, and sources polled within TIMELINE_POLL_INTERVAL are skipped altogether.
+    """
+    def __init__(self, path: str = None):
+        self.path = path or os.path.join(CACHE_DIR, "timeline.db")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            "ticker TEXT NOT NULL, url_key TEXT NOT NULL, url TEXT NOT NULL, title TEXT, publisher TEXT, "
+            "source TEXT, published TEXT, published_ts REAL, first_seen REAL NOT NULL, "
+            "PRIMARY KEY (ticker, url_key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_recent ON articles (ticker, published_ts)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks ("
+            "ticker TEXT NOT NULL, source TEXT NOT NULL, newest_ts REAL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (ticker, source))"
+        )
+        self._conn.commit()
+
+    def watermarks(self, ticker: str) -> Dict[str, Optional[float]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source, newest_ts FROM watermarks WHERE ticker = ?", (ticker.upper(),)
+            ).fetchall()
+        return dict(rows)
+
+    def recently_polled(self, ticker: str, interval: float = TIMELINE_POLL_INTERVAL) -> Set[str]:
+        """Sources that delivered items for the ticker within the last `interval` seconds."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source FROM watermarks WHERE ticker = ? AND updated_at >= ?",
+                (ticker.upper(), time.time() - interval),
+            ).fetchall()
+        return {source for source, in rows}
+
+    def ingest(self, ticker: str, articles: List[Article]) -> List[Article]:
+        """
+        Stores the articles that are new for this ticker and advances each source's mark.
+        Items are deduplicated on URL only: a late-indexed or backdated item older than
+        the mark is still new.
+
+        Returns:
+            The newly stored articles.
+        """
+        ticker = ticker.upper()
+        now = time.time()
+        new_articles = []
+        newest: Dict[str, Optional[float]] = {}
+
+        with self._lock:
+            for article in articles:
+                source = article.source
+                published_ts = _to_timestamp(article.published)
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO articles "
+                    "(ticker, url_key, url, title, publisher, source, published, published_ts, first_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (ticker, normalize_url(article.url), article.url, article.title, article.publisher,
+                     source, _published_text(article.published), published_ts, now),
+                )
+                if cursor.rowcount:
+                    new_articles.append(article)
+                if published_ts is not None:
+                    newest[source] = max(newest.get(source) or published_ts, published_ts)
+                else:
+                    newest.setdefault(source, None)
+
+            for source, newest_ts in newest.items():
+                self._conn.execute(
+                    "INSERT INTO watermarks (ticker, source, newest_ts, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (ticker, source) DO UPDATE SET "
+                    "newest_ts = MAX(COALESCE(newest_ts, excluded.newest_ts), COALESCE(excluded.newest_ts, newest_ts)), "
+                    "updated_at = excluded.updated_at",
+                    (ticker, source, newest_ts, now),
+                )
+            cutoff = now - TIMELINE_RETENTION_DAYS * 86400
+            self._conn.execute(
+                "DELETE FROM articles WHERE ticker = ? AND COALESCE(published_ts, first_seen) < ?", (ticker, cutoff)
+            )
+            self._conn.commit()
+
+        logger.info(f"Ingested {len(new_articles)} new of {len(articles)} fetched articles for {ticker}")
+        return new_articles
+
+    def recent(self, ticker: str, days: int = 30) -> List[Article]:
+        """The ticker's stored articles from the last `days` days, newest first (undated ones last)."""
+        cutoff = time.time() - days * 86400
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT title, url, publisher, published, source FROM articles "
+                "WHERE ticker = ? AND COALESCE(published_ts, first_seen) >= ? "
+                "ORDER BY published_ts IS NULL, published_ts DESC, first_seen DESC",
+                (ticker.upper(), cutoff),
+            ).fetchall()
+        return [
+            Article.create(title=title, url=url, source=source, publisher=publisher, published=published)
+            for title, url, publisher, published, source in rows
+        ]
+
+_timeline = None
+
+def get_timeline() -> NewsTimeline:
+    global _timeline
+    if _timeline is None:
+        _timeline = NewsTimeline()
+    return _timeline
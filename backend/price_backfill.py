@@ -0,0 +1,169 @@
+"""
+Fills in the session prices of UNCHECKED rows in data/data.csv.
+
+Pending rows are grouped by ticker; tickers are downloaded together, in batches of
+similar date ranges, with one yf.download call per batch. Daily bars are kept in a
+local cache (cache/price_bars/<TICKER>.parquet), so rows whose session is already
+cached never hit the network, and every resolved row is written back in one pass.
+
+    python price_backfill.py [--dry-run]
+"""
+import os
+import sys
+import logging
+import argparse
+import datetime
+from typing import Dict, Iterable, List, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+import rate_limiter
+import sentiment_dataset
+from news_cache import CACHE_DIR
+from sentiment_dataset import PRICE_COLUMNS, UNCHECKED
+
+logger = logging.getLogger(__name__)
+
+BAR_CACHE_DIR = os.path.join(CACHE_DIR, "price_bars")
+BAR_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+# Tickers per yf.download call
+BATCH_SIZE = int(os.getenv("PRICE_BACKFILL_BATCH_SIZE", "100"))
+# A check_day without a bar (an exchange holiday) resolves to the next session within this many days
+ROLL_DAYS = 5
+
+def _bar_path(ticker: str) -> str:
+    return os.path.join(BAR_CACHE_DIR, f"{ticker.upper()}.parquet")
+
+def cached_bars(tickers: Iterable[str]) -> pd.DataFrame:
+    """Cached daily bars of the given tickers, with a 'stock' column."""
+    frames = []
+    for ticker in sorted(set(tickers)):
+        path = _bar_path(ticker)
+        if os.path.exists(path):
+            frames.append(pd.read_parquet(path).assign(stock=ticker))
+    if not frames:
+        return pd.DataFrame(columns=['stock'] + BAR_COLUMNS).astype({'date': 'datetime64[ns]'})
+    return pd.concat(frames, ignore_index=True)
+
+def store_bars(bars: pd.DataFrame):
+    """Merges downloaded bars into the per-ticker cache files (a re-downloaded day replaces the cached one)."""
+    os.makedirs(BAR_CACHE_DIR, exist_ok=True)
+    for ticker, fresh in bars.groupby('stock'):
+        path = _bar_path(ticker)
+        fresh = fresh[BAR_COLUMNS]
+        if os.path.exists(path):
+            fresh = pd.concat([pd.read_parquet(path), fresh], ignore_index=True)
+        fresh = fresh.drop_duplicates('date', keep='last').sort_values('date')
+        tmp_path = path + ".tmp"
+        fresh.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+def _plan_batches(ranges: Dict[str, Tuple[pd.Timestamp, pd.Timestamp]]) -> List[Tuple[List[str], pd.Timestamp, pd.Timestamp]]:
+    """
+    Groups tickers into download batches: sorted by the start of the range they need,
+    BATCH_SIZE at a time, each batch downloading the union of its tickers' ranges.
+    """
+    ordered = sorted(ranges, key=lambda ticker: ranges[ticker])
+    batches = []
+    for start in range(0, len(ordered), BATCH_SIZE):
+        tickers = ordered[start:start + BATCH_SIZE]
+        batches.append((tickers, min(ranges[t][0] for t in tickers), max(ranges[t][1] for t in tickers)))
+    return batches
+
+def download_bars(tickers: List[str], start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """One bulk download of daily bars for `tickers` from `start` to `end` (inclusive)."""
+    rate_limiter.acquire_sync('finance.yahoo.com')
+    raw = yf.download(tickers, start=start.strftime('%Y-%m-%d'), end=(end + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
+                      group_by='ticker', auto_adjust=False, progress=False, threads=True)
+    if raw is None or raw.empty:
+        return pd.DataFrame(columns=['stock'] + BAR_COLUMNS)
+
+    # Columns are (ticker, field); stack the tickers into rows
+    bars = raw.stack(level=0, future_stack=True).rename_axis(['date', 'stock']).reset_index()
+    bars = bars.rename(columns=str.lower).dropna(subset=['open', 'close', 'volume'])
+    bars['date'] = pd.to_datetime(bars['date']).dt.tz_localize(None).dt.normalize()
+    return bars[['stock'] + BAR_COLUMNS]
+
+def pending_rows(daily: pd.DataFrame, now: datetime.datetime = None) -> pd.DataFrame:
+    """UNCHECKED rows whose check_day session has closed."""
+    now = pd.Timestamp(now or datetime.datetime.now(datetime.timezone.utc)).tz_convert(None)
+    closed_through = now.normalize() - pd.Timedelta(days=1)
+    if now - now.normalize() >= sentiment_dataset.MARKET_CLOSE_UTC:
+        closed_through = now.normalize()
+    check_day = pd.to_datetime(daily['check_day'], errors='coerce')
+    return daily[(daily['change'].astype(str) == UNCHECKED) & check_day.notna() & (check_day <= closed_through)]
+
+def resolve(pending: pd.DataFrame, bars: pd.DataFrame, roll: bool = True) -> pd.DataFrame:
+    """
+    Matches each pending row to the first bar on or after its check_day (within ROLL_DAYS,
+    or the same day only when `roll` is off), vectorized with merge_asof.
+    'change' is the session's open-to-close move in percent.
+
+    Returns:
+        id, check_day and the price columns of the rows that have a bar.
+    """
+    left = pending[['id', 'stock', 'check_day']].assign(day=pd.to_datetime(pending['check_day'])).sort_values('day')
+    right = bars.rename(columns={'date': 'day'}).sort_values('day')
+    right['day'] = right['day'].astype(left['day'].dtype)
+    # merge_asof needs identical key dtypes; read_daily's strings and cached/downloaded objects differ
+    left['stock'] = left['stock'].astype(object)
+    right['stock'] = right['stock'].astype(object)
+    matched = pd.merge_asof(left, right, on='day', by='stock', direction='forward',
+                            tolerance=pd.Timedelta(days=ROLL_DAYS if roll else 0)).dropna(subset=['open', 'close', 'volume'])
+    matched['change'] = ((matched['close'] / matched['open'] - 1) * 100).round(4).astype(str)
+    matched['volume'] = matched['volume'].astype('int64')
+    # A holiday check_day moves to the session that was actually used
+    matched['check_day'] = matched['day'].dt.strftime('%Y-%m-%d')
+    return matched[['id', 'check_day'] + PRICE_COLUMNS]
+
+def backfill(dry_run: bool = False, path: str = sentiment_dataset.DAILY_CSV) -> int:
+    """
+    Resolves every pending row of the daily table: from cached bars where possible,
+    otherwise from bulk downloads, then writes all of them back at once.
+
+    Returns:
+        The number of rows resolved.
+    """
+    pending = pending_rows(sentiment_dataset.read_daily(path))
+    if pending.empty:
+        logger.info("No pending rows to backfill")
+        return 0
+
+    # The cache may have gaps between earlier downloads, so it only answers exact days
+    resolved = resolve(pending, cached_bars(pending['stock']), roll=False)
+    missing = pending[~pending['id'].isin(resolved['id'])]
+    if not missing.empty:
+        days = pd.to_datetime(missing['check_day'])
+        ranges = {
+            ticker: (group.min(), group.max() + pd.Timedelta(days=ROLL_DAYS))
+            for ticker, group in days.groupby(missing['stock'])
+        }
+        batches = _plan_batches(ranges)
+        logger.info(f"{len(resolved)} of {len(pending)} pending rows resolved from cache; "
+                    f"downloading {len(ranges)} tickers in {len(batches)} batches")
+        downloaded = []
+        for tickers, start, end in batches:
+            try:
+                downloaded.append(download_bars(tickers, start, end))
+            except Exception as e:
+                logger.error(f"Price download for {len(tickers)} tickers ({start:%Y-%m-%d} to {end:%Y-%m-%d}) failed: {e}")
+        bars = pd.concat(downloaded, ignore_index=True) if downloaded else pd.DataFrame(columns=['stock'] + BAR_COLUMNS)
+        if not bars.empty:
+            store_bars(bars)
+            resolved = pd.concat([resolved, resolve(missing, bars)], ignore_index=True)
+
+    logger.info(f"Resolved {len(resolved)} of {len(pending)} pending rows")
+    if not dry_run and not resolved.empty:
+        sentiment_dataset.update_prices(resolved, path)
+    return len(resolved)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dry-run', action='store_true', help="download and report, but don't write data.csv")
+    args = parser.parse_args(argv)
+    print(f"{backfill(dry_run=args.dry_run)} rows resolved")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import os
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Context window requested from the model, and how much of it is kept free for the report
+NUM_CTX = int(os.getenv("LLM_NUM_CTX", "8192"))
+OUTPUT_TOKENS = int(os.getenv("LLM_OUTPUT_TOKENS", "2048"))
+MIN_PARAGRAPH_CHARS = 40
+# Extractions without line breaks are cut into sentence runs of about this size
+MAX_PARAGRAPH_CHARS = 1200
+
+try:
+    import tiktoken
+    # Llama 3's tokenizer is tiktoken-based; cl100k counts are within a few percent of it.
+    # The encoding is downloaded on first use, so an offline first start falls back below.
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception as e:
+    logger.warning(f"tiktoken unavailable ({e}), prompt budgets use a heuristic token estimate")
+    _encoding = None
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when it's installed, else a conservative estimate."""
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    # ~1 token per short word or punctuation mark, long words split every 6 characters
+    return sum(1 + (len(piece) - 1) // 6 for piece in _PIECES.findall(text))
+
+# Paragraphs that are site furniture rather than reporting
+BOILERPLATE = re.compile(
+    r"\bcookies?\b|privacy policy|terms (of use|and conditions)|all rights reserved|©|copyright \d{4}"
+    r"|sign up for|\bsubscribe\b|newsletter|\badvertisement\b|related articles?|read more|click here"
+    r"|follow us|share this|download the app|forward-looking statements|not (intended as )?investment advice"
+    r"|for informational purposes|past performance|reliance upon|disclaimer",
+    re.I,
+)
+NUMBER = re.compile(r"[$€£]\s?\d|\d+(\.\d+)?\s?(%|percent|million|billion|bn|m\b)", re.I)
+# Generic words in company names that say nothing about relevance
+NAME_STOPWORDS = {'inc', 'corp', 'corporation', 'company', 'co', 'ltd', 'plc', 'holdings', 'group', 'the', 'and', 'sa', 'ag', 'nv'}
+
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z"“])')
+
+def split_paragraphs(text: str) -> List[str]:
+    paragraphs = []
+    for paragraph in re.split(r'\n+', text or ''):
+        paragraph = ' '.join(paragraph.split())
+        if len(paragraph) <= MAX_PARAGRAPH_CHARS:
+            if paragraph:
+                paragraphs.append(paragraph)
+            continue
+        chunk = ''
+        for sentence in SENTENCE_END.split(paragraph):
+            if chunk and len(chunk) + len(sentence) > MAX_PARAGRAPH_CHARS:
+                paragraphs.append(chunk)
+                chunk = ''
+            chunk = f"{chunk} {sentence}" if chunk else sentence
+        if chunk:
+            paragraphs.append(chunk)
+    return paragraphs
+
+def _is_navigation(sentence: str) -> bool:
+    # Menus and link lists read as long runs of Capitalized Words
+    words = sentence.split()
+    return len(words) > 8 and sum(word[:1].isupper() for word in words) > 0.6 * len(words)
+
+def strip_boilerplate(paragraph: str) -> str:
+    """Drops the boilerplate sentences of a paragraph (banners, menus, disclaimers)."""
+    kept = []
+    for sentence in SENTENCE_END.split(paragraph):
+        if _is_navigation(sentence):
+            continue
+        # A long sentence that mentions e.g. a subscription in passing is still reporting
+        if BOILERPLATE.search(sentence) and len(BOILERPLATE.findall(sentence)) * 30 >= len(sentence.split()):
+            continue
+        kept.append(sentence)
+    paragraph = ' '.join(kept)
+    return paragraph if len(paragraph) >= MIN_PARAGRAPH_CHARS else ''
+
+def relevance_terms(ticker: str, company_name: Optional[str]) -> List[str]:
+    terms = {ticker.lower().split('-')[0]}
+    for word in re.findall(r"[A-Za-z][A-Za-z&'.]+", company_name or ''):
+        word = word.lower().strip('.')
+        if word not in NAME_STOPWORDS and len(word) > 2:
+            terms.add(word)
+    return sorted(terms)
+
+def score_paragraph(paragraph: str, position: int, terms: List[str]) -> float:
+    """Relevance of a paragraph: mentions of the company, hard numbers, and lead position."""
+    lowered = paragraph.lower()
+    score = 0.0
+    for term in terms:
+        if re.search(r'\b' + re.escape(term) + r'\b', lowered):
+            score += 3.0
+    score += min(3, len(NUMBER.findall(paragraph)))
+    # News is written inverted-pyramid: the first paragraphs carry the story
+    score += max(0.0, 2.0 - 0.5 * position)
+    return score
+
+def pack_articles(ticker: str, company_name: Optional[str], articles: List[Dict[str, Any]], budget: int) -> List[Dict[str, Any]]:
+    """
+    Fits article content into `budget` tokens. Boilerplate paragraphs are dropped, the
+    rest are ranked by relevance to the ticker and packed best-first (every article's
+    header is always included); each article keeps its chosen paragraphs in original order.
+
+    Returns:
+        Copies of the articles with 'content' replaced by the packed text.
+    """
+    terms = relevance_terms(ticker, company_name)
+    candidates = []
+    used = 0
+    for index, article in enumerate(articles):
+        used += count_tokens(f"Source: {article.get('source')}\nTitle: {article.get('title')}\nContent:\n\n\n---\n\n")
+        paragraphs = [p for p in map(strip_boilerplate, split_paragraphs(article.get('content', ''))) if p]
+        for position, paragraph in enumerate(paragraphs):
+            candidates.append((score_paragraph(paragraph, position, terms), index, position, paragraph))
+
+    chosen = {index: [] for index in range(len(articles))}
+    dropped = 0
+    # Highest score first; ties go to earlier articles and earlier paragraphs
+    for score, index, position, paragraph in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+        tokens = count_tokens(paragraph) + 1
+        if used + tokens > budget:
+            dropped += 1
+            continue
+        used += tokens
+        chosen[index].append((position, paragraph))
+
+    if dropped:
+        logger.info(f"Prompt budget of {budget} tokens reached for {ticker}: kept {len(candidates) - dropped} "
+                    f"of {len(candidates)} paragraphs")
+
+    packed = []
+    for index, article in enumerate(articles):
+        paragraphs = [paragraph for _, paragraph in sorted(chosen[index])]
+        packed.append({**article, 'content': '\n'.join(paragraphs)})
+    return packed
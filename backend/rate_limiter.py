@@ -0,0 +1,236 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import contextvars
+import email.utils
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Requests per second allowed per host, across every ticker and both the sync and async paths.
+# Override with NEWS_HOST_RATE_LIMITS="finviz.com=0.5,news.google.com=0.2"
+DEFAULT_HOST_RATES = {
+    'news.google.com': 0.5,
+    'finance.yahoo.com': 2.0,
+    'finviz.com': 1.0,
+    'marketwatch.com': 1.0,
+    'benzinga.com': 1.0,
+    'reuters.com': 1.0,
+    'seekingalpha.com': 0.5,
+}
+# Article pages are spread over many publishers; this applies to any host not listed above
+DEFAULT_HOST_RATE = float(os.getenv("NEWS_DEFAULT_HOST_RATE", "2"))
+HOST_BURST = float(os.getenv("NEWS_HOST_BURST", "3"))
+
+# Throttled responses (429/503) halve the host's rate; each success wins back a fraction of it
+MIN_RATE_FRACTION = 0.1
+RECOVERY_FRACTION = 0.05
+# Backoff used when a throttled response has no Retry-After
+BACKOFF_BASE = float(os.getenv("NEWS_BACKOFF_BASE", "2"))
+BACKOFF_MAX = float(os.getenv("NEWS_BACKOFF_MAX", "120"))
+
+# Sources whose libraries (yfinance, GoogleNews) make their own requests, so they're
+# limited by the host they talk to before the call instead of inside the HTTP client
+SOURCE_HOSTS = {
+    'Yahoo Finance': 'finance.yahoo.com',
+    'Google News': 'news.google.com',
+    'Investor Relations': 'news.google.com',
+}
+
+def _parse_rates(raw: str) -> Dict[str, float]:
+    rates = {}
+    for item in raw.split(','):
+        if '=' not in item:
+            continue
+        name, _, rate = item.rpartition('=')
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            logger.warning(f"Ignoring invalid host rate limit: {item}")
+    return rates
+
+HOST_RATES = {**DEFAULT_HOST_RATES, **_parse_rates(os.getenv("NEWS_HOST_RATE_LIMITS", ""))}
+
+def host_key(url_or_host: str) -> str:
+    """Normalizes a URL or hostname to the key limits are tracked under."""
+    host = urlsplit(url_or_host).hostname if '://' in url_or_host else url_or_host
+    host = (host or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    # query1/query2.finance.yahoo.com etc. share one budget
+    for known in HOST_RATES:
+        if host.endswith('.' + known):
+            return known
+    return host
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class HostLimiter:
+    """
+    Token bucket for one host, shared by threads and the event loop. Callers reserve a
+    slot and are told how long to wait for it, so requests are served in arrival order
+    whichever path they come from.
+
+    A throttled response (429/503) pauses the host until its Retry-After (or an
+    exponential backoff) has passed and halves the rate; successes raise it back
+    towards the configured rate.
+    """
+    def __init__(self, host: str, rate: float, capacity: float = HOST_BURST):
+        self.host = host
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        # Refill starts from here; it's in the future while the host is paused
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.strikes = 0
+        self.waiting = 0
+        self.requests = 0
+        self.throttled = 0
+
+    def reserve(self) -> float:
+        """Takes the next slot. Returns the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            if now > self._updated:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+            # Tokens may go negative: that's a queue of reservations ahead of this one
+            self._tokens -= 1
+            self.requests += 1
+            wait = self._updated - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return max(0.0, wait)
+
+    def on_success(self):
+        with self._lock:
+            self.strikes = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RECOVERY_FRACTION)
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> float:
+        """Pauses the host after a 429/503. Returns the pause in seconds."""
+        with self._lock:
+            self.strikes += 1
+            self.throttled += 1
+            if retry_after is None:
+                retry_after = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.strikes - 1))
+                retry_after *= random.uniform(1, 1.25)  # Don't let every queued ticker retry at once
+            self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+            # Requests reserved from here on resume one at a time after the pause, not in a burst
+            # (ones already holding a slot keep it)
+            self._updated = max(self._updated, time.monotonic() + retry_after)
+            self._tokens = 0.0
+        logger.warning(f"{self.host} is throttling us, pausing {retry_after:.1f}s (rate now {self.rate:.2f}/s)")
+        return retry_after
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rate': round(self.rate, 3),
+            'max_rate': self.max_rate,
+            'waiting': self.waiting,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'strikes': self.strikes,
+            'paused_for': round(max(0.0, self._updated - time.monotonic()), 1),
+        }
+
+class WaitTally:
+    """
+    What our own rate limiting cost one unit of work (a news source call): seconds spent
+    waiting for host slots, and whether a host answered 429/503.
+    """
+    __slots__ = ('seconds', 'throttled')
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.throttled = False
+
+_tally = contextvars.ContextVar('rate_limiter_tally', default=None)
+
+@contextmanager
+def tally_waits(tally: WaitTally = None):
+    """Adds the limiter waits made in this context (and threads started from it) to a WaitTally."""
+    tally = tally or WaitTally()
+    token = _tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _tally.reset(token)
+
+def note_throttled():
+    """Marks the current tally, if any, as having hit a throttled response."""
+    tally = _tally.get()
+    if tally is not None:
+        tally.throttled = True
+
+def _record_wait(wait: float):
+    tally = _tally.get()
+    if tally is not None:
+        tally.seconds += wait
+
+_limiters: Dict[str, HostLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def for_host(url_or_host: str) -> HostLimiter:
+    """Returns the shared limiter for a URL's host."""
+    host = host_key(url_or_host)
+    limiter = _limiters.get(host)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(host)
+            if limiter is None:
+                limiter = _limiters[host] = HostLimiter(host, HOST_RATES.get(host, DEFAULT_HOST_RATE))
+    return limiter
+
+async def acquire(url_or_host: str) -> HostLimiter:
+    """Waits (without blocking the event loop) for a request slot on the host."""
+    limiter = for_host(url_or_host)
+    wait = limiter.reserve()
+    if wait > 0:
+        limiter.waiting += 1
+        # Tallied up front so a deadline that fires mid-wait sees it
+        _record_wait(wait)
+        started = time.monotonic()
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            limiter.waiting -= 1
+            _record_wait(min(0.0, time.monotonic() - started - wait))
+    return limiter
+
+def acquire_sync(url_or_host: str) -> HostLimiter:
+    """Blocking variant of acquire, for the threaded code paths."""
+    limiter = for_host(url_or_host)
+    wait = limiter.reserve()
+    if wait > 0:
+        limiter.waiting += 1
+        # Tallied up front so a deadline that fires mid-wait sees it
+        _record_wait(wait)
+        started = time.monotonic()
+        try:
+            time.sleep(wait)
+        finally:
+            limiter.waiting -= 1
+            _record_wait(min(0.0, time.monotonic() - started - wait))
+    return limiter
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {host: limiter.stats() for host, limiter in list(_limiters.items())}
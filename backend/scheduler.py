@@ -0,0 +1,112 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List
+
+from news_cache import ttl_for
+
+logger = logging.getLogger(__name__)
+
+PREWARM_ENABLED = os.getenv("PREWARM_ENABLED", "1") not in ("0", "false", "False")
+PREWARM_CONCURRENCY = int(os.getenv("PREWARM_CONCURRENCY", "2"))
+# Refresh a ticker after this fraction of its cache TTL, so user requests land on fresh entries
+PREWARM_TTL_FRACTION = float(os.getenv("PREWARM_TTL_FRACTION", "0.8"))
+PREWARM_JITTER = float(os.getenv("PREWARM_JITTER", "0.1"))
+# First runs after startup are spread over this many seconds
+PREWARM_STARTUP_SPREAD = float(os.getenv("PREWARM_STARTUP_SPREAD", "30"))
+PREWARM_TICK = float(os.getenv("PREWARM_TICK", "5"))
+
+class PrewarmScheduler:
+    """
+    Periodically refreshes every portfolio ticker in the background.
+
+    Each ticker has a due time (its cache TTL times PREWARM_TTL_FRACTION, with
+    jitter so refreshes don't line up). Due tickers go on a queue drained by a
+    fixed number of workers; per-host request rates are enforced below this,
+    by rate_limiter.
+    """
+    def __init__(self, get_tickers: Callable[[], List[str]], refresh: Callable[[str], Awaitable],
+                 concurrency: int = PREWARM_CONCURRENCY):
+        self.get_tickers = get_tickers
+        self.refresh = refresh
+        self.concurrency = concurrency
+        self.queue = asyncio.Queue()
+        self.next_due: Dict[str, float] = {}
+        self.queued = set()
+        self.running = set()
+        self.refreshes = 0
+        self.failures = 0
+        self.max_lag = 0.0
+        self._tasks = []
+
+    def _interval(self, ticker: str) -> float:
+        base = ttl_for(ticker) * PREWARM_TTL_FRACTION
+        return base * random.uniform(1 - PREWARM_JITTER, 1 + PREWARM_JITTER)
+
+    def start(self):
+        logger.info(f"Starting prewarm scheduler with {self.concurrency} workers")
+        self._tasks = [asyncio.create_task(self._plan_loop())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _plan(self):
+        """Enqueues every ticker that is due, and forgets tickers no longer in the portfolio."""
+        now = time.time()
+        tickers = set(self.get_tickers())
+        for ticker in list(self.next_due):
+            if ticker not in tickers:
+                del self.next_due[ticker]
+        for ticker in tickers:
+            if ticker not in self.next_due:
+                self.next_due[ticker] = now + random.uniform(0, PREWARM_STARTUP_SPREAD)
+            if self.next_due[ticker] <= now and ticker not in self.queued and ticker not in self.running:
+                self.queued.add(ticker)
+                self.queue.put_nowait((self.next_due[ticker], ticker))
+
+    async def _plan_loop(self):
+        while True:
+            try:
+                self._plan()
+            except Exception as e:
+                logger.error(f"Prewarm planning failed: {e}")
+            await asyncio.sleep(PREWARM_TICK)
+
+    async def _worker(self):
+        while True:
+            due, ticker = await self.queue.get()
+            self.queued.discard(ticker)
+            self.running.add(ticker)
+            self.max_lag = max(self.max_lag, time.time() - due)
+            try:
+                await self.refresh(ticker)
+                self.refreshes += 1
+                logger.info(f"Prewarmed news for {ticker}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Prewarm refresh for {ticker} failed: {e}")
+            finally:
+                self.running.discard(ticker)
+                self.next_due[ticker] = time.time() + self._interval(ticker)
+                self.queue.task_done()
+
+    def stats(self):
+        now = time.time()
+        overdue = [now - due for due in self.next_due.values() if due <= now]
+        return {
+            "queue_depth": self.queue.qsize(),
+            "running": sorted(self.running),
+            "lag_seconds": round(max(overdue), 1) if overdue else 0.0,
+            "max_lag_seconds": round(self.max_lag, 1),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "next_due_in": {ticker: round(due - now, 1) for ticker, due in sorted(self.next_due.items())},
+        }
@@ -0,0 +1,170 @@
+import os
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from news_cache import SQLiteCache, CACHE_DIR
+from date_parsing import to_utc
+
+logger = logging.getLogger(__name__)
+
+# Scores are VADER compound polarity in [-1, 1], the scale of data/news.csv
+SENTIMENT_ENABLED = os.getenv("SENTIMENT_ENABLED", "1") not in ("0", "false", "False")
+# Part of the cache key: bump when the scorer or its lexicon changes
+SENTIMENT_VERSION = "vader-1"
+SENTIMENT_CACHE_TTL = 365 * 86400
+SENTIMENT_CACHE_MAX_ENTRIES = 500000
+# Scores kept in process in front of the on-disk cache (a headline is seen on every refresh)
+MEMO_MAX_ENTRIES = 100000
+# Batches with more uncached texts than this are scored across processes (bulk runs only,
+# see get_scorer)
+PARALLEL_THRESHOLD = int(os.getenv("SENTIMENT_PARALLEL_THRESHOLD", "2000"))
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_analyzer = None
+
+def _get_analyzer():
+    global _analyzer
+    if _analyzer is None:
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    # Module-level so worker processes can run it; each builds its own analyzer once
+    analyzer = _get_analyzer()
+    return [analyzer.polarity_scores(text)['compound'] for text in texts]
+
+def content_key(text: str) -> str:
+    normalized = ' '.join(text.split())
+    return hashlib.sha256(f"{SENTIMENT_VERSION}\n{normalized}".encode('utf-8')).hexdigest()
+
+class SentimentScorer:
+    """
+    Batch sentiment scorer. A batch is deduplicated by content hash, cached scores are
+    looked up in memory and then in one on-disk query, and only the misses are scored
+    (in chunks over a process pool for large batches), then written back in one transaction.
+    Safe to call from several threads at once.
+    """
+    def __init__(self, cache: Optional[SQLiteCache] = None, workers: int = SENTIMENT_WORKERS):
+        self.cache = cache or SQLiteCache(os.path.join(CACHE_DIR, "sentiment.db"), max_entries=SENTIMENT_CACHE_MAX_ENTRIES)
+        self.workers = workers
+        self._memo: Dict[str, float] = {}
+        self._lock = threading.Lock()  # Guards the memo and the counters
+        self.scored = 0
+        self.cache_hits = 0
+
+    def _score_misses(self, texts: List[str]) -> List[float]:
+        if len(texts) <= PARALLEL_THRESHOLD or self.workers <= 1:
+            return _score_chunk(texts)
+        size = -(-len(texts) // (self.workers * 4))
+        chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            return [score for chunk in pool.map(_score_chunk, chunks) for score in chunk]
+
+    def score(self, texts: List[Optional[str]]) -> np.ndarray:
+        """
+        Compound scores for `texts`, aligned with the input. Empty or missing texts
+        score NaN so they don't count towards daily averages.
+        """
+        scores = np.full(len(texts), np.nan)
+        keys: Dict[str, List[int]] = {}
+        originals: Dict[str, str] = {}
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip():
+                continue
+            key = content_key(text)
+            keys.setdefault(key, []).append(index)
+            originals.setdefault(key, text)
+        if not keys:
+            return scores
+
+        with self._lock:
+            cached = {key: self._memo[key] for key in keys if key in self._memo}
+        unknown = [key for key in keys if key not in cached]
+        if unknown:
+            cached.update((key, entry.value) for key, entry in self.cache.get_many(unknown).items())
+        missing = [key for key in unknown if key not in cached]
+        if missing:
+            fresh = dict(zip(missing, self._score_misses([originals[key] for key in missing])))
+            self.cache.set_many(fresh, ttl=SENTIMENT_CACHE_TTL)
+            cached.update(fresh)
+
+        with self._lock:
+            if len(self._memo) + len(unknown) > MEMO_MAX_ENTRIES:
+                self._memo.clear()
+            self._memo.update((key, cached[key]) for key in unknown)
+            self.cache_hits += len(keys) - len(missing)
+            self.scored += len(missing)
+
+        for key, indices in keys.items():
+            scores[indices] = cached[key]
+        return scores
+
+    def score_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Adds sentiment_title and sentiment_summary columns for a frame's title and summary."""
+        texts = list(frame['title']) + list(frame['summary'])
+        scores = self.score(texts)
+        return frame.assign(sentiment_title=scores[:len(frame)], sentiment_summary=scores[len(frame):])
+
+    def stats(self) -> Dict[str, int]:
+        return {'scored': self.scored, 'cache_hits': self.cache_hits}
+
+_scorer = None
+_scorer_lock = threading.Lock()
+
+def get_scorer() -> SentimentScorer:
+    """
+    The server's shared scorer. It scores in-process: its batches are one ticker's new
+    articles, called from worker threads, where a process pool would cost more than it saves.
+    """
+    global _scorer
+    with _scorer_lock:
+        if _scorer is None:
+            _scorer = SentimentScorer(workers=1)
+    return _scorer
+
+def record_articles(ticker: str, articles) -> int:
+    """
+    Scores a ticker's newly fetched articles and appends them to the sentiment dataset,
+    refreshing the daily rows (data/data.csv) of the stock-days they fall on.
+
+    Returns:
+        The number of articles recorded.
+    """
+    import sentiment_dataset  # Loads pyarrow; deferred until there's something to record
+
+    articles = [article for article in articles if article.published is not None]
+    if not SENTIMENT_ENABLED or not articles:
+        return 0
+    frame = pd.DataFrame({
+        'guid': [sentiment_dataset.article_guid(article.url) for article in articles],
+        'stock': ticker.upper(),
+        'title': [article.title for article in articles],
+        'summary': [article.summary for article in articles],
+        'published': pd.to_datetime([to_utc(article.published, article.source) for article in articles], utc=True),
+    })
+    sentiment_dataset.ingest(get_scorer().score_frame(frame))
+    return len(frame)
+
+if __name__ == "__main__":
+    # Re-scores a news.csv-format file and reports throughput: python sentiment.py ../data/news.csv
+    import sys
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+    frame = pd.read_csv(sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "..", "data", "news.csv"), sep=';')
+    scorer = SentimentScorer(cache=SQLiteCache(os.path.join(CACHE_DIR, "sentiment_bench.db")))
+    start = time.perf_counter()
+    scored = scorer.score_frame(frame)
+    elapsed = time.perf_counter() - start
+    for column in ('sentiment_title', 'sentiment_summary'):
+        if column in frame:
+            matches = np.isclose(frame[column].fillna(0), scored[column].fillna(0), atol=1e-4).mean()
+            print(f"{column}: {matches:.0%} of rows match the file's scores")
+    print(f"Scored {2 * len(frame)} texts in {elapsed * 1000:.0f} ms ({scorer.stats()})")
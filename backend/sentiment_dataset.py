@@ -0,0 +1,295 @@
+"""
+Columnar store for scored news and the daily per-stock sentiment table.
+
+Scored articles (the columns of data/news.csv) are kept in a Parquet dataset partitioned
+by stock and publish date, data/news_dataset/stock=AAPL/date=2025-11-17/part-0.parquet.
+Appending a batch rewrites only the partitions it touches, and only those stock-days'
+rows of the daily table (data/data.csv) are recomputed, so ingest cost follows the size
+of the batch rather than of the history.
+
+    python sentiment_dataset.py ingest ../data/news.csv
+    python sentiment_dataset.py rebuild
+"""
+import os
+import sys
+import uuid
+import logging
+import argparse
+import threading
+from typing import Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.getenv("SENTIMENT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data"))
+DATASET_DIR = os.path.join(DATA_DIR, "news_dataset")
+NEWS_CSV = os.path.join(DATA_DIR, "news.csv")
+DAILY_CSV = os.path.join(DATA_DIR, "data.csv")
+CSV_SEPARATOR = ';'
+
+NEWS_COLUMNS = ['guid', 'stock', 'title', 'summary', 'published', 'p_date', 'sentiment_summary', 'sentiment_title']
+PRICE_COLUMNS = ['open', 'close', 'high', 'low', 'volume', 'change']
+DAILY_COLUMNS = (['id', 'stock', 'news_dt', 'check_day'] + PRICE_COLUMNS
+                 + ['sentiment_summary_avg', 'sentiment_summary_med', 'sentiment_title_avg', 'sentiment_title_med'])
+# 'change' of stock-days whose session prices haven't been looked up yet
+UNCHECKED = 'UNCHECKED'
+# Set once a stock-day's session is looked up, and kept when its sentiment is recomputed
+CHECKED_COLUMNS = ['check_day'] + PRICE_COLUMNS
+
+# News published after this time (UTC) is priced in by the next session, not the same day's
+MARKET_CLOSE_UTC = pd.Timedelta(os.getenv("MARKET_CLOSE_UTC", "20:00:00"))
+
+PUBLISHED_FORMAT = "%a, %d %b %Y %H:%M:%S %z"  # RFC 2822, as in news.csv
+NEWS_DT_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columns stored in each partition file; stock and date live in the directory names
+SCHEMA = pa.schema([
+    ('guid', pa.string()),
+    ('title', pa.string()),
+    ('summary', pa.string()),
+    ('published', pa.timestamp('s', tz='UTC')),
+    ('sentiment_summary', pa.float64()),
+    ('sentiment_title', pa.float64()),
+])
+
+PARTITIONING = ds.partitioning(pa.schema([('stock', pa.string()), ('date', pa.string())]), flavor='hive')
+
+def article_guid(url: str) -> str:
+    """Stable guid for an article without a feed guid (UUID5 of its URL)."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, url))
+
+def _partition_dir(stock: str, date: str) -> str:
+    return os.path.join(DATASET_DIR, f"stock={stock}", f"date={date}")
+
+def normalize_articles(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Brings a batch of scored articles to the dataset schema: `published` becomes a UTC
+    timestamp (RFC 2822 strings, as in news.csv, or anything pandas parses) and rows
+    without a guid, stock or date are dropped.
+    """
+    frame = frame.copy()
+    published = frame['published']
+    if not pd.api.types.is_datetime64_any_dtype(published):
+        parsed = pd.to_datetime(published, format=PUBLISHED_FORMAT, utc=True, errors='coerce')
+        # Fall back to free-form parsing for the rows the fixed format didn't cover
+        missing = parsed.isna() & published.notna()
+        if missing.any():
+            parsed[missing] = pd.to_datetime(published[missing], utc=True, errors='coerce', format='mixed')
+        published = parsed
+    frame['published'] = published.dt.tz_convert('UTC') if published.dt.tz is not None else published.dt.tz_localize('UTC')
+    frame['published'] = frame['published'].dt.floor('s')
+    frame['stock'] = frame['stock'].str.upper()
+    for column in ('title', 'summary', 'sentiment_summary', 'sentiment_title'):
+        if column not in frame:
+            frame[column] = None
+    for column in ('sentiment_summary', 'sentiment_title'):
+        frame[column] = pd.to_numeric(frame[column], errors='coerce')
+
+    before = len(frame)
+    frame = frame.dropna(subset=['guid', 'stock', 'published'])
+    if len(frame) < before:
+        logger.warning(f"Dropped {before - len(frame)} articles without a guid, stock or parseable date")
+    return frame[['stock'] + SCHEMA.names]
+
+def _same_rows(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    if len(a) != len(b):
+        return False
+    return a.sort_values('guid').reset_index(drop=True).equals(b.sort_values('guid').reset_index(drop=True))
+
+def append_articles(frame: pd.DataFrame) -> Set[Tuple[str, str]]:
+    """
+    Merges scored articles into the dataset. Each touched (stock, date) partition is read,
+    merged on guid (the new row wins) and rewritten; no other partition is opened.
+
+    Returns:
+        The (stock, 'YYYY-MM-DD') partitions that changed.
+    """
+    frame = normalize_articles(frame)
+    if frame.empty:
+        return set()
+
+    frame = frame.assign(date=frame['published'].dt.strftime('%Y-%m-%d'))
+    changed = set()
+    for (stock, date), batch in frame.groupby(['stock', 'date'], sort=False):
+        # Round-trip through the schema so new and stored rows compare with the same dtypes
+        batch = pa.Table.from_pandas(batch[SCHEMA.names], schema=SCHEMA, preserve_index=False).to_pandas()
+        directory = _partition_dir(stock, date)
+        path = os.path.join(directory, "part-0.parquet")
+        merged = batch.drop_duplicates('guid', keep='last')
+        if os.path.exists(path):
+            existing = pq.read_table(path, schema=SCHEMA).to_pandas()
+            merged = pd.concat([existing, batch], ignore_index=True).drop_duplicates('guid', keep='last')
+            if _same_rows(existing, merged):
+                continue  # Nothing new for this stock-day
+
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pandas(merged.sort_values('published', ascending=False), schema=SCHEMA, preserve_index=False)
+        # Write beside the partition and swap in, so readers never see a half-written file
+        tmp_path = path + ".tmp"
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+        changed.add((stock, date))
+
+    logger.info(f"Appended {len(frame)} articles, {len(changed)} partitions changed")
+    return changed
+
+def read_articles(partitions: Optional[Iterable[Tuple[str, str]]] = None, stocks: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Reads articles from the dataset: everything, the given stocks, or exactly the given
+    (stock, date) partitions. Columns are SCHEMA's plus the 'stock' and 'date' partition keys.
+    """
+    if partitions is not None:
+        frames = []
+        for stock, date in sorted(set(partitions)):
+            path = os.path.join(_partition_dir(stock, date), "part-0.parquet")
+            if os.path.exists(path):
+                frames.append(pq.read_table(path, schema=SCHEMA).to_pandas().assign(stock=stock, date=date))
+        return pd.concat(frames, ignore_index=True) if frames else _empty_articles()
+
+    if not os.path.isdir(DATASET_DIR):
+        return _empty_articles()
+    dataset = ds.dataset(DATASET_DIR, schema=SCHEMA.append(pa.field('stock', pa.string())).append(pa.field('date', pa.string())),
+                         format='parquet', partitioning=PARTITIONING)
+    # Only the requested stocks' directories are opened
+    selection = ds.field('stock').isin(sorted({stock.upper() for stock in stocks})) if stocks is not None else None
+    return dataset.to_table(filter=selection).to_pandas()
+
+def _empty_articles() -> pd.DataFrame:
+    return SCHEMA.empty_table().to_pandas().assign(stock=pd.Series(dtype=str), date=pd.Series(dtype=str))
+
+def check_days(news_dt: pd.Series) -> pd.Series:
+    """
+    The session whose move a stock-day's news should explain: the same weekday when the
+    latest article came out before the close, otherwise the next weekday.
+    Exchange holidays aren't accounted for.
+    """
+    day = news_dt.dt.normalize()
+    after_close = (news_dt - day) >= MARKET_CLOSE_UTC
+    day = day + pd.to_timedelta(after_close.astype(int), unit='D')
+    # Roll Saturday and Sunday forward to Monday
+    weekday = day.dt.weekday
+    day = day + pd.to_timedelta((7 - weekday).where(weekday >= 5, 0), unit='D')
+    return day.dt.strftime('%Y-%m-%d')
+
+def daily_aggregates(articles: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per stock-day sentiment (mean and median of summary and title scores), the latest
+    publish time and the session to check, computed in one vectorized group-by.
+    Price columns are left at 0 / UNCHECKED for the price backfill to fill in.
+    """
+    if articles.empty:
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+
+    daily = articles.groupby(['stock', 'date'], sort=True, observed=True).agg(
+        news_dt=('published', 'max'),
+        sentiment_summary_avg=('sentiment_summary', 'mean'),
+        sentiment_summary_med=('sentiment_summary', 'median'),
+        sentiment_title_avg=('sentiment_title', 'mean'),
+        sentiment_title_med=('sentiment_title', 'median'),
+    ).reset_index()
+
+    news_dt = daily['news_dt'].dt.tz_convert('UTC').dt.tz_localize(None)
+    daily['id'] = daily['stock'] + '_' + daily['date']
+    daily['check_day'] = check_days(news_dt)
+    daily['news_dt'] = news_dt.dt.strftime(NEWS_DT_FORMAT)
+    for column in PRICE_COLUMNS[:-1]:
+        daily[column] = 0
+    daily['change'] = UNCHECKED
+    return daily[DAILY_COLUMNS]
+
+def read_daily(path: str = DAILY_CSV) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+    return pd.read_csv(path, sep=CSV_SEPARATOR, dtype={'id': str, 'stock': str, 'change': str})
+
+def write_daily(daily: pd.DataFrame, path: str = DAILY_CSV):
+    tmp_path = path + ".tmp"
+    daily[DAILY_COLUMNS].to_csv(tmp_path, sep=CSV_SEPARATOR, index=False)
+    os.replace(tmp_path, path)
+
+def update_daily(partitions: Iterable[Tuple[str, str]], path: str = DAILY_CSV) -> pd.DataFrame:
+    """
+    Recomputes the daily rows of the given stock-days from their partitions and upserts
+    them into the daily table. Prices already backfilled for a row are kept.
+
+    Returns:
+        The recomputed rows.
+    """
+    partitions = set(partitions)
+    if not partitions:
+        return pd.DataFrame(columns=DAILY_COLUMNS)
+
+    fresh = daily_aggregates(read_articles(partitions))
+    daily = read_daily(path)
+    if not daily.empty:
+        # Carry over sessions already looked up (see price_backfill); the sentiment columns are replaced
+        checked = daily[daily['change'].astype(str) != UNCHECKED].set_index('id')[CHECKED_COLUMNS]
+        known = fresh['id'].isin(checked.index)
+        if known.any():
+            fresh[PRICE_COLUMNS] = fresh[PRICE_COLUMNS].astype(object)
+            fresh.loc[known, CHECKED_COLUMNS] = checked.loc[fresh.loc[known, 'id'], CHECKED_COLUMNS].to_numpy()
+        daily = daily[~daily['id'].isin(fresh['id'])]
+    daily = pd.concat([daily, fresh], ignore_index=True) if not daily.empty else fresh
+    write_daily(daily.sort_values(['stock', 'id'], ascending=[True, False], kind='stable'), path)
+    logger.info(f"Updated {len(fresh)} daily rows in {path}")
+    return fresh
+
+# Appends read, merge and rewrite partitions and the daily table; one writer at a time
+_write_lock = threading.Lock()
+
+def ingest(frame: pd.DataFrame, path: str = DAILY_CSV) -> Set[Tuple[str, str]]:
+    """Appends scored articles and refreshes the daily rows of the stock-days they touched."""
+    with _write_lock:
+        changed = append_articles(frame)
+        update_daily(changed, path)
+    return changed
+
+def ingest_csv(news_csv: str = NEWS_CSV, path: str = DAILY_CSV) -> Set[Tuple[str, str]]:
+    """Imports a news.csv-format file (semicolon-delimited) into the dataset."""
+    frame = pd.read_csv(news_csv, sep=CSV_SEPARATOR, dtype={'guid': str, 'stock': str})
+    return ingest(frame, path)
+
+def rebuild_daily(path: str = DAILY_CSV) -> pd.DataFrame:
+    """Recomputes every daily row from the full dataset (prices already looked up are kept)."""
+    with _write_lock:
+        articles = read_articles()
+        return update_daily(set(zip(articles['stock'], articles['date'])), path)
+
+def update_prices(resolved: pd.DataFrame, path: str = DAILY_CSV) -> int:
+    """
+    Writes looked-up sessions (id plus CHECKED_COLUMNS) into the daily table in place.
+
+    Returns:
+        The number of rows updated.
+    """
+    with _write_lock:
+        daily = read_daily(path)
+        resolved = resolved.drop_duplicates('id', keep='last').set_index('id')
+        rows = daily['id'].isin(resolved.index)
+        daily[PRICE_COLUMNS] = daily[PRICE_COLUMNS].astype(object)
+        daily.loc[rows, CHECKED_COLUMNS] = resolved.loc[daily.loc[rows, 'id'], CHECKED_COLUMNS].to_numpy()
+        write_daily(daily, path)
+    logger.info(f"Updated prices of {int(rows.sum())} daily rows in {path}")
+    return int(rows.sum())
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = commands.add_parser('ingest', help="append a news.csv-format file")
+    ingest_parser.add_argument('csv', nargs='?', default=NEWS_CSV)
+    commands.add_parser('rebuild', help="recompute data.csv from the whole dataset")
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        changed = ingest_csv(args.csv)
+        print(f"{len(changed)} stock-days changed")
+    else:
+        print(f"{len(rebuild_daily())} stock-days recomputed")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -1,49 +1,139 @@
 import os
+import json
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any
-import google.generativeai as genai
-from llama3 import generate_with_llama
+from typing import List, Dict, Any, Optional
+import article_filter
+from llm_backends import OLLAMA_MODEL, GEMINI_MODEL, get_service
+from news_cache import SQLiteCache, CACHE_DIR
+from prompt_packing import NUM_CTX, OUTPUT_TOKENS, count_tokens, pack_articles
+from ticker_metadata import cached_company_name
 
 logger = logging.getLogger(__name__)
 
 import datetime
 
-def generate_summary(ticker: str, articles_data: List[Dict[str, Any]]) -> str:
+LLAMA_MODEL = OLLAMA_MODEL
+
+# Bump whenever build_prompt's template changes so old reports aren't reused
+PROMPT_VERSION = "3"
+
+SUMMARY_CACHE_TTL = float(os.getenv("SUMMARY_CACHE_TTL", str(7 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "2000"))
+
+# Map-reduce mode: each article is first condensed to a digest of facts (cached by content,
+# so an unchanged article is never re-read), then one reduce call writes the report from
+# the digests. "auto" uses it from MAP_REDUCE_MIN_ARTICLES articles up; "single" never.
+# Opt-in: the map calls all run before the first report token, which a streamed report
+# can't afford with one Ollama slot, and "auto" only kicks in above the default
+# SUMMARY_ARTICLES (6).
+SUMMARY_MODE = os.getenv("SUMMARY_MODE", "single")
+MAP_REDUCE_MIN_ARTICLES = int(os.getenv("MAP_REDUCE_MIN_ARTICLES", "8"))
+MAP_CONCURRENCY = int(os.getenv("MAP_CONCURRENCY", "2"))
+DIGEST_TOKENS = int(os.getenv("DIGEST_INPUT_TOKENS", "3000"))
+# Bump whenever the digest prompt changes
+DIGEST_VERSION = "1"
+DIGEST_CACHE_TTL = float(os.getenv("DIGEST_CACHE_TTL", str(30 * 24 * 3600)))
+
+_summary_cache = None
+_digest_cache = None
+
+def _get_summary_cache() -> SQLiteCache:
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SQLiteCache(os.path.join(CACHE_DIR, "summaries.db"), max_entries=SUMMARY_CACHE_MAX_ENTRIES)
+    return _summary_cache
+
+def _get_digest_cache() -> SQLiteCache:
+    global _digest_cache
+    if _digest_cache is None:
+        _digest_cache = SQLiteCache(os.path.join(CACHE_DIR, "digests.db"), max_entries=SUMMARY_CACHE_MAX_ENTRIES * 10)
+    return _digest_cache
+
+def summary_cache_key(ticker: str, model: str, articles_data: List[Dict[str, Any]], mode: str = "single") -> str:
+    """
+    Content address for a report: ticker, prompt version, model, summary mode
+    ("single" or "map_reduce") and the normalized article set. Article order and
+    whitespace don't change the key.
     """
-    Generates a detailed summary from a list of article data using Llama 3 (local) or Gemini (fallback).
+    articles = sorted(
+        (
+            ' '.join((article.get('source') or '').split()),
+            ' '.join((article.get('title') or '').split()),
+            ' '.join((article.get('content') or '').split()),
+        )
+        for article in articles_data
+    )
+    payload = json.dumps([ticker.upper(), PROMPT_VERSION, model, mode, articles], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get_cached_summary(ticker: str, articles_data: List[Dict[str, Any]], mode: str = "single") -> Optional[str]:
+    """Returns a stored report for this exact article set and mode, from either model, if there is one."""
+    try:
+        cache = _get_summary_cache()
+        for model in (LLAMA_MODEL, GEMINI_MODEL):
+            entry = cache.get(summary_cache_key(ticker, model, articles_data, mode))
+            if entry is not None and entry.is_fresh():
+                logger.info(f"Serving cached {model} summary for {ticker}")
+                return entry.value
+    except Exception as e:
+        logger.warning(f"Summary cache lookup failed: {e}")
+    return None
+
+def store_summary(ticker: str, model: str, articles_data: List[Dict[str, Any]], summary: str, mode: str = "single"):
+    try:
+        _get_summary_cache().set(summary_cache_key(ticker, model, articles_data, mode), summary, ttl=SUMMARY_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Could not store summary for {ticker}: {e}")
+
+def build_prompt(ticker: str, articles_data: List[Dict[str, Any]]):
+    """
+    Builds the report prompt from extracted articles, packed to fit the model context
+    (see prompt_packing).
     
-    Args:
-        ticker: The stock ticker symbol.
-        articles_data: A list of dictionaries, each containing 'content', 'source', 'title'.
-        
     Returns:
-        A string containing the detailed write-up with citations.
+        A (prompt, message) tuple. prompt is None when there is nothing to summarize,
+        in which case message explains why.
     """
-    
     if not articles_data:
-        return "No news articles found to summarize."
+        return None, "No news articles found to summarize."
 
-    # Prepare the prompt with structured content
-    combined_text = ""
-    valid_article_count = 0
+    valid_articles = _filter_articles(articles_data)
+    if not valid_articles:
+        return None, "No valid news articles found (filtered out low quality sources)."
     
-    for i, article in enumerate(articles_data):
+    # Pack the most relevant paragraphs into what's left of the context window after
+    # the instructions and the room reserved for the report
+    budget = NUM_CTX - OUTPUT_TOKENS - count_tokens(_report_prompt(ticker, ""))
+    packed = pack_articles(ticker, cached_company_name(ticker), valid_articles, budget)
+    
+    prompt = _report_prompt(ticker, _combine(packed))
+    logger.info(f"Prompt for {ticker}: {count_tokens(prompt)} tokens (context {NUM_CTX}, {OUTPUT_TOKENS} reserved for output)")
+    return prompt, None
+
+def _filter_articles(articles_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    valid_articles = []
+    for article in articles_data:
         source = article.get('source', 'Unknown Source')
         title = article.get('title', 'No Title')
-        content = article.get('content', '')[:10000]  # Truncate individual articles if too long
+        content = article.get('content', '')
         
-        # DOUBLE CHECK: Filter out Zacks if it slipped through
-        if 'zacks' in source.lower() or 'zacks' in title.lower() or 'zacks' in content.lower()[:200]: # Check start of content too
-            logger.info(f"Skipping Zacks article detected in summarizer: {title}")
+        # Extracted text can reveal a blocked publisher (e.g. a Zacks piece syndicated under another name)
+        if article_filter.is_blocked(content[:200]):
+            logger.info(f"Skipping blocked article detected in summarizer: {title}")
             continue
-            
-        combined_text += f"Source: {source}\nTitle: {title}\nContent:\n{content}\n\n---\n\n"
-        valid_article_count += 1
-        
-    if valid_article_count == 0:
-        return "No valid news articles found (filtered out low quality sources)."
-    
-    prompt = f"""You are a senior financial analyst preparing a comprehensive market intelligence report for {ticker}. This is NOT a brief summary - this is a detailed, thorough analysis report.
+        valid_articles.append({'source': source, 'title': title, 'content': content})
+    return valid_articles
+
+def _combine(articles: List[Dict[str, Any]]) -> str:
+    combined_text = ""
+    for article in articles:
+        combined_text += f"Source: {article['source']}\nTitle: {article['title']}\nContent:\n{article['content']}\n\n---\n\n"
+    return combined_text
+
+def _report_prompt(ticker: str, combined_text: str) -> str:
+    return f"""You are a senior financial analyst preparing a comprehensive market intelligence report for {ticker}. This is NOT a brief summary - this is a detailed, thorough analysis report.
     
 TODAY'S DATE: {datetime.date.today().strftime('%B %d, %Y')}
 IMPORTANT: Prioritize news from the last 7 days. If an article is older than 30 days, explicitly note it as historical context or ignore it if irrelevant.
@@ -86,33 +176,108 @@ Here is the news content to analyze:
 
 Begin your detailed report now (REMEMBER: minimum 50 sentences, target 50-100):"""
 
-    print(f"\n{'='*50}\nGENERATED PROMPT FOR {ticker}\n{'='*50}")
-    print(prompt)
-    print(f"{'='*50}\n")
+def build_digest_prompt(ticker: str, article: Dict[str, Any]) -> str:
+    """Map step prompt: condense one article to the facts that matter for `ticker`."""
+    packed = pack_articles(ticker, cached_company_name(ticker), [article], DIGEST_TOKENS)[0]
+    return f"""Extract the material facts about {ticker} from the news article below.
 
-    # Try Local LLM first
-    try:
-        logger.info(f"Attempting to generate summary with Llama 3 for {ticker}")
-        llama_response = generate_with_llama(prompt, model="llama3:8b")
-        
-        if llama_response:
-            print(f"\n{'='*50}\nLLAMA3 OUTPUT FOR {ticker}\n{'='*50}")
-            print(llama_response)
-            print(f"{'='*50}\n")
-            
-            logger.info(f"Successfully generated summary with Llama 3 for {ticker}")
-            return llama_response
-        else:
-            logger.warning("Llama 3 returned empty response, falling back to Gemini")
-    except Exception as e:
-        logger.warning(f"Llama 3 failed: {e}. Falling back to Gemini")
-    
-    # Fallback to Gemini if Llama 3 fails
-    api_key = os.getenv("GEMINI_API_KEY")
-    
-    if not api_key:
-        logger.warning("No GEMINI_API_KEY found and Llama 3 failed. Returning error message.")
-        return f"""**Note: Unable to generate summary.**
+Write 5-15 short bullet points. Keep every specific number, date, percentage, dollar amount and name.
+Include only facts: no analyst opinions, ratings or price targets, nothing from Zacks, and nothing about
+other companies unless it directly affects {ticker}. If the article has nothing material about {ticker},
+reply with just: NONE
+
+Source: {packed['source']}
+Title: {packed['title']}
+Content:
+{packed['content']}
+
+Facts:"""
+
+def digest_cache_key(ticker: str, article: Dict[str, Any]) -> str:
+    """Content address for an article digest. Independent of the model that wrote it."""
+    payload = json.dumps([
+        ticker.upper(), DIGEST_VERSION,
+        ' '.join((article.get('title') or '').split()),
+        ' '.join((article.get('content') or '').split()),
+    ], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+async def _generate_async(prompt: str):
+    """
+    One completion from the configured LLM backends (Llama 3, then Gemini by default).
+
+    Returns:
+        (text, model), or (None, None) if no backend produced anything.
+    """
+    return await get_service().generate(prompt)
+
+async def digest_article_async(ticker: str, article: Dict[str, Any], semaphore: asyncio.Semaphore = None) -> Optional[str]:
+    """
+    Map step: the article's digest, from the digest cache or a fresh LLM call.
+    Returns '' for articles with nothing material, None if generation failed.
+    """
+    key = digest_cache_key(ticker, article)
+    cache = _get_digest_cache()
+    entry = await asyncio.to_thread(cache.get, key)
+    if entry is not None and entry.is_fresh():
+        return entry.value
+
+    async with semaphore or asyncio.Semaphore(1):
+        digest, model = await _generate_async(build_digest_prompt(ticker, article))
+    if digest is None:
+        return None
+    digest = '' if digest.strip().upper().startswith('NONE') else digest.strip()
+    await asyncio.to_thread(cache.set, key, digest, DIGEST_CACHE_TTL)
+    logger.info(f"Digested '{article.get('title')}' for {ticker} with {model}")
+    return digest
+
+def use_map_reduce(articles_data: List[Dict[str, Any]]) -> bool:
+    if SUMMARY_MODE == "map_reduce":
+        return True
+    return SUMMARY_MODE == "auto" and len(articles_data) >= MAP_REDUCE_MIN_ARTICLES
+
+async def build_report_prompt_async(ticker: str, articles_data: List[Dict[str, Any]]):
+    """
+    build_prompt, or in map-reduce mode the reduce prompt over per-article digests
+    (generated in parallel, at most MAP_CONCURRENCY at a time).
+
+    Returns:
+        A (prompt, message) tuple, as from build_prompt.
+    """
+    if not use_map_reduce(articles_data):
+        return build_prompt(ticker, articles_data)
+
+    valid_articles = _filter_articles(articles_data)
+    if not valid_articles:
+        return build_prompt(ticker, articles_data)
+
+    semaphore = asyncio.Semaphore(MAP_CONCURRENCY)
+    digests = await asyncio.gather(*(digest_article_async(ticker, article, semaphore) for article in valid_articles))
+    if any(digest is None for digest in digests):
+        # No backend for the map step; the single-prompt path reports that the same way as before
+        logger.warning(f"Map step failed for {ticker}, falling back to a single prompt")
+        return build_prompt(ticker, articles_data)
+
+    digested = [{**article, 'content': digest} for article, digest in zip(valid_articles, digests) if digest]
+    if not digested:
+        return None, "No material news found in the articles."
+
+    prompt = _report_prompt(ticker, _combine(digested))
+    budget = NUM_CTX - OUTPUT_TOKENS - count_tokens(_report_prompt(ticker, ""))
+    if count_tokens(prompt) > NUM_CTX - OUTPUT_TOKENS:
+        packed = pack_articles(ticker, cached_company_name(ticker), digested, budget)
+        prompt = _report_prompt(ticker, _combine(packed))
+    logger.info(f"Reduce prompt for {ticker}: {len(digested)} digests, {count_tokens(prompt)} tokens")
+    return prompt, None
+
+class SummaryUnavailable(Exception):
+    """No backend produced a report. `message` is the note to show in its place."""
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+def _no_backend_message(ticker: str, article_count: int) -> str:
+    return f"""**Note: Unable to generate summary.**
 
 Llama 3 (local model) is not available, and no GEMINI_API_KEY was found.
 
@@ -120,18 +285,70 @@ Please either:
 1. Start Ollama server: `ollama serve`
 2. Set GEMINI_API_KEY environment variable
 
-Recent news for {ticker} suggests active market movements. {len(articles_data)} articles found. Please review the sources below."""
+Recent news for {ticker} suggests active market movements. {article_count} articles found. Please review the sources below."""
 
-    try:
-        logger.info(f"Attempting to generate summary with Gemini for {ticker}")
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        response = model.generate_content(prompt)
-        logger.info(f"Successfully generated summary with Gemini for {ticker}")
-        
-        return response.text.strip()
-        
-    except Exception as e:
-        logger.error(f"Error generating summary with Gemini: {e}")
-        return f"Error generating summary: {str(e)}. Both Llama 3 and Gemini failed."
+async def generate_summary_async(ticker: str, articles_data: List[Dict[str, Any]]) -> str:
+    """
+    Generates the report for a ticker's extracted articles through the LLM service
+    (Ollama, then Gemini as fallback), with its priority queueing and timeouts.
+    Larger article sets are summarized map-reduce (see build_report_prompt_async).
+
+    Raises:
+        SummaryUnavailable: if no backend produced a report.
+    """
+    # Keyed by the requested mode, so a report written after the map step fell back is still found
+    mode = "map_reduce" if use_map_reduce(articles_data) else "single"
+    cached = await asyncio.to_thread(get_cached_summary, ticker, articles_data, mode) if articles_data else None
+    if cached:
+        return cached
+
+    prompt, message = await build_report_prompt_async(ticker, articles_data)
+    if prompt is None:
+        return message
+
+    logger.info(f"Attempting to generate summary for {ticker}")
+    summary, model = await _generate_async(prompt)
+    if summary:
+        logger.info(f"Successfully generated summary with {model} for {ticker}")
+        await asyncio.to_thread(store_summary, ticker, model, articles_data, summary, mode)
+        return summary
+
+    if not os.getenv("GEMINI_API_KEY"):
+        logger.warning("No GEMINI_API_KEY found and Llama 3 failed. Returning error message.")
+        raise SummaryUnavailable(_no_backend_message(ticker, len(articles_data)))
+    raise SummaryUnavailable("Error generating summary. Both Llama 3 and Gemini failed.")
+
+async def stream_summary_async(ticker: str, articles_data: List[Dict[str, Any]]):
+    """
+    Streaming variant of generate_summary_async. Yields the report as it is generated,
+    from Ollama's token stream or, failing that, Gemini's streaming API. In map-reduce
+    mode only the reduce step is streamed. A stream that breaks off raises
+    llm_backends.StreamInterrupted and its partial report is not cached; if no
+    backend produces anything, SummaryUnavailable is raised.
+    """
+    # Keyed by the requested mode, so a report written after the map step fell back is still found
+    mode = "map_reduce" if use_map_reduce(articles_data) else "single"
+    cached = await asyncio.to_thread(get_cached_summary, ticker, articles_data, mode) if articles_data else None
+    if cached:
+        yield cached
+        return
+
+    prompt, message = await build_report_prompt_async(ticker, articles_data)
+    if prompt is None:
+        yield message
+        return
+
+    logger.info(f"Streaming summary for {ticker}")
+    chunks = []
+    model = None
+    async for chunk, model in get_service().stream(prompt):
+        chunks.append(chunk)
+        yield chunk
+    if chunks:
+        await asyncio.to_thread(store_summary, ticker, model, articles_data, "".join(chunks).strip(), mode)
+        return
+
+    if not os.getenv("GEMINI_API_KEY"):
+        logger.warning("No GEMINI_API_KEY found and Llama 3 failed. Returning error message.")
+        raise SummaryUnavailable(_no_backend_message(ticker, len(articles_data)))
+    raise SummaryUnavailable("Error generating summary. Both Llama 3 and Gemini failed.")
@@ -0,0 +1,105 @@
+import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import yfinance as yf
+
+from news_cache import SQLiteCache, CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Names and quote types practically never change, so resolved symbols are kept for a week.
+# Invalid symbols are remembered for a day so typos don't hit yfinance on every request.
+METADATA_TTL = float(os.getenv("TICKER_METADATA_TTL", str(7 * 24 * 3600)))
+NEGATIVE_TTL = float(os.getenv("TICKER_METADATA_NEGATIVE_TTL", str(24 * 3600)))
+BULK_RESOLVE_WORKERS = int(os.getenv("TICKER_METADATA_WORKERS", "8"))
+
+_cache = None
+
+def _get_cache() -> SQLiteCache:
+    global _cache
+    if _cache is None:
+        _cache = SQLiteCache(os.path.join(CACHE_DIR, "ticker_metadata.db"), max_entries=10000)
+    return _cache
+
+def _fetch_info(symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Looks a symbol up with yfinance's (slow) .info.
+    Returns None if the symbol is unknown; network errors propagate.
+    """
+    info = yf.Ticker(symbol).info
+    # Invalid tickers come back empty or without a quoteType
+    if not info or 'quoteType' not in info:
+        return None
+    return {
+        'symbol': symbol,
+        'long_name': info.get('longName'),
+        'short_name': info.get('shortName'),
+        'quote_type': (info.get('quoteType') or '').upper(),
+        'valid': True,
+    }
+
+def resolve_ticker(ticker: str) -> Dict[str, Any]:
+    """
+    Resolves a ticker to its metadata, trying the `-USD` crypto alias when the
+    symbol itself is unknown (e.g. BTC -> BTC-USD).
+
+    Returns:
+        A dict with 'symbol' (the resolved symbol), 'long_name', 'short_name',
+        'quote_type', 'company_name' and 'valid'.
+    """
+    ticker = ticker.upper()
+    cache = _get_cache()
+    entry = cache.get(ticker)
+    if entry is not None and entry.is_fresh():
+        return entry.value
+
+    try:
+        metadata = _fetch_info(ticker)
+        if metadata is None and not ticker.endswith('-USD'):
+            metadata = _fetch_info(f"{ticker}-USD")
+            if metadata:
+                logger.info(f"Auto-resolved {ticker} to {metadata['symbol']}")
+    except Exception as e:
+        # Don't cache transient failures; serve a stale entry if there is one
+        logger.warning(f"Error getting info for {ticker}: {e}")
+        if entry is not None:
+            return entry.value
+        return _unknown(ticker)
+
+    if metadata is None:
+        metadata = _unknown(ticker)
+        cache.set(ticker, metadata, ttl=NEGATIVE_TTL)
+        return metadata
+
+    metadata['company_name'] = metadata['long_name'] or metadata['short_name'] or metadata['symbol']
+    cache.set(ticker, metadata, ttl=METADATA_TTL)
+    if metadata['symbol'] != ticker:
+        cache.set(metadata['symbol'], metadata, ttl=METADATA_TTL)
+    return metadata
+
+def cached_company_name(ticker: str) -> Optional[str]:
+    """The company name for a ticker if it has been resolved before. Never hits the network."""
+    entry = _get_cache().get(ticker.upper())
+    if entry is None or not entry.value.get('valid'):
+        return None
+    return entry.value.get('company_name')
+
+def _unknown(ticker: str) -> Dict[str, Any]:
+    return {
+        'symbol': ticker,
+        'long_name': None,
+        'short_name': None,
+        'quote_type': 'UNKNOWN',
+        'company_name': ticker,
+        'valid': False,
+    }
+
+def resolve_tickers(tickers: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resolves many tickers at once; cache misses are looked up in parallel."""
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(BULK_RESOLVE_WORKERS, len(tickers))) as executor:
+        return dict(zip(tickers, executor.map(resolve_ticker, tickers)))
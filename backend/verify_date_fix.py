@@ -6,6 +6,7 @@ import datetime
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from backend.articles import Article
 from backend.news_fetcher import is_recent, is_valid_source
 
 # Configure logging
@@ -21,11 +22,11 @@ def test_date_filtering():
     ancient_date = today - datetime.timedelta(days=365*3) # 2022-ish
     
     articles = [
-        {'title': 'Recent News', 'published': today.isoformat(), 'publisher': 'Bloomberg', 'source': 'Bloomberg'},
-        {'title': 'Yesterday News', 'published': yesterday.isoformat(), 'publisher': 'Bloomberg', 'source': 'Bloomberg'},
-        {'title': 'Old News (40 days)', 'published': old_date.isoformat(), 'publisher': 'Bloomberg', 'source': 'Bloomberg'},
-        {'title': 'Ancient News (3 years)', 'published': ancient_date.isoformat(), 'publisher': 'Bloomberg', 'source': 'Bloomberg'},
-        {'title': 'No Date News', 'published': None, 'publisher': 'Bloomberg', 'source': 'Bloomberg'}
+        Article.create(title='Recent News', url='https://example.com/', published=today.isoformat(), publisher='Bloomberg', source='Bloomberg'),
+        Article.create(title='Yesterday News', url='https://example.com/', published=yesterday.isoformat(), publisher='Bloomberg', source='Bloomberg'),
+        Article.create(title='Old News (40 days)', url='https://example.com/', published=old_date.isoformat(), publisher='Bloomberg', source='Bloomberg'),
+        Article.create(title='Ancient News (3 years)', url='https://example.com/', published=ancient_date.isoformat(), publisher='Bloomberg', source='Bloomberg'),
+        Article.create(title='No Date News', url='https://example.com/', published=None, publisher='Bloomberg', source='Bloomberg')
     ]
     
     logger.info(f"Testing with {len(articles)} articles...")
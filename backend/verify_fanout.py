@@ -0,0 +1,78 @@
+import sys
+import os
+import time
+import logging
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from news_fetcher import fetch_sources_concurrently
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Simulated latency per source (seconds). "Slow Source" is meant to miss its deadline.
+SOURCE_DELAYS = {
+    'Yahoo Finance': 0.4,
+    'Google News': 0.8,
+    'FinViz': 0.5,
+    'MarketWatch': 0.6,
+    'Benzinga': 0.3,
+    'Reuters': 0.7,
+    'Seeking Alpha': 0.2,
+    'Slow Source': 5.0,
+}
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Sleeps for /<seconds> and returns a tiny payload, like a slow news site."""
+    def do_GET(self):
+        time.sleep(float(self.path.strip('/')))
+        body = b'ok'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def stub_source(base_url: str, name: str, delay: float):
+    requests.get(f"{base_url}/{delay}", timeout=10)
+    return [{'title': f'{name} headline', 'url': f'{base_url}/{name}', 'publisher': name, 'published': None, 'source': name}]
+
+def verify_fanout():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    jobs = [(name, partial(stub_source, base_url, name, delay)) for name, delay in SOURCE_DELAYS.items()]
+    fast_jobs = [job for job in jobs if job[0] != 'Slow Source']
+
+    start = time.monotonic()
+    for _, fn in fast_jobs:
+        fn()
+    sequential = time.monotonic() - start
+
+    start = time.monotonic()
+    articles = fetch_sources_concurrently(jobs, source_timeout=2.0, overall_timeout=3.0)
+    concurrent = time.monotonic() - start
+
+    server.shutdown()
+
+    sources = {a['source'] for a in articles}
+    logger.info(f"Sequential (without slow source): {sequential:.2f}s")
+    logger.info(f"Concurrent (with slow source, 2s deadline): {concurrent:.2f}s")
+    logger.info(f"Sources merged: {sorted(sources)}")
+
+    if 'Slow Source' not in sources and len(sources) == len(fast_jobs) and concurrent < sequential:
+        logger.info("✅ Fan-out passed.")
+    else:
+        logger.error("❌ Fan-out failed.")
+
+if __name__ == "__main__":
+    verify_fanout()
@@ -5,6 +5,7 @@ import logging
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from backend.articles import Article
 from backend.news_fetcher import is_valid_source, get_ir_news, get_aggregated_news
 
 # Configure logging
@@ -15,10 +16,10 @@ def test_zacks_filtering():
     logger.info("Testing Zacks filtering...")
     
     zacks_articles = [
-        {'title': 'Stock Market News - Zacks Investment Research', 'publisher': 'Zacks', 'source': 'Zacks'},
-        {'title': 'Why Burford Capital (BUR) is a Strong Buy', 'publisher': 'Zacks Research', 'source': 'Yahoo Finance'},
-        {'title': 'Zacks Rank #1 (Strong Buy)', 'publisher': 'Yahoo Finance', 'source': 'Zacks'},
-        {'title': 'Normal News Article', 'publisher': 'Bloomberg', 'source': 'Bloomberg'}
+        Article.create(title='Stock Market News - Zacks Investment Research', url='https://example.com/', publisher='Zacks', source='Zacks'),
+        Article.create(title='Why Burford Capital (BUR) is a Strong Buy', url='https://example.com/', publisher='Zacks Research', source='Yahoo Finance'),
+        Article.create(title='Zacks Rank #1 (Strong Buy)', url='https://example.com/', publisher='Yahoo Finance', source='Zacks'),
+        Article.create(title='Normal News Article', url='https://example.com/', publisher='Bloomberg', source='Bloomberg')
     ]
     
     filtered = [a for a in zacks_articles if is_valid_source(a)]
@@ -11,17 +11,36 @@ const Dashboard = () => {
     const [newTicker, setNewTicker] = useState('');
     const [adding, setAdding] = useState(false);
 
-    const fetchStockNews = async (ticker) => {
+    // Streams a single ticker's report: the article list arrives first, then the summary token by token
+    const fetchStockNews = (ticker) => new Promise((resolve) => {
         setLoadingStocks(prev => ({ ...prev, [ticker]: true }));
-        try {
-            const newsRes = await axios.get(`http://localhost:8000/api/news/${encodeURIComponent(ticker)}`);
-            setStockData(prev => ({ ...prev, [ticker]: newsRes.data }));
-        } catch (error) {
-            console.error(`Error fetching news for ${ticker}:`, error);
-        } finally {
+        const source = new EventSource(`http://localhost:8000/api/news/${encodeURIComponent(ticker)}/summary/stream`);
+
+        const finish = () => {
+            source.close();
             setLoadingStocks(prev => ({ ...prev, [ticker]: false }));
-        }
-    };
+            resolve();
+        };
+
+        source.addEventListener('articles', (e) => {
+            setStockData(prev => ({ ...prev, [ticker]: { ticker, summary: '', articles: JSON.parse(e.data) } }));
+            setLoadingStocks(prev => ({ ...prev, [ticker]: false }));
+        });
+        source.addEventListener('token', (e) => {
+            const token = JSON.parse(e.data);
+            setStockData(prev => ({ ...prev, [ticker]: { ...prev[ticker], summary: prev[ticker].summary + token } }));
+        });
+        source.addEventListener('done', finish);
+        // Fires for connection errors and for the server's `error` event, which carries a message
+        source.onerror = (error) => {
+            console.error(`Error fetching news for ${ticker}:`, error);
+            if (error.data) {
+                const { message } = JSON.parse(error.data);
+                setStockData(prev => ({ ...prev, [ticker]: { ticker, articles: [], ...prev[ticker], summary: message } }));
+            }
+            finish();
+        };
+    });
 
     const handleAddTicker = async (e) => {
         e.preventDefault();
@@ -77,26 +96,39 @@ const Dashboard = () => {
             setPortfolio(tickers);
             setInitialLoading(false); // Show dashboard immediately
 
-            // 2. Fetch news for all tickers with concurrency limit
-            // Browser connection limit is usually 6. We limit to 3 to leave room for other actions (like adding tickers).
-            const CONCURRENCY_LIMIT = 3;
-            const queue = [...tickers];
-
-            const processQueue = async () => {
-                while (queue.length > 0) {
-                    const ticker = queue.shift();
-                    await fetchStockNews(ticker);
+            // 2. Stream news for the whole portfolio. The backend works on tickers
+            // concurrently and sends each one (NDJSON) as soon as it is ready.
+            const response = await fetch('http://localhost:8000/api/portfolio/news');
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+
+            const handleLine = (line) => {
+                if (!line.trim()) return;
+                const item = JSON.parse(line);
+                if (item.data) {
+                    setStockData(prev => ({ ...prev, [item.ticker]: item.data }));
+                } else {
+                    console.error(`Error fetching news for ${item.ticker}:`, item.error);
                 }
+                setLoadingStocks(prev => ({ ...prev, [item.ticker]: false }));
             };
 
-            const workers = Array(Math.min(tickers.length, CONCURRENCY_LIMIT))
-                .fill(null)
-                .map(() => processQueue());
-
-            await Promise.all(workers);
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.forEach(handleLine);
+            }
+            handleLine(buffer);
         } catch (error) {
             console.error("Error fetching portfolio:", error);
             setInitialLoading(false);
+        } finally {
+            // Clear spinners for any ticker the stream never delivered
+            setLoadingStocks(prev => Object.fromEntries(Object.keys(prev).map(t => [t, false])));
         }
     };
 
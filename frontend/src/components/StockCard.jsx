@@ -66,6 +66,11 @@ const StockCard = ({ stockData, onRemove, onRefresh, isLoading }) => {
                                     </h4>
                                     <div className="flex items-center gap-2 mt-0.5 text-xs text-gray-500">
                                         <span>{article.source}</span>
+                                        {article.alternate_sources?.length > 0 && (
+                                            <span title={article.alternate_sources.map(alt => alt.publisher || alt.source).join(', ')}>
+                                                +{article.alternate_sources.length} more
+                                            </span>
+                                        )}
                                         <span>•</span>
                                         <span className="flex items-center gap-1">
                                             <Clock className="w-3 h-3" />
@@ -0,0 +1,28 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from near_duplicates import cluster_indices
+
+def _clusters(titles):
+    return cluster_indices([{'title': title} for title in titles])
+
+def test_keeps_quarters_apart():
+    titles = [
+        "Burford Capital reports first quarter 2025 results",
+        "Burford Capital reports second quarter 2025 results",
+        "Burford Capital reports third quarter 2025 results",
+    ]
+    assert _clusters(titles) == [[0], [1], [2]]
+
+def test_keeps_numbers_apart():
+    assert _clusters(["Burford Capital Q3 earnings beat", "Burford Capital Q4 earnings beat"]) == [[0], [1]]
+    assert _clusters(["Burford Capital shares rise 2%", "Burford Capital shares rise 5%"]) == [[0], [1]]
+
+def test_merges_syndicated_copies():
+    titles = [
+        "Burford Capital reports third quarter 2025 results",
+        "Burford Capital reports third-quarter 2025 results - Reuters",
+        "Burford Capital shares rise 2%",
+    ]
+    assert _clusters(titles) == [[0, 1], [2]]
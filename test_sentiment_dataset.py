@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+import pandas as pd
+
+import sentiment_dataset
+from sentiment_dataset import UNCHECKED
+
+def _articles(stock, published, title="Shares rise"):
+    return pd.DataFrame({
+        'guid': [f"{stock}-{published}"],
+        'stock': [stock],
+        'title': [title],
+        'summary': [None],
+        'published': [published],
+        'sentiment_summary': [None],
+        'sentiment_title': [0.5],
+    })
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(sentiment_dataset, 'DATASET_DIR', str(tmp_path / "news_dataset"))
+    return str(tmp_path / "data.csv")
+
+def _check(path, row_id, change):
+    resolved = pd.DataFrame({'id': [row_id], 'check_day': ['2025-11-17'], 'open': [10.0], 'close': [10.5],
+                             'high': [11.0], 'low': [9.0], 'volume': [1000], 'change': [change]})
+    sentiment_dataset.update_prices(resolved, path)
+
+def test_ingest_without_checked_overlap(tmp_path, monkeypatch):
+    # A checked row exists, but none of the fresh stock-days match it
+    path = _setup(tmp_path, monkeypatch)
+    sentiment_dataset.ingest(_articles('AAPL', "Mon, 17 Nov 2025 03:13:54 +0000"), path)
+    _check(path, 'AAPL_2025-11-17', '5.0')
+
+    sentiment_dataset.ingest(_articles('MSFT', "Mon, 17 Nov 2025 04:00:00 +0000"), path)
+
+    daily = sentiment_dataset.read_daily(path).set_index('id')
+    assert daily.loc['AAPL_2025-11-17', 'change'] == '5.0'
+    assert daily.loc['MSFT_2025-11-17', 'change'] == UNCHECKED
+
+def test_ingest_keeps_checked_prices(tmp_path, monkeypatch):
+    path = _setup(tmp_path, monkeypatch)
+    sentiment_dataset.ingest(_articles('AAPL', "Mon, 17 Nov 2025 03:13:54 +0000"), path)
+    _check(path, 'AAPL_2025-11-17', '5.0')
+
+    sentiment_dataset.ingest(_articles('AAPL', "Mon, 17 Nov 2025 05:00:00 +0000", "Shares fall"), path)
+
+    row = sentiment_dataset.read_daily(path).set_index('id').loc['AAPL_2025-11-17']
+    assert row['change'] == '5.0'
+    assert row['volume'] == 1000
+
+def test_record_localizes_finviz_times(tmp_path, monkeypatch):
+    import sentiment
+    from articles import Article
+    from date_parsing import parse_finviz_date
+
+    path = _setup(tmp_path, monkeypatch)
+    ingest = sentiment_dataset.ingest
+    monkeypatch.setattr(sentiment_dataset, 'ingest', lambda frame: ingest(frame, path))
+    monkeypatch.setattr(sentiment, 'SENTIMENT_ENABLED', True)
+    # 7:30PM in New York is 00:30 UTC the next day
+    published, _ = parse_finviz_date("Nov-17-25 07:30PM")
+    article = Article.create("Shares rise", "https://example.com/a", source='FinViz', published=published)
+    sentiment.record_articles('AAPL', [article])
+
+    daily = sentiment_dataset.read_daily(path)
+    assert list(daily['id']) == ['AAPL_2025-11-18']
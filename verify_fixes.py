@@ -34,7 +34,7 @@ def verify_fixes():
             burnley_count += 1
             print("  -> WARNING: Found Burnley news!")
             
-        if date and "Invalid" not in date: # Simple check, ideally check ISO format
+        if date and "Invalid" not in str(date): # Simple check, ideally check ISO format
              valid_date_count += 1
              
     print(f"\nSummary:")